@@ -1,10 +1,24 @@
 # -*- encoding: utf-8 -*-
 """Generic base class for cli hammer commands."""
+import copy
 import logging
 import re
+import threading
+import time
+
+import six
+
+from concurrent.futures import ThreadPoolExecutor
+from six.moves import shlex_quote
 
 from robottelo import ssh
-from robottelo.cli import hammer
+from robottelo.cli import (
+    hammer,
+    hammer_commands,
+    hammer_session,
+    hammer_shell,
+    hammer_timings,
+)
 from robottelo.config import settings
 
 
@@ -61,6 +75,161 @@ class CLIDataBaseError(CLIBaseError):
     """
 
 
+#: Subcommands which do not change the entities, e.g. ``version info``.
+_READ_SUBCOMMANDS = ('info', 'list')
+
+_read_cache_lock = threading.Lock()
+_read_cache = {}
+_read_cache_generations = {}
+_read_cache_stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+
+def read_cache_stats():
+    """Return the number of ``info`` and ``list`` calls of this process
+    answered by the read cache (``hits``) or by hammer (``misses``), the
+    ``hit_rate`` and the number of ``invalidations`` caused by the other
+    subcommands.
+    """
+    with _read_cache_lock:
+        stats = dict(_read_cache_stats)
+    reads = stats['hits'] + stats['misses']
+    stats['hit_rate'] = float(stats['hits']) / reads if reads else 0.0
+    return stats
+
+
+def clear_read_cache():
+    """Drop all the cached ``info`` and ``list`` results, e.g. after changing
+    entities without the CLI wrappers.
+    """
+    with _read_cache_lock:
+        _read_cache.clear()
+        for command_base in list(_read_cache_generations):
+            _read_cache_generations[command_base] += 1
+
+
+def _invalidate_read_cache(command_base=None):
+    """Drop the cached results of ``command_base``, or all of them if it is
+    ``None``.
+    """
+    if command_base is None:
+        clear_read_cache()
+        return
+    with _read_cache_lock:
+        keys = [key for key in _read_cache if key[0] == command_base]
+        for key in keys:
+            del _read_cache[key]
+        _read_cache_generations[command_base] = (
+            _read_cache_generations.get(command_base, 0) + 1)
+        _read_cache_stats['invalidations'] += 1
+
+
+class LazyInfoResult(dict):
+    """The result of a ``create`` command which only reads the full entity
+    information when it is needed.
+
+    It starts with the fields returned by ``create`` and calls ``load_info``
+    the first time a missing field is read, or when the whole content is
+    needed, e.g. when comparing, iterating or counting the fields. The fields
+    returned by ``load_info`` replace the ``create`` ones. They are the state
+    of the entity at that first access, not right after ``create``: changes
+    made to the entity in between, e.g. by an ``update``, show up in them.
+
+    :param dict fields: the fields returned by ``create``.
+    :param load_info: a callable returning the entity information.
+    """
+
+    def __init__(self, fields, load_info):
+        super(LazyInfoResult, self).__init__(fields)
+        self._load_info = load_info
+
+    def _load(self):
+        """Replace the ``create`` fields by the entity information, once."""
+        load_info, self._load_info = self._load_info, None
+        if load_info is not None:
+            info = load_info()
+            # keep the create output when the information can not be read
+            if len(info) > 0:
+                self.clear()
+                self.update(info)
+
+    @property
+    def loaded(self):
+        """Whether the entity information was read."""
+        return self._load_info is None
+
+    def __missing__(self, key):
+        if self.loaded:
+            raise KeyError(key)
+        self._load()
+        return self[key]
+
+    def __contains__(self, key):
+        if not dict.__contains__(self, key):
+            self._load()
+        return dict.__contains__(self, key)
+
+    def get(self, key, default=None):
+        if not dict.__contains__(self, key):
+            self._load()
+        return dict.get(self, key, default)
+
+    def __eq__(self, other):
+        self._load()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        self._load()
+        return dict.__ne__(self, other)
+
+    def __iter__(self):
+        self._load()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self._load()
+        return dict.__len__(self)
+
+    def __repr__(self):
+        self._load()
+        return dict.__repr__(self)
+
+    def copy(self):
+        self._load()
+        return dict(self)
+
+    def items(self):
+        self._load()
+        return dict.items(self)
+
+    def keys(self):
+        self._load()
+        return dict.keys(self)
+
+    def values(self):
+        self._load()
+        return dict.values(self)
+
+    if six.PY2:
+        def iteritems(self):
+            self._load()
+            return dict.iteritems(self)
+
+        def iterkeys(self):
+            self._load()
+            return dict.iterkeys(self)
+
+        def itervalues(self):
+            self._load()
+            return dict.itervalues(self)
+
+    __hash__ = None
+
+    def __reduce__(self):
+        # pickle and deepcopy the entity information as a plain dict
+        self._load()
+        return dict, (dict(self.items()),)
+
+
 class Base(object):
     """
     @param command_base: base command of hammer.
@@ -120,11 +289,9 @@ class Base(object):
         user                          Manipulate users.
         user-group                    Manage user groups.
 
-
     @since: 27.Nov.2013
     """
     command_base = None  # each inherited instance should define this
-    command_sub = None  # specific to instance, like: create, update, etc
     command_requires_org = False  # True when command requires organization-id
 
     logger = logging.getLogger('robottelo')
@@ -133,7 +300,7 @@ class Base(object):
     )
 
     @classmethod
-    def _handle_response(cls, response, ignore_stderr=None):
+    def _handle_response(cls, response, ignore_stderr=None, command=None):
         """Verify ``return_code`` of the CLI command.
 
         Check for a non-zero return code or any stderr contents.
@@ -142,16 +309,22 @@ class Base(object):
             :mod:`robottelo.ssh.command`.
         :param ignore_stderr: indicates whether to throw a warning in logs if
             ``stderr`` is not empty.
+        :param command: the hammer command which was run, its subcommand is
+            reported in the error message.
         :returns: contents of ``stdout``.
         :raises robottelo.cli.base.CLIReturnCodeError: If return code is
             different from zero.
         """
         if response.return_code != 0:
+            if command:
+                # leave out the options, their values may be secrets
+                command = command.split(u' --', 1)[0].strip()
+            else:
+                command = cls.command_base
             full_msg = (
-                u'Command "{0} {1}" finished with return_code {2}\n'
-                'stderr contains following message:\n{3}'.format(
-                    cls.command_base,
-                    cls.command_sub,
+                u'Command "{0}" finished with return_code {1}\n'
+                'stderr contains following message:\n{2}'.format(
+                    command,
                     response.return_code,
                     response.stderr
                 )
@@ -174,25 +347,29 @@ class Base(object):
         Adds OS to record.
         """
 
-        cls.command_sub = 'add-operatingsystem'
-
-        result = cls.execute(cls._construct_command(options))
+        result = cls.execute(
+            cls._construct_command('add-operatingsystem', options))
 
         return result
 
     @classmethod
-    def create(cls, options=None):
+    def create(cls, options=None, lazy_info=None):
         """
         Creates a new record using the arguments passed via dictionary.
-        """
 
-        cls.command_sub = 'create'
+        The new record information is read with ``info`` right after its
+        creation, unless ``lazy_info`` is set. Then the fields returned by
+        ``create`` are returned in a :class:`LazyInfoResult` which only runs
+        ``info`` when a missing field is read. If ``lazy_info`` is ``None``
+        ``lazy_create_info`` from configuration's ``hammer`` section will be
+        used.
+        """
 
         if options is None:
             options = {}
 
         result = cls.execute(
-            cls._construct_command(options), output_format='csv')
+            cls._construct_command('create', options), output_format='csv')
 
         # Extract new object ID if it was successfully created
         if len(result) > 0 and 'id' in result[0]:
@@ -207,6 +384,15 @@ class Base(object):
                     raise CLIError(tmpl.format(cls.__name__))
                 info_options[u'organization-id'] = options[u'organization-id']
 
+            if lazy_info is None:
+                lazy_info = settings.hammer.lazy_create_info
+            if lazy_info:
+                fields = dict(result[0])
+                # the create message is not an entity field
+                fields.pop('message', None)
+                return LazyInfoResult(
+                    fields, lambda: cls.info(dict(info_options)))
+
             new_obj = cls.info(info_options)
             # stdout should be a dictionary containing the object
             if len(new_obj) > 0:
@@ -217,9 +403,8 @@ class Base(object):
     @classmethod
     def delete(cls, options=None):
         """Deletes existing record."""
-        cls.command_sub = 'delete'
         return cls.execute(
-            cls._construct_command(options),
+            cls._construct_command('delete', options),
             ignore_stderr=True,
         )
 
@@ -229,9 +414,8 @@ class Base(object):
         Deletes parameter from record.
         """
 
-        cls.command_sub = 'delete-parameter'
-
-        result = cls.execute(cls._construct_command(options))
+        result = cls.execute(
+            cls._construct_command('delete-parameter', options))
 
         return result
 
@@ -241,9 +425,7 @@ class Base(object):
         Displays the content for existing partition table.
         """
 
-        cls.command_sub = 'dump'
-
-        result = cls.execute(cls._construct_command(options))
+        result = cls.execute(cls._construct_command('dump', options))
 
         return result
 
@@ -283,32 +465,324 @@ class Base(object):
         if settings.performance:
             time_hammer = settings.performance.time_hammer
 
-        # add time to measure hammer performance
-        cmd = u'LANG={0} {1} hammer -v {2} {3} {4} {5}'.format(
-            settings.locale,
-            u'time -p' if time_hammer else '',
-            u'-u {0}'.format(user) if user is not None
-            else u'--interactive no',
-            u'-p {0}'.format(password) if password is not None else '',
+        shell = None
+        if settings.hammer.shell and not time_hammer:
+            # only fall back to a new hammer process when the resident one
+            # can not be started, a command may not be safe to run twice
+            try:
+                shell = hammer_shell.get_hammer_shell()
+            except hammer_shell.HammerShellError as err:
+                cls.logger.warning(
+                    u'Running the command with a new hammer process: %s', err)
+        session = None
+        if shell is None:
+            session = cls._get_hammer_session(user, password)
+        hammer_args = cls._hammer_args(
+            command, user, password, output_format, session)
+        try:
+            if shell is not None:
+                response = shell.run(
+                    hammer_args,
+                    env={u'LANG': settings.locale},
+                    output_format=output_format,
+                    timeout=timeout,
+                )
+            else:
+                response = cls._execute_command(
+                    command, hammer_args, session, output_format, timeout,
+                    connection_timeout, time_hammer
+                )
+                if session is not None and hammer_session.is_auth_error(
+                        response):
+                    # the command was not run, log in again and run it, with
+                    # the credentials if the user can not log in
+                    session.invalidate()
+                    try:
+                        session.login()
+                    except hammer_session.HammerSessionError as err:
+                        cls.logger.warning(
+                            u'Running the command with the user '
+                            u'credentials: %s', err)
+                        session = None
+                        hammer_args = cls._hammer_args(
+                            command, user, password, output_format)
+                    response = cls._execute_command(
+                        command, hammer_args, session, output_format,
+                        timeout, connection_timeout, time_hammer
+                    )
+        finally:
+            if settings.hammer.read_cache:
+                cls._invalidate_cached_reads(command)
+        if return_raw_response:
+            return response
+        else:
+            return cls._handle_response(
+                response,
+                ignore_stderr=ignore_stderr,
+                command=command,
+            )
+
+    @classmethod
+    def _get_hammer_session(cls, user, password):
+        """Return the hammer session of ``user`` when ``sessions`` is enabled
+        in configuration's ``hammer`` section, ``None`` otherwise.
+        """
+        if (not settings.hammer.sessions or
+                user is None or password is None):
+            return None
+        return hammer_session.get_hammer_session(user, password)
+
+    @staticmethod
+    def _hammer_args(command, user, password, output_format, session=None):
+        """Return the hammer arguments running ``command``, authenticated by
+        the hammer ``session`` if it is not ``None``.
+        """
+        if session is not None:
+            credentials = u'--interactive no'
+        else:
+            credentials = u'{0} {1}'.format(
+                u'-u {0}'.format(user) if user is not None
+                else u'--interactive no',
+                u'-p {0}'.format(password) if password is not None else '',
+            )
+        return u'-v {0} {1} {2}'.format(
+            credentials,
             u'--output={0}'.format(output_format) if output_format else u'',
             command,
         )
+
+    @staticmethod
+    def _hammer_command_line(hammer_args, session=None, time_hammer=False):
+        """Return the shell command line running hammer with
+        ``hammer_args``, in the hammer ``session`` if it is not ``None``.
+        """
+        env = u'LANG={0}'.format(settings.locale)
+        if session is not None:
+            env = u'{0} {1} HOME={2}'.format(
+                session.check, env, shlex_quote(session.env[u'HOME']))
+        # add time to measure hammer performance
+        return u'{0} {1} hammer {2}'.format(
+            env,
+            u'time -p' if time_hammer else '',
+            hammer_args,
+        )
+
+    @classmethod
+    def _execute_command(cls, command, hammer_args, session, output_format,
+                         timeout, connection_timeout, time_hammer):
+        """Run a new hammer process with ``hammer_args`` over ssh, in the
+        hammer ``session`` if it is not ``None``.
+        """
+        cmd = cls._hammer_command_line(hammer_args, session, time_hammer)
+        start = time.time()
         response = ssh.command(
             cmd.encode('utf-8'),
             output_format=output_format,
             timeout=timeout,
             connection_timeout=connection_timeout,
         )
-        if return_raw_response:
-            return response
-        else:
-            return cls._handle_response(
-                response,
-                ignore_stderr=ignore_stderr,
+        if time_hammer:
+            hammer_timings.record_response(
+                command, response, time.time() - start)
+        return response
+
+    @classmethod
+    def _cached_read(cls, command, output_format, read):
+        """Return the result of the ``info`` or ``list`` ``command`` read by
+        calling ``read``.
+
+        When ``read_cache`` is enabled in configuration's ``hammer`` section,
+        the results are kept by command, output format and credentials until
+        another subcommand of the same ``command_base`` is run, see
+        :meth:`_invalidate_cached_reads`. A copy of the result is returned so
+        callers can change it. Entities changed through another
+        ``command_base``, e.g. a product by a repository synchronization, are
+        not invalidated, use :func:`clear_read_cache` when it matters.
+        """
+        if not settings.hammer.read_cache:
+            return read()
+        key = (cls.command_base, command, output_format) + tuple(
+            cls._get_username_password())
+        with _read_cache_lock:
+            generation = _read_cache_generations.get(cls.command_base, 0)
+            cached = key in _read_cache
+            if cached:
+                _read_cache_stats['hits'] += 1
+                result = _read_cache[key]
+            else:
+                _read_cache_stats['misses'] += 1
+        if cached:
+            return copy.deepcopy(result)
+        result = read()
+        with _read_cache_lock:
+            # do not keep a result read while the entities were changed
+            if _read_cache_generations.get(
+                    cls.command_base, 0) == generation:
+                _read_cache[key] = copy.deepcopy(result)
+        return result
+
+    @classmethod
+    def _invalidate_cached_reads(cls, command):
+        """Drop the cached results of ``cls.command_base`` when ``command``
+        may have changed its entities, i.e. it is not an ``info`` or ``list``
+        subcommand. All the cached results are dropped when ``command`` is
+        not a ``cls.command_base`` command.
+        """
+        prefix = u'{0} '.format(cls.command_base)
+        if not cls.command_base or not command.startswith(prefix):
+            _invalidate_read_cache()
+            return
+        command_sub = command[len(prefix):].split(u' --', 1)[0].split()
+        if not command_sub or command_sub[-1] not in _READ_SUBCOMMANDS:
+            _invalidate_read_cache(cls.command_base)
+
+    @classmethod
+    def execute_async(cls, command, **kwargs):
+        """Coroutine running :meth:`execute` in the event loop executor, so
+        independent hammer commands can be awaited together, e.g. with
+        ``asyncio.gather``. The keyword arguments are the same as
+        :meth:`execute`.
+
+        Only available on Python 3, see :mod:`robottelo.ssh.aio`.
+        """
+        from robottelo.ssh import aio
+        return aio.run_in_executor(cls.execute, command, **kwargs)
+
+    @classmethod
+    def run_many(cls, calls, max_workers=None):
+        """Run several CLI calls at the same time, over a bounded pool of
+        threads. The calls should not depend on each other, e.g.::
+
+            org, location = Base.run_many([
+                (Org.create, {'name': 'org'}),
+                (Location.create, {'name': 'location'}),
+            ])
+
+        :param calls: ``(method, options)`` pairs, ``method`` is a classmethod
+            of a CLI class or the name of a ``cls`` classmethod and
+            ``options`` its options dict. A ``(method, options, kwargs)``
+            triple passes extra keyword arguments to the method.
+        :param int max_workers: Maximum number of calls run at the same time.
+            If it is ``None`` ``max_workers`` from configuration's
+            ``ssh_client`` section will be used.
+        :return: the calls results, in the same order as ``calls``.
+        :raises: the first exception raised by a call, once all the calls are
+            done.
+        """
+        calls = list(calls)
+        if not calls:
+            return []
+        if max_workers is None:
+            max_workers = settings.ssh_client.max_workers
+        with ThreadPoolExecutor(
+                max_workers=min(max_workers, len(calls))) as executor:
+            futures = []
+            for call in calls:
+                method, options = call[:2]
+                kwargs = call[2] if len(call) > 2 else {}
+                if isinstance(method, six.string_types):
+                    method = getattr(cls, method)
+                futures.append(executor.submit(method, options, **kwargs))
+        return [future.result() for future in futures]
+
+    @classmethod
+    def execute_batch(cls, calls, output_format='csv', timeout=None,
+                      stop_on_failure=False, ignore_stderr=None,
+                      connection_timeout=None):
+        """Run several hammer commands in order, in one ssh round trip, e.g.::
+
+            org, location = Base.execute_batch([
+                (Org, 'create', {'name': 'org'}),
+                (Location, 'create', {'name': 'location'}),
+            ])
+
+        The commands are sent as one remote script, see
+        :func:`robottelo.ssh.command_batch`, so they should not need the
+        output of each other. Each command still starts its own hammer
+        process, authenticated with the ``cls`` credentials or their hammer
+        session. The commands are not timed by ``time_hammer``.
+
+        :param calls: ``(cli_class, command_sub, options)`` triples, a
+            ``(command_sub, options)`` pair runs a ``cls`` subcommand. A
+            fourth item overrides ``output_format`` for its command.
+        :param output_format: the output format of the commands.
+        :param int timeout: Time to wait for each command to finish.
+        :param bool stop_on_failure: Do not run the remaining commands once
+            one has failed.
+        :return: one item per command run, in the same order as ``calls``:
+            the command output parsed like :meth:`execute` returns it, or the
+            :class:`CLIReturnCodeError` or :class:`CLIDataBaseError` of the
+            failed command. It is shorter than ``calls`` when
+            ``stop_on_failure`` stopped the batch.
+        """
+        user, password = cls._get_username_password()
+        commands = []
+        for call in calls:
+            if isinstance(call[0], six.string_types):
+                call = (cls,) + tuple(call)
+            cli_class, command_sub, options = call[:3]
+            commands.append((
+                cli_class,
+                cli_class._construct_command(command_sub, options),
+                call[3] if len(call) > 3 else output_format,
+            ))
+        session = cls._get_hammer_session(user, password)
+        responses = []
+        relogged = False
+        while True:
+            pending = commands[len(responses):]
+            try:
+                batch = ssh.command_batch(
+                    [
+                        cls._hammer_command_line(cls._hammer_args(
+                            command, user, password, command_format, session
+                        ))
+                        for _, command, command_format in pending
+                    ],
+                    output_format='plain',
+                    timeout=timeout,
+                    connection_timeout=connection_timeout,
+                    stop_on_failure=stop_on_failure,
+                )
+            finally:
+                if settings.hammer.read_cache:
+                    for cli_class, command, _ in pending:
+                        cli_class._invalidate_cached_reads(command)
+            rerun = False
+            if session is not None and not relogged:
+                for index, response in enumerate(batch):
+                    if hammer_session.is_auth_error(response):
+                        # the session was not accepted from this command on,
+                        # log in again once and run the remaining commands
+                        relogged = rerun = True
+                        batch = batch[:index]
+                        session.invalidate()
+                        try:
+                            session.login()
+                        except hammer_session.HammerSessionError as err:
+                            cls.logger.warning(u'%s', err)
+                            session = None
+                        break
+            responses.extend(
+                ssh.make_result(
+                    response.stdout, response.stderr, response.return_code,
+                    command_format
+                )
+                for response, (_, _, command_format) in zip(batch, pending)
             )
+            if not rerun:
+                break
+        results = []
+        for response, (cli_class, command, _) in zip(responses, commands):
+            try:
+                results.append(cli_class._handle_response(
+                    response, ignore_stderr=ignore_stderr, command=command))
+            except CLIBaseError as err:
+                results.append(err)
+        return results
 
     @classmethod
-    def exists(cls, options=None, search=None):
+    def exists(cls, options=None, search=None, fields=None):
         """Search for an entity using the query ``search[0]="search[1]"``
 
         Will be used the ``list`` command with the ``--search`` option to do
@@ -317,6 +791,9 @@ class Base(object):
         If ``options`` argument already have a search key, then the ``search``
         argument will not be evaluated. Which allows different search query.
 
+        ``fields`` limits the returned entity to these fields, see
+        :meth:`_add_fields`.
+
         """
 
         if options is None:
@@ -327,19 +804,22 @@ class Base(object):
                 u'search': u'{0}=\\"{1}\\"'.format(search[0], search[1])
             })
 
-        result = cls.list(options)
+        result = cls.list(cls._add_fields(options, fields))
         if result:
             result = result[0]
 
         return result
 
     @classmethod
-    def info(cls, options=None, output_format=None, return_raw_response=None):
-        """Reads the entity information."""
-        cls.command_sub = 'info'
+    def info(cls, options=None, output_format=None, return_raw_response=None,
+             fields=None):
+        """Reads the entity information.
 
-        if options is None:
-            options = {}
+        ``fields`` limits the information to these fields, see
+        :meth:`_add_fields`.
+        """
+
+        options = cls._add_fields(options, fields)
 
         if cls.command_requires_org and 'organization-id' not in options:
             raise CLIError(
@@ -348,26 +828,32 @@ class Base(object):
                 )
             )
 
-        result = cls.execute(
-            command=cls._construct_command(options),
-            output_format=output_format,
-            return_raw_response=return_raw_response,
-        )
-        if not return_raw_response and output_format != 'json':
-            result = hammer.parse_info(result)
-        return result
+        command = cls._construct_command('info', options)
+
+        def read():
+            result = cls.execute(
+                command=command,
+                output_format=output_format,
+                return_raw_response=return_raw_response,
+            )
+            if not return_raw_response and output_format != 'json':
+                result = hammer.parse_info(result)
+            return result
+
+        if return_raw_response:
+            return read()
+        return cls._cached_read(command, output_format, read)
 
     @classmethod
-    def list(cls, options=None, per_page=True, output_format='csv'):
+    def list(cls, options=None, per_page=True, output_format='csv',
+             fields=None):
         """
         List information.
         @param options: ID (sometimes name works as well) to retrieve info.
+        @param fields: the entities fields to list, see :meth:`_add_fields`.
         """
 
-        cls.command_sub = 'list'
-
-        if options is None:
-            options = {}
+        options = cls._add_fields(options, fields)
 
         if 'per-page' not in options and per_page:
             options[u'per-page'] = 10000
@@ -379,10 +865,44 @@ class Base(object):
                 )
             )
 
-        result = cls.execute(
-            cls._construct_command(options), output_format=output_format)
+        command = cls._construct_command('list', options)
 
-        return result
+        return cls._cached_read(
+            command,
+            output_format,
+            lambda: cls.execute(command, output_format=output_format)
+        )
+
+    @classmethod
+    def iter_list(cls, options=None, page_size=1000, fields=None):
+        """Iterate over the ``list`` results, reading them one page of
+        ``page_size`` entities at a time.
+
+        A page is only read when the previous one is consumed, so the
+        remaining pages are never read when the iteration stops early, e.g.
+        ``next(Org.iter_list({'search': 'name=foo'}), None)``.
+
+        @param options: the ``list`` options, without ``page`` nor
+            ``per-page``.
+        @param page_size: number of entities read by each ``list`` command.
+        @param fields: the entities fields to read, see :meth:`_add_fields`.
+        """
+        options = dict(cls._add_fields(options, fields))
+        options[u'per-page'] = page_size
+        previous = None
+        page = 1
+        while True:
+            options[u'page'] = page
+            result = cls.list(dict(options), per_page=False)
+            # stop if the pagination options are not honored by the command
+            if not result or result == previous:
+                return
+            for entity in result:
+                yield entity
+            if len(result) < page_size:
+                return
+            previous = result
+            page += 1
 
     @classmethod
     def puppetclasses(cls, options=None):
@@ -390,10 +910,9 @@ class Base(object):
         Lists all puppet classes.
         """
 
-        cls.command_sub = 'puppet-classes'
-
         result = cls.execute(
-            cls._construct_command(options), output_format='csv')
+            cls._construct_command('puppet-classes', options),
+            output_format='csv')
 
         return result
 
@@ -403,9 +922,8 @@ class Base(object):
         Removes OS from record.
         """
 
-        cls.command_sub = 'remove-operatingsystem'
-
-        result = cls.execute(cls._construct_command(options))
+        result = cls.execute(
+            cls._construct_command('remove-operatingsystem', options))
 
         return result
 
@@ -415,10 +933,8 @@ class Base(object):
         Lists all smart class parameters.
         """
 
-        cls.command_sub = 'sc-params'
-
         result = cls.execute(
-            cls._construct_command(options), output_format='csv')
+            cls._construct_command('sc-params', options), output_format='csv')
 
         return result
 
@@ -428,9 +944,7 @@ class Base(object):
         Creates or updates parameter for a record.
         """
 
-        cls.command_sub = 'set-parameter'
-
-        result = cls.execute(cls._construct_command(options))
+        result = cls.execute(cls._construct_command('set-parameter', options))
 
         return result
 
@@ -440,10 +954,8 @@ class Base(object):
         Updates existing record.
         """
 
-        cls.command_sub = 'update'
-
         result = cls.execute(
-            cls._construct_command(options),
+            cls._construct_command('update', options),
             output_format='csv',
             return_raw_response=return_raw_response,
         )
@@ -464,14 +976,58 @@ class Base(object):
 
         return Wrapper
 
+    @staticmethod
+    def _add_fields(options=None, fields=None):
+        """Return a copy of ``options`` with the ``fields`` option set.
+
+        ``fields`` is a list of the hammer field labels to output, like
+        ``['Id', 'Name']``, or one of the predefined field sets like
+        ``'THIN'``. Hammer then only outputs and the wrappers only parse these
+        fields, which saves a lot of time for entities with large nested
+        sections when only their id or name is needed.
+
+        ``options`` is returned as is when ``fields`` is not set.
+        """
+        if options is None:
+            options = {}
+        if fields:
+            options = dict(options)
+            if not isinstance(fields, six.string_types):
+                fields = u','.join(fields)
+            options[u'fields'] = fields
+        return options
+
     @classmethod
-    def _construct_command(cls, options=None):
-        """Build a hammer cli command based on the options passed"""
+    def _construct_command(cls, command_sub, options=None):
+        """Build a hammer cli command for the ``command_sub`` subcommand, like
+        create or update, based on the options passed.
+
+        The subcommand is given on each call instead of being stored on the
+        class, so commands can be built concurrently from several threads.
+
+        When ``validate_options`` is enabled in configuration's ``hammer``
+        section, the options are checked against the hammer command tree and
+        :class:`CLIReturnCodeError` is raised with the hammer usage error for
+        an unknown command or option, without running the command. A
+        :class:`robottelo.cli.hammer_commands.HammerCommandTreeError` is
+        raised when the command tree can not be read from the server.
+        """
         tail = u''
 
         if options is None:
             options = {}
 
+        if settings.hammer.validate_options:
+            try:
+                hammer_commands.validate(
+                    u'{0} {1}'.format(cls.command_base, command_sub),
+                    [key for key, val in options.items()
+                     if val is not None and val is not False]
+                )
+            except hammer_commands.HammerCommandError as err:
+                # hammer exits with EX_USAGE on unknown commands and options
+                raise CLIReturnCodeError(64, err.args[0], err.args[0])
+
         for key, val in options.items():
             if val is None:
                 continue
@@ -483,7 +1039,7 @@ class Base(object):
                 tail += u' --{0}="{1}"'.format(key, val)
         cmd = u'{0} {1} {2}'.format(
             cls.command_base,
-            cls.command_sub,
+            command_sub,
             tail.strip()
         )
 
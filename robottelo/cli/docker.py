@@ -98,7 +98,7 @@ class DockerContainer(Base):
         return super(DockerContainer, cls).delete(options)
 
     @classmethod
-    def info(cls, options=None):
+    def info(cls, options=None, fields=None):
         """Gets information about a docker container
 
         Usage::
@@ -113,10 +113,10 @@ class DockerContainer(Base):
             --name NAME                               Name to search by
 
         """
-        return super(DockerContainer, cls).info(options)
+        return super(DockerContainer, cls).info(options, fields=fields)
 
     @classmethod
-    def list(cls, options=None, per_page=True):
+    def list(cls, options=None, per_page=True, fields=None):
         """Lists docker containers
 
         Usage::
@@ -132,7 +132,7 @@ class DockerContainer(Base):
                                                       request
 
         """
-        return super(DockerContainer, cls).list(options)
+        return super(DockerContainer, cls).list(options, fields=fields)
 
     @classmethod
     def logs(cls, options=None):
@@ -156,8 +156,7 @@ class DockerContainer(Base):
                                                       Default: 100
 
         """
-        cls.command_sub = 'logs'
-        return cls.execute(cls._construct_command(options))
+        return cls.execute(cls._construct_command('logs', options))
 
     @classmethod
     def start(cls, options=None):
@@ -175,8 +174,7 @@ class DockerContainer(Base):
             --name NAME                               Name to search by
 
         """
-        cls.command_sub = 'start'
-        return cls.execute(cls._construct_command(options))
+        return cls.execute(cls._construct_command('start', options))
 
     @classmethod
     def status(cls, options=None):
@@ -194,8 +192,7 @@ class DockerContainer(Base):
             --name NAME                               Name to search by
 
         """
-        cls.command_sub = 'status'
-        return cls.execute(cls._construct_command(options))
+        return cls.execute(cls._construct_command('status', options))
 
     @classmethod
     def stop(cls, options=None):
@@ -213,8 +210,7 @@ class DockerContainer(Base):
             --name NAME                               Name to search by
 
         """
-        cls.command_sub = 'stop'
-        return cls.execute(cls._construct_command(options))
+        return cls.execute(cls._construct_command('stop', options))
 
 
 class DockerManifest(Base):
@@ -238,7 +234,7 @@ class DockerManifest(Base):
     command_base = 'docker manifest'
 
     @classmethod
-    def info(cls, options=None):
+    def info(cls, options=None, fields=None):
         """Gets information about docker manifests
 
         Usage::
@@ -253,10 +249,10 @@ class DockerManifest(Base):
             --repository-id REPOSITORY_ID repository ID
 
         """
-        return super(DockerManifest, cls).info(options)
+        return super(DockerManifest, cls).info(options, fields=fields)
 
     @classmethod
-    def list(cls, options=None, per_page=True):
+    def list(cls, options=None, per_page=True, fields=None):
         """List docker manifests
 
         Usage::
@@ -308,7 +304,8 @@ class DockerManifest(Base):
          --search SEARCH                                     Search string
 
         """
-        return super(DockerManifest, cls).list(options, per_page)
+        return super(DockerManifest, cls).list(
+            options, per_page, fields=fields)
 
 
 class DockerRegistry(Base):
@@ -370,7 +367,7 @@ class DockerRegistry(Base):
         return super(DockerRegistry, cls).delete(options)
 
     @classmethod
-    def info(cls, options=None):
+    def info(cls, options=None, fields=None):
         """Gets information about docker registry
 
         Usage::
@@ -383,10 +380,10 @@ class DockerRegistry(Base):
             --name NAME                   Name to search by
 
         """
-        return super(DockerRegistry, cls).info(options)
+        return super(DockerRegistry, cls).info(options, fields=fields)
 
     @classmethod
-    def list(cls, options=None, per_page=True):
+    def list(cls, options=None, per_page=True, fields=None):
         """List docker registries
 
         Usage::
@@ -401,7 +398,8 @@ class DockerRegistry(Base):
             --search SEARCH               filter results
 
         """
-        return super(DockerRegistry, cls).list(options, per_page)
+        return super(DockerRegistry, cls).list(
+            options, per_page, fields=fields)
 
     @classmethod
     def update(cls, options=None):
@@ -446,7 +444,7 @@ class DockerTag(Base):
     command_base = 'docker tag'
 
     @classmethod
-    def info(cls, options=None):
+    def info(cls, options=None, fields=None):
         """Gets information about docker tags
 
         Usage::
@@ -461,10 +459,10 @@ class DockerTag(Base):
             --repository-id REPOSITORY_ID repository ID
 
         """
-        return super(DockerTag, cls).info(options)
+        return super(DockerTag, cls).info(options, fields=fields)
 
     @classmethod
-    def list(cls, options=None, per_page=True):
+    def list(cls, options=None, per_page=True, fields=None):
         """List docker tags
 
         Usage::
@@ -506,7 +504,8 @@ class DockerTag(Base):
             --repository-id REPOSITORY_ID                       repository ID
 
         """
-        return super(DockerTag, cls).list(options, per_page)
+        return super(DockerTag, cls).list(
+            options, per_page, fields=fields)
 
 
 class Docker(Base):
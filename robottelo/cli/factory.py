@@ -8,8 +8,10 @@ import json
 import logging
 import os
 import random
+import threading
 import time
 
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from fauxfactory import (
     gen_alphanumeric,
     gen_integer,
@@ -20,6 +22,7 @@ from fauxfactory import (
 )
 from os import chmod
 from robottelo import manifests, ssh
+from robottelo.cli import hammer_commands
 from robottelo.cli.activationkey import ActivationKey
 from robottelo.cli.architecture import Architecture
 from robottelo.cli.base import CLIReturnCodeError
@@ -88,7 +91,8 @@ from robottelo.constants import (
     SYNC_INTERVAL,
     TEMPLATE_TYPES,
 )
-from robottelo.decorators import bz_bug_is_open, cacheable
+from robottelo.decorators import bz_bug_is_open, cacheable, setting_is_set
+from robottelo.decorators.func_shared.pool import SharedPool
 from robottelo.helpers import (
     update_dictionary, default_url_on_new_port, get_available_capsule_port
 )
@@ -107,6 +111,33 @@ class CLIFactoryError(Exception):
     """Indicates an error occurred while creating an entity using hammer"""
 
 
+_checked_default_options = set()
+
+
+def _check_default_options(cli_object, options):
+    """Log the default ``options`` of a factory which the hammer create
+    command of ``cli_object`` does not accept, once by hammer command.
+    """
+    if cli_object.command_base in _checked_default_options:
+        return
+    _checked_default_options.add(cli_object.command_base)
+    try:
+        unknown = hammer_commands.unknown_options(
+            u'{0} create'.format(cli_object.command_base), options)
+    except hammer_commands.HammerCommandError as err:
+        logger.warning(err.args[0])
+        return
+    if unknown:
+        logger.warning(
+            u'Default option(s) {0} of the {1} factory are not accepted by '
+            u'hammer {2} create'.format(
+                u', '.join(unknown),
+                cli_object.__name__,
+                cli_object.command_base,
+            )
+        )
+
+
 def create_object(cli_object, options, values):
     """
     Creates <object> with dictionary of arguments.
@@ -128,6 +159,8 @@ def create_object(cli_object, options, values):
                 "Option(s) {0} not supported by CLI factory. Please check for "
                 "a typo or update default options".format(diff)
             )
+    if settings.hammer.validate_options:
+        _check_default_options(cli_object, options)
     update_dictionary(options, values)
     try:
         result = cli_object.create(options)
@@ -1559,18 +1592,21 @@ def make_fake_host(options=None):
     # not passed or defined previously
     if not options.get('organization') and not options.get('organization-id'):
         try:
-            options['organization-id'] = Org.info({'name': DEFAULT_ORG})['id']
+            options['organization-id'] = Org.info(
+                {'name': DEFAULT_ORG}, fields=['Id'])['id']
         except CLIReturnCodeError:
             options['organization-id'] = make_org()['id']
     if not options.get('location') and not options.get('location-id'):
         try:
-            options['location-id'] = Location.info({'name': DEFAULT_LOC})['id']
+            options['location-id'] = Location.info(
+                {'name': DEFAULT_LOC}, fields=['Id'])['id']
         except CLIReturnCodeError:
             options['location-id'] = make_location()['id']
     if not options.get('domain') and not options.get('domain-id'):
         try:
             options['domain-id'] = Domain.info({
-                'name': settings.server.hostname.partition('.')[-1]})['id']
+                'name': settings.server.hostname.partition('.')[-1]},
+                fields=['Id'])['id']
         except CLIReturnCodeError:
             options['domain-id'] = make_domain({
                 'location-ids': options.get('location-id'),
@@ -1581,7 +1617,7 @@ def make_fake_host(options=None):
     if not options.get('architecture') and not options.get('architecture-id'):
         try:
             options['architecture-id'] = Architecture.info({
-                'name': DEFAULT_ARCHITECTURE})['id']
+                'name': DEFAULT_ARCHITECTURE}, fields=['Id'])['id']
         except CLIReturnCodeError:
             options['architecture-id'] = make_architecture()['id']
     if (not options.get('operatingsystem') and
@@ -1593,7 +1629,7 @@ def make_fake_host(options=None):
                                    RHEL_6_MAJOR_VERSION,
                                    RHEL_7_MAJOR_VERSION
                               )
-            })[0]['id']
+            }, fields=['Id'])[0]['id']
         except IndexError:
             options['operatingsystem-id'] = make_os({
                 'architecture-ids': options.get('architecture-id'),
@@ -1607,7 +1643,7 @@ def make_fake_host(options=None):
             options['partition-table-id'] = PartitionTable.list({
                 'operatingsystem': options.get('operatingsystem'),
                 'operatingsystem-id': options.get('operatingsystem-id'),
-            })[0]['id']
+            }, fields=['Id'])[0]['id']
         except IndexError:
             options['partition-table-id'] = make_partition_table({
                 'location-ids': options.get('location-id'),
@@ -2954,6 +2990,177 @@ def activationkey_add_subscription_to_repo(options=None):
                 )
 
 
+def _run_task_graph(tasks, max_workers=None):
+    """Run the ``tasks`` of a flow, each one as soon as the tasks it depends
+    on are done, so the independent ones run at the same time.
+
+    :param tasks: ``(name, func, dependencies)`` triples, in the order the
+        flow would run them one after the other. ``func`` is called with the
+        dict of the results of the tasks done so far, by task name, and
+        ``dependencies`` is the tuple of the names of the tasks whose result
+        it needs.
+    :param int max_workers: Maximum number of tasks run at the same time. If
+        it is ``None`` ``max_workers`` from configuration's ``ssh_client``
+        section will be used.
+    :return: the dict of the tasks results, by task name.
+    :raises: the exception of the first failed task in ``tasks`` order, once
+        the running tasks are done. No task is started after a failure, and
+        the entities created by the tasks already done are left as they are.
+    """
+    if max_workers is None:
+        max_workers = settings.ssh_client.max_workers
+    order = [name for name, _, _ in tasks]
+    pending = list(tasks)
+    results = {}
+    errors = {}
+    running = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            if not errors:
+                for task in list(pending):
+                    name, func, dependencies = task
+                    if all(dep in results for dep in dependencies):
+                        pending.remove(task)
+                        running[executor.submit(func, results)] = name
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception as err:
+                    errors[name] = err
+    if errors:
+        raise errors[min(errors, key=order.index)]
+    if pending:
+        raise CLIFactoryError(
+            u'Tasks {0} depend on unknown tasks'.format(
+                u', '.join(name for name, _, _ in pending)))
+    return results
+
+
+def _given_or_new_org(options):
+    """Return the task of a setup flow returning the given organization id or
+    creating an organization.
+    """
+    def org(results):
+        if options.get('organization-id') is None:
+            return make_org()['id']
+        return options['organization-id']
+    return org
+
+
+def _given_or_new_env(options):
+    """Return the task of a setup flow returning the given lifecycle
+    environment id or creating a lifecycle environment.
+    """
+    def env(results):
+        if options.get('lifecycle-environment-id') is None:
+            return make_lifecycle_environment(
+                {u'organization-id': results['org']})['id']
+        return options['lifecycle-environment-id']
+    return env
+
+
+def _content_view_tasks(options, wrap_info_error=False):
+    """Return the tasks of a setup flow adding the ``repo`` task repository to
+    the given or a new content view, publishing it once the ``sync`` task is
+    done and promoting it to the ``env`` task lifecycle environment, then
+    associating the given or a new activation key with them.
+
+    The ``CLIReturnCodeError`` of the content view info fetched before the
+    promotion is raised as a ``CLIFactoryError`` when ``wrap_info_error`` is
+    set, and as is otherwise.
+
+    A new activation key is created without content view right away, and
+    associated with it once it is promoted, as an activation key can only use
+    a content view of its lifecycle environment. The tasks changing the
+    activation key further must depend on that ``associate`` task.
+    """
+    def content_view(results):
+        if options.get('content-view-id') is None:
+            return make_content_view(
+                {u'organization-id': results['org']})['id']
+        return options['content-view-id']
+
+    def add_repository(results):
+        try:
+            ContentView.add_repository({
+                u'id': results['cv'],
+                u'organization-id': results['org'],
+                u'repository-id': results['repo']['id'],
+            })
+        except CLIReturnCodeError as err:
+            raise CLIFactoryError(
+                u'Failed to add repository to content view\n{0}'
+                .format(err.msg)
+            )
+
+    def publish(results):
+        try:
+            ContentView.publish({u'id': results['cv']})
+        except CLIReturnCodeError as err:
+            raise CLIFactoryError(
+                u'Failed to publish new version of content view\n{0}'
+                .format(err.msg)
+            )
+
+    def promote(results):
+        try:
+            cvv = ContentView.info({u'id': results['cv']})['versions'][-1]
+        except CLIReturnCodeError as err:
+            if not wrap_info_error:
+                raise
+            raise CLIFactoryError(
+                u'Failed to fetch content view info\n{0}'.format(err.msg))
+        try:
+            ContentView.version_promote({
+                u'id': cvv['id'],
+                u'organization-id': results['org'],
+                u'to-lifecycle-environment-id': results['env'],
+            })
+        except CLIReturnCodeError as err:
+            raise CLIFactoryError(
+                u'Failed to promote version to next environment\n{0}'
+                .format(err.msg)
+            )
+
+    def activation_key(results):
+        if options.get('activationkey-id') is None:
+            return make_activation_key(
+                {u'organization-id': results['org']})['id']
+        return options['activationkey-id']
+
+    def associate_activation_key(results):
+        # a given activation key may have no (or a different) content view,
+        # associate it with the content view just to be sure
+        update = {
+            u'content-view-id': results['cv'],
+            u'id': results['activationkey'],
+            u'organization-id': results['org'],
+        }
+        if options.get('activationkey-id') is None:
+            update[u'lifecycle-environment-id'] = results['env']
+        try:
+            ActivationKey.update(update)
+        except CLIReturnCodeError as err:
+            raise CLIFactoryError(
+                u'Failed to associate activation-key with CV\n{0}'
+                .format(err.msg)
+            )
+
+    return [
+        ('cv', content_view, ('org',)),
+        ('add_repository', add_repository, ('cv', 'repo')),
+        ('publish', publish, ('add_repository', 'sync')),
+        ('promote', promote, ('publish', 'env')),
+        ('activationkey', activation_key, ('org',)),
+        ('associate', associate_activation_key,
+         ('activationkey', 'promote')),
+    ]
+
+
 def setup_org_for_a_custom_repo(options=None):
     """Sets up Org for the given custom repo by:
 
@@ -2968,6 +3175,9 @@ def setup_org_for_a_custom_repo(options=None):
         associates it with the content view.
     5. Adds the custom repo subscription to the activation key
 
+    The steps not depending on each other run at the same time. When a step
+    fails, the entities created by the steps already done are left behind.
+
     Options::
 
         url - URL to custom repository
@@ -2988,99 +3198,49 @@ def setup_org_for_a_custom_repo(options=None):
             not options or
             not options.get('url')):
         raise CLIFactoryError('Please provide valid custom repo URL.')
-    # Create new organization and lifecycle environment if needed
-    if options.get('organization-id') is None:
-        org_id = make_org()['id']
-    else:
-        org_id = options['organization-id']
-    if options.get('lifecycle-environment-id') is None:
-        env_id = make_lifecycle_environment({u'organization-id': org_id})['id']
-    else:
-        env_id = options['lifecycle-environment-id']
-    # Create custom product and repository
-    custom_product = make_product({u'organization-id': org_id})
-    custom_repo = make_repository({
-        u'content-type': 'yum',
-        u'product-id': custom_product['id'],
-        u'url': options.get('url'),
-    })
-    # Synchronize custom repository
-    try:
-        Repository.synchronize({'id': custom_repo['id']})
-    except CLIReturnCodeError as err:
-        raise CLIFactoryError(
-            u'Failed to synchronize repository\n{0}'.format(err.msg))
-    # Create CV if needed and associate repo with it
-    if options.get('content-view-id') is None:
-        cv_id = make_content_view({u'organization-id': org_id})['id']
-    else:
-        cv_id = options['content-view-id']
-    try:
-        ContentView.add_repository({
-            u'id': cv_id,
-            u'organization-id': org_id,
-            u'repository-id': custom_repo['id'],
-        })
-    except CLIReturnCodeError as err:
-        raise CLIFactoryError(
-            u'Failed to add repository to content view\n{0}'.format(err.msg))
-    # Publish a new version of CV
-    try:
-        ContentView.publish({u'id': cv_id})
-    except CLIReturnCodeError as err:
-        raise CLIFactoryError(
-            u'Failed to publish new version of content view\n{0}'
-            .format(err.msg)
-        )
-    # Get the version id
-    cvv = ContentView.info({u'id': cv_id})['versions'][-1]
-    # Promote version to next env
-    try:
-        ContentView.version_promote({
-            u'id': cvv['id'],
-            u'organization-id': org_id,
-            u'to-lifecycle-environment-id': env_id,
+
+    def make_custom_product(results):
+        return make_product({u'organization-id': results['org']})
+
+    def make_custom_repo(results):
+        return make_repository({
+            u'content-type': 'yum',
+            u'product-id': results['product']['id'],
+            u'url': options.get('url'),
         })
-    except CLIReturnCodeError as err:
-        raise CLIFactoryError(
-            u'Failed to promote version to next environment\n{0}'
-            .format(err.msg)
-        )
-    # Create activation key if needed and associate content view with it
-    if options.get('activationkey-id') is None:
-        activationkey_id = make_activation_key({
-            u'content-view-id': cv_id,
-            u'lifecycle-environment-id': env_id,
-            u'organization-id': org_id,
-        })['id']
-    else:
-        activationkey_id = options['activationkey-id']
-        # Given activation key may have no (or different) CV associated.
-        # Associate activation key with CV just to be sure
+
+    def synchronize(results):
         try:
-            ActivationKey.update({
-                u'content-view-id': cv_id,
-                u'id': activationkey_id,
-                u'organization-id': org_id,
-            })
+            Repository.synchronize({'id': results['repo']['id']})
         except CLIReturnCodeError as err:
             raise CLIFactoryError(
-                u'Failed to associate activation-key with CV\n{0}'
-                .format(err.msg)
-            )
-    # Add subscription to activation-key
-    activationkey_add_subscription_to_repo({
-        u'activationkey-id': activationkey_id,
-        u'organization-id': org_id,
-        u'subscription': custom_product['name'],
-    })
+                u'Failed to synchronize repository\n{0}'.format(err.msg))
+
+    def add_subscription(results):
+        activationkey_add_subscription_to_repo({
+            u'activationkey-id': results['activationkey'],
+            u'organization-id': results['org'],
+            u'subscription': results['product']['name'],
+        })
+
+    results = _run_task_graph(
+        [
+            ('org', _given_or_new_org(options), ()),
+            ('env', _given_or_new_env(options), ('org',)),
+            ('product', make_custom_product, ('org',)),
+            ('repo', make_custom_repo, ('product',)),
+            ('sync', synchronize, ('repo',)),
+        ] +
+        _content_view_tasks(options) +
+        [('subscription', add_subscription, ('associate', 'product'))]
+    )
     return {
-        u'activationkey-id': activationkey_id,
-        u'content-view-id': cv_id,
-        u'lifecycle-environment-id': env_id,
-        u'organization-id': org_id,
-        u'product-id': custom_product['id'],
-        u'repository-id': custom_repo['id'],
+        u'activationkey-id': results['activationkey'],
+        u'content-view-id': results['cv'],
+        u'lifecycle-environment-id': results['env'],
+        u'organization-id': results['org'],
+        u'product-id': results['product']['id'],
+        u'repository-id': results['repo']['id'],
     }
 
 
@@ -3099,6 +3259,9 @@ def _setup_org_for_a_rh_repo(options=None):
         associates it with the content view.
     6. Adds the RH repo subscription to the activation key
 
+    The steps not depending on each other run at the same time. When a step
+    fails, the entities created by the steps already done are left behind.
+
     Note that in most cases you should use ``setup_org_for_a_rh_repo`` instead
     as it's more flexible.
 
@@ -3131,133 +3294,80 @@ def _setup_org_for_a_rh_repo(options=None):
             not options.get('repository')):
         raise CLIFactoryError(
             'Please provide valid product, repository-set and repo.')
-    # Create new organization and lifecycle environment if needed
-    if options.get('organization-id') is None:
-        org_id = make_org()['id']
-    else:
-        org_id = options['organization-id']
-    if options.get('lifecycle-environment-id') is None:
-        env_id = make_lifecycle_environment({u'organization-id': org_id})['id']
-    else:
-        env_id = options['lifecycle-environment-id']
-    # Clone manifest and upload it
-    with manifests.clone() as manifest:
-        upload_file(manifest.content, manifest.filename)
-    try:
-        Subscription.upload({
-            u'file': manifest.filename,
-            u'organization-id': org_id,
-        })
-    except CLIReturnCodeError as err:
-        raise CLIFactoryError(
-            u'Failed to upload manifest\n{0}'.format(err.msg))
-    # Enable repo from Repository Set
-    try:
-        RepositorySet.enable({
-            u'basearch': 'x86_64',
-            u'name': options['repository-set'],
-            u'organization-id': org_id,
-            u'product': options['product'],
-            u'releasever': options.get('releasever'),
-        })
-    except CLIReturnCodeError as err:
-        raise CLIFactoryError(
-            u'Failed to enable repository set\n{0}'.format(err.msg))
-    # Fetch repository info
-    try:
-        rhel_repo = Repository.info({
-            u'name': options['repository'],
-            u'organization-id': org_id,
-            u'product': options['product'],
-        })
-    except CLIReturnCodeError as err:
-        raise CLIFactoryError(
-            u'Failed to fetch repository info\n{0}'.format(err.msg))
-    # Synchronize the RH repository
-    try:
-        Repository.synchronize({
-            u'name': options['repository'],
-            u'organization-id': org_id,
-            u'product': options['product'],
-        })
-    except CLIReturnCodeError as err:
-        raise CLIFactoryError(
-            u'Failed to synchronize repository\n{0}'.format(err.msg))
-    # Create CV if needed and associate repo with it
-    if options.get('content-view-id') is None:
-        cv_id = make_content_view({u'organization-id': org_id})['id']
-    else:
-        cv_id = options['content-view-id']
-    try:
-        ContentView.add_repository({
-            u'id': cv_id,
-            u'organization-id': org_id,
-            u'repository-id': rhel_repo['id'],
-        })
-    except CLIReturnCodeError as err:
-        raise CLIFactoryError(
-            u'Failed to add repository to content view\n{0}'.format(err.msg))
-    # Publish a new version of CV
-    try:
-        ContentView.publish({u'id': cv_id})
-    except CLIReturnCodeError as err:
-        raise CLIFactoryError(
-            u'Failed to publish new version of content view\n{0}'
-            .format(err.msg)
-        )
-    # Get the version id
-    try:
-        cvv = ContentView.info({u'id': cv_id})['versions'][-1]
-    except CLIReturnCodeError as err:
-        raise CLIFactoryError(
-            u'Failed to fetch content view info\n{0}'.format(err.msg))
-    # Promote version1 to next env
-    try:
-        ContentView.version_promote({
-            u'id': cvv['id'],
-            u'organization-id': org_id,
-            u'to-lifecycle-environment-id': env_id,
-        })
-    except CLIReturnCodeError as err:
-        raise CLIFactoryError(
-            u'Failed to promote version to next environment\n{0}'
-            .format(err.msg)
-        )
-    # Create activation key if needed and associate content view with it
-    if options.get('activationkey-id') is None:
-        activationkey_id = make_activation_key({
-            u'content-view-id': cv_id,
-            u'lifecycle-environment-id': env_id,
-            u'organization-id': org_id,
-        })['id']
-    else:
-        activationkey_id = options['activationkey-id']
-        # Given activation key may have no (or different) CV associated.
-        # Associate activation key with CV just to be sure
+
+    def upload_manifest(results):
+        with manifests.clone() as manifest:
+            upload_file(manifest.content, manifest.filename)
         try:
-            ActivationKey.update({
-                u'id': activationkey_id,
-                u'organization-id': org_id,
-                u'content-view-id': cv_id,
+            Subscription.upload({
+                u'file': manifest.filename,
+                u'organization-id': results['org'],
             })
         except CLIReturnCodeError as err:
             raise CLIFactoryError(
-                u'Failed to associate activation-key with CV\n{0}'
-                .format(err.msg)
-            )
-    # Add subscription to activation-key
-    activationkey_add_subscription_to_repo({
-        u'organization-id': org_id,
-        u'activationkey-id': activationkey_id,
-        u'subscription': options.get(
-            u'subscription', DEFAULT_SUBSCRIPTION_NAME),
-    })
+                u'Failed to upload manifest\n{0}'.format(err.msg))
+
+    def enable_repo(results):
+        try:
+            RepositorySet.enable({
+                u'basearch': 'x86_64',
+                u'name': options['repository-set'],
+                u'organization-id': results['org'],
+                u'product': options['product'],
+                u'releasever': options.get('releasever'),
+            })
+        except CLIReturnCodeError as err:
+            raise CLIFactoryError(
+                u'Failed to enable repository set\n{0}'.format(err.msg))
+
+    def repo_info(results):
+        try:
+            return Repository.info({
+                u'name': options['repository'],
+                u'organization-id': results['org'],
+                u'product': options['product'],
+            })
+        except CLIReturnCodeError as err:
+            raise CLIFactoryError(
+                u'Failed to fetch repository info\n{0}'.format(err.msg))
+
+    def synchronize(results):
+        try:
+            Repository.synchronize({
+                u'name': options['repository'],
+                u'organization-id': results['org'],
+                u'product': options['product'],
+            })
+        except CLIReturnCodeError as err:
+            raise CLIFactoryError(
+                u'Failed to synchronize repository\n{0}'.format(err.msg))
+
+    def add_subscription(results):
+        activationkey_add_subscription_to_repo({
+            u'organization-id': results['org'],
+            u'activationkey-id': results['activationkey'],
+            u'subscription': options.get(
+                u'subscription', DEFAULT_SUBSCRIPTION_NAME),
+        })
+
+    results = _run_task_graph(
+        [
+            ('org', _given_or_new_org(options), ()),
+            ('env', _given_or_new_env(options), ('org',)),
+            ('manifest', upload_manifest, ('org',)),
+            ('enable', enable_repo, ('manifest',)),
+            ('repo', repo_info, ('enable',)),
+            ('sync', synchronize, ('enable',)),
+        ] +
+        _content_view_tasks(options, wrap_info_error=True) +
+        [('subscription', add_subscription, ('associate', 'manifest'))]
+    )
     return {
-        u'activationkey-id': activationkey_id,
-        u'content-view-id': cv_id,
-        u'lifecycle-environment-id': env_id,
-        u'organization-id': org_id,
-        u'repository-id': rhel_repo['id'],
+        u'activationkey-id': results['activationkey'],
+        u'content-view-id': results['cv'],
+        u'lifecycle-environment-id': results['env'],
+        u'organization-id': results['org'],
+        u'repository-id': results['repo']['id'],
     }
 
 
@@ -3344,7 +3454,7 @@ def configure_env_for_provision(org=None, loc=None):
     })
 
     # Search for SmartProxy, and associate location
-    puppet_proxy = Proxy.info({'id': Proxy.list()[0]['id']})
+    puppet_proxy = Proxy.info({'id': Proxy.list(fields=['Id'])[0]['id']})
     Proxy.update({
         'id': puppet_proxy['id'],
         'locations': list(
@@ -3355,7 +3465,8 @@ def configure_env_for_provision(org=None, loc=None):
     # Search for existing domain or create new otherwise. Associate org,
     # location and dns to it
     _, _, domain_name = settings.server.hostname.partition('.')
-    domain = Domain.list({'search': 'name={0}'.format(domain_name)})
+    domain = Domain.list(
+        {'search': 'name={0}'.format(domain_name)}, fields=['Id'])
     if len(domain) == 1:
         domain = Domain.info({'id': domain[0]['id']})
         Domain.update({
@@ -3377,7 +3488,8 @@ def configure_env_for_provision(org=None, loc=None):
     # Search if subnet is defined with given network. If so, just update its
     # relevant fields otherwise create new subnet
     network = settings.vlan_networking.subnet
-    subnet = Subnet.list({'search': 'network={0}'.format(network)})
+    subnet = Subnet.list(
+        {'search': 'network={0}'.format(network)}, fields=['Id'])
     if len(subnet) == 1:
         subnet = Subnet.info({'id': subnet[0]['id']})
         Subnet.update({
@@ -3809,7 +3921,8 @@ def setup_capsule_virtual_machine(capsule_vm, org_id=None, lce_id=None,
     if organization_ids:
         # update the capsule with organization_ids and location_ids
         if not location_ids:
-            location_ids.append(Location.info({'name': DEFAULT_LOC})['id'])
+            location_ids.append(Location.info(
+                {'name': DEFAULT_LOC}, fields=['Id'])['id'])
 
         Capsule.update({
             'id': capsule['id'],
@@ -4290,3 +4403,175 @@ def virt_who_hypervisor_config(
         'lifecycle_environment_id': lce['id'],
         'virt_who_hypervisor_host': virt_who_hypervisor_host,
     }
+
+
+def _make_pool_orgs(count):
+    """Create ``count`` organizations for the organizations pool, yielding
+    each one once created.
+    """
+    for _ in range(count):
+        yield make_org().copy()
+
+
+def _make_in_new_org(make_entity):
+    """Create an entity with ``make_entity`` in a new organization and return
+    it with the ``organization-id`` of its organization. The organization is
+    deleted when the entity can not be created.
+    """
+    org_id = make_org()['id']
+    try:
+        entity = make_entity({u'organization-id': org_id}).copy()
+    except Exception:
+        _delete_orgs([org_id])
+        raise
+    entity[u'organization-id'] = org_id
+    return entity
+
+
+def _make_pool_lifecycle_environments(count):
+    """Create ``count`` lifecycle environments for the lifecycle environments
+    pool, each in its own organization, yielding each one once created.
+    """
+    for _ in range(count):
+        yield _make_in_new_org(make_lifecycle_environment)
+
+
+def _make_pool_products(count):
+    """Create ``count`` products for the products pool, each in its own
+    organization, yielding each one once created.
+    """
+    for _ in range(count):
+        yield _make_in_new_org(make_product)
+
+
+def _delete_orgs(org_ids):
+    """Delete the organizations of the pooled entities, with their
+    content.
+    """
+    for org_id in sorted(set(org_ids)):
+        try:
+            Org.delete({u'id': org_id})
+        except CLIReturnCodeError as err:
+            logger.warning(
+                u'Failed to delete organization {0}: {1}'.format(
+                    org_id, err.msg))
+
+
+# the pooled entities with the functions creating a batch of them and
+# destroying them
+_ENTITY_POOLS = {
+    'organization': (
+        _make_pool_orgs,
+        lambda orgs: _delete_orgs(org['id'] for org in orgs),
+    ),
+    'lifecycle-environment': (
+        _make_pool_lifecycle_environments,
+        lambda lces: _delete_orgs(lce['organization-id'] for lce in lces),
+    ),
+    'product': (
+        _make_pool_products,
+        lambda products: _delete_orgs(
+            product['organization-id'] for product in products),
+    ),
+}
+_entity_pools_lock = threading.Lock()
+_entity_pools = {}
+
+
+def _get_entity_pool(name):
+    """Return the pool of entities ``name``, or ``None`` when
+    ``entity_pool_size`` from configuration's ``shared_function`` section is
+    not set.
+    """
+    if (not setting_is_set('shared_function') or
+            not settings.shared_function.entity_pool_size):
+        return None
+    with _entity_pools_lock:
+        if name not in _entity_pools:
+            create_batch, destroy = _ENTITY_POOLS[name]
+            _entity_pools[name] = SharedPool(
+                name,
+                create_batch,
+                destroy,
+                settings.shared_function.entity_pool_size
+            )
+        return _entity_pools[name]
+
+
+def _lease_entity(name):
+    """Lease an entity of the pool ``name``, or create one when the pools are
+    disabled.
+    """
+    pool = _get_entity_pool(name)
+    if pool is None:
+        return next(_ENTITY_POOLS[name][0](1))
+    return pool.lease()
+
+
+def lease_org():
+    """Return an organization for the caller only, to use as the parent of
+    the entities of a test.
+
+    When ``entity_pool_size`` from configuration's ``shared_function`` section
+    is set, the organization is taken from a pool created ahead of time and
+    shared by all the pytest-xdist workers, and it is deleted at the end of
+    the run. Otherwise it is created by :func:`make_org`.
+
+    :return: The organization, as returned by :func:`make_org`.
+    """
+    return _lease_entity('organization')
+
+
+def lease_lifecycle_environment():
+    """Return a lifecycle environment for the caller only, in its own
+    organization, like :func:`lease_org`.
+
+    :return: The lifecycle environment, as returned by
+        :func:`make_lifecycle_environment`, with the ``organization-id`` of
+        its organization.
+    """
+    return _lease_entity('lifecycle-environment')
+
+
+def lease_product():
+    """Return a product for the caller only, in its own organization, like
+    :func:`lease_org`.
+
+    :return: The product, as returned by :func:`make_product`, with the
+        ``organization-id`` of its organization.
+    """
+    return _lease_entity('product')
+
+
+def refill_entity_pools():
+    """Refill the entities pools leased from during the run, called by the
+    process running the tests between two tests, so the tests do not wait
+    for the pools refills.
+
+    :return: The names of the refilled pools.
+    """
+    refilled = []
+    for name in sorted(_ENTITY_POOLS):
+        pool = _get_entity_pool(name)
+        if pool is not None and pool.refill_if_needed():
+            refilled.append(name)
+    return refilled
+
+
+def finish_entity_pools():
+    """Delete the organizations of the entities leased during the run, called
+    by the master process at the end of the run.
+
+    The free entities are kept for the next run when ``scope`` from
+    configuration's ``shared_function`` section is set, as the next run uses
+    the same pools, and deleted otherwise.
+
+    :return: The number of deleted entities.
+    """
+    destroyed = 0
+    for name in sorted(_ENTITY_POOLS):
+        pool = _get_entity_pool(name)
+        if pool is not None:
+            destroyed += pool.finish(
+                recycle=bool(settings.shared_function.scope))
+    return destroyed
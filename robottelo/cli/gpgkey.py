@@ -30,12 +30,11 @@ class GPGKey(Base):
     command_requires_org = True
 
     @classmethod
-    def info(cls, options=None):
+    def info(cls, options=None, fields=None):
         """
         Gets information for GPG Key
         """
 
-        cls.command_sub = 'info'
-
         return cls.execute(
-            cls._construct_command(options), output_format='json')
+            cls._construct_command('info', cls._add_fields(options, fields)),
+            output_format='json')
@@ -4,8 +4,11 @@ import json
 
 import re
 import six
+try:
+    from collections.abc import Mapping, Sequence
+except ImportError:  # pragma: no cover
+    from collections import Mapping, Sequence
 from six import text_type
-from six.moves import cStringIO as StringIO
 from six.moves import zip
 
 
@@ -23,17 +26,21 @@ def _csv_reader(output):
     On Python 3 this generator is not needed because the default string type is
     unicode.
 
+    The lines are fed to the reader one at a time, so ``output`` can be a
+    stream (like :class:`robottelo.ssh.SSHCommandStream`) which is parsed while
+    it is received.
+
     :param output: can be any object which supports the iterator protocol and
     returns a unicode string each time its next() method is called.
     :return: generator that will yield a list of unicode string values.
 
     """
-    data = '\n'.join(output)
     if six.PY2:
-        data = data.encode('utf8')
-    handler = StringIO(data)
+        lines = (line.encode('utf8') + '\n' for line in output)
+    else:
+        lines = (line + '\n' for line in output)
 
-    for row in csv.reader(handler):  # pragma: no cover
+    for row in csv.reader(lines):  # pragma: no cover
         if six.PY2:
             yield [value.decode('utf8') for value in row]
         else:
@@ -68,11 +75,139 @@ def _normalize_obj(obj):
     return obj
 
 
-def parse_csv(output):
-    """Parse CSV output from Hammer CLI and convert it to python dictionary."""
+class CSVRow(Mapping):
+    """Read only mapping of a :class:`CSVResult` row.
+
+    The row values are kept in a tuple and looked up by the index of their
+    key in the header shared by all the rows of the result. It compares equal
+    to the dict it represents, use :meth:`to_dict` to get that dict.
+
+    :param dict index: the position of each key in the row.
+    :param tuple keys: the row keys, in the header order.
+    :param tuple values: the row values.
+    """
+    __slots__ = ('_index', '_keys', '_values')
+
+    def __init__(self, index, keys, values):
+        self._index = index
+        self._keys = keys
+        self._values = values
+
+    def __getitem__(self, key):
+        try:
+            return self._values[self._index[key]]
+        except IndexError:
+            # a short row has no value for the last keys
+            raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._keys[:len(self._values)])
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+    def to_dict(self):
+        """Return a new dict mapping the row keys to their values."""
+        return dict(zip(self._keys, self._values))
+
+
+class CSVResult(Sequence):
+    """Read only list of the rows of a hammer CSV output.
+
+    The header is normalized and kept once, each row only keeps a tuple of
+    its values, which takes much less memory than a dict per row for results
+    of thousands of rows. The rows are read as :class:`CSVRow` mappings, so
+    ``result[0]['id']`` or ``[row['name'] for row in result]`` work like with
+    the list of dicts returned by :func:`parse_csv`, and the result compares
+    equal to that list. Use :meth:`to_dicts` to get the list of dicts.
+
+    :param keys: the normalized header keys, without duplicates.
+    :param rows: the rows values, a tuple per row, which can be shorter than
+        ``keys``.
+    """
+    __slots__ = ('keys', 'rows', '_index')
+
+    def __init__(self, keys, rows=()):
+        self.keys = tuple(keys)
+        self.rows = list(rows)
+        self._index = {key: position for position, key in enumerate(self.keys)}
+
+    def _row(self, values):
+        return CSVRow(self._index, self.keys, values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return CSVResult(self.keys, self.rows[index])
+        return self._row(self.rows[index])
+
+    def __iter__(self):
+        for values in self.rows:
+            yield self._row(values)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __eq__(self, other):
+        if isinstance(other, CSVResult):
+            if self.keys == other.keys:
+                return self.rows == other.rows
+        elif not isinstance(other, (list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            row == other_row for row, other_row in zip(self, other))
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.to_dicts())
+
+    def __copy__(self):
+        return CSVResult(self.keys, self.rows)
+
+    def __deepcopy__(self, memo):
+        # rows are tuples of strings, they can be shared by the copies
+        return self.__copy__()
+
+    def __reduce__(self):
+        return CSVResult, (self.keys, self.rows)
+
+    def to_dicts(self):
+        """Return the rows as a new list of dicts."""
+        return [dict(zip(self.keys, values)) for values in self.rows]
+
+
+def parse_csv(output, compact=False):
+    """Parse CSV output from Hammer CLI and convert it to python dictionary.
+
+    When ``compact`` is set, return a :class:`CSVResult` instead of a list of
+    dicts.
+    """
     reader = _csv_reader(output)
     # Generate the key names, spaces will be converted to dashes "-"
     keys = [_normalize(header) for header in next(reader)]
+    if compact:
+        # keep the last column of a repeated header, like a dict does
+        positions = sorted(
+            {key: position for position, key in enumerate(keys)}.values())
+        if len(positions) == len(keys):
+            size = len(keys)
+            rows = [tuple(values[:size]) for values in reader if values]
+        else:
+            rows = [
+                tuple(values[position] for position in positions
+                      if position < len(values))
+                for values in reader if values
+            ]
+        return CSVResult([keys[position] for position in positions], rows)
     # For each entry, create a dict mapping each key with each value
     return [dict(zip(keys, values)) for values in reader if len(values) > 0]
 
@@ -185,8 +320,20 @@ def get_line_indentation_level(line, tab_spaces=4, indentation_spaces=4):
         line, tab_spaces=tab_spaces)//indentation_spaces
 
 
+#: Number of an info list item, like ``1) Repo Name``.
+_INFO_ITEM_NUMBER = re.compile(r'(\d+)\)')
+_INFO_ITEM_NUMBERS = re.compile(r'\d+\)')
+#: Value of a single attribute collection item, numbered or not.
+_INFO_NUMBERED_VALUE = re.compile(r'\d+\)\s+(.+)$')
+_INFO_VALUE = re.compile(r'(.*)$')
+
+
 def parse_info(output):
-    """Parse the info output and returns a dict mapping the values."""
+    """Parse the info output and returns a dict mapping the values.
+
+    Each line is scanned once for its indentation, with the same rules as
+    :func:`get_line_indentation_level`, and the patterns are compiled once.
+    """
     # info dictionary
     contents = {}
     sub_prop = None  # stores name of the last group of sub-properties
@@ -197,23 +344,27 @@ def parse_info(output):
         # skip empty lines
         if line == '':
             continue
-        current_indent_level = get_line_indentation_level(line)
+        body = line.lstrip(' \t')
+        indentation = len(line) - len(body)
+        if indentation == 0 or len(line) < 4:
+            current_indent_level = 0
+        else:
+            # a tab counts as 4 spaces, a level is 4 spaces
+            current_indent_level = (
+                indentation + 3 * line.count('\t', 0, indentation)) // 4
         if current_indent_level <= 1:
             # we are entering or leaving a second level from lower/upper levels
             # clear the second level key
             second_level_key = None
-        if line.startswith(' '):  # sub-properties are indented
+        stripped = body.lstrip()
+        if line[0] == ' ':  # sub-properties are indented
             # values are separated by ':' or '=>', but not by '::' which can be
             # entity name like 'test::params::keys'
-            if line.find(':') != -1 and not line.find('::') != -1:
-                key, value = line.lstrip().split(":", 1)
-            elif line.find('=>') != -1 and len(
-                    line.lstrip().split(" =>", 1)) == 2:
-                key, value = line.lstrip().split(" =>", 1)
+            if ':' in stripped and '::' not in stripped:
+                key, value = stripped.split(':', 1)
+            elif ' =>' in stripped:
+                key, value = stripped.split(' =>', 1)
             else:
-                key = value = None
-
-            if key is None and value is None:
                 # Parse single attribute collection properties
                 # Template
                 #  1) template1
@@ -223,10 +374,9 @@ def parse_info(output):
                 # Template
                 #  template1
                 #  template2
-                match = re.match(r'\d+\)\s+(.+)$', line.lstrip())
-
+                match = _INFO_NUMBERED_VALUE.match(stripped)
                 if match is None:
-                    match = re.match(r'(.*)$', line.lstrip())
+                    match = _INFO_VALUE.match(stripped)
 
                 value = match.group(1)
 
@@ -234,59 +384,62 @@ def parse_info(output):
                     contents[sub_prop] = []
 
                 contents[sub_prop].append(value)
-            else:
-                # some properties have many numbered values
-                # Example:
-                # Content:
-                #  1) Repo Name: repo1
-                #     URL:       /custom/4f84fc90-9ffa-...
-                #  2) Repo Name: puppet1
-                #     URL:       /custom/4f84fc90-9ffa-...
-                starts_with_number = re.match(r'(\d+)\)', key)
+                continue
+
+            # some properties have many numbered values
+            # Example:
+            # Content:
+            #  1) Repo Name: repo1
+            #     URL:       /custom/4f84fc90-9ffa-...
+            #  2) Repo Name: puppet1
+            #     URL:       /custom/4f84fc90-9ffa-...
+            if key[:1].isdigit():
+                starts_with_number = _INFO_ITEM_NUMBER.match(key)
                 if starts_with_number:
                     sub_num = int(starts_with_number.group(1))
                     # no. 1) we need to change dict() to list()
                     if sub_num == 1:
                         contents[sub_prop] = []
                     # remove number from key
-                    key = re.sub(r'\d+\)', '', key)
+                    key = _INFO_ITEM_NUMBERS.sub('', key).lstrip()
                     # append empty dict to array
                     contents[sub_prop].append({})
 
-                key = key.lstrip().replace(' ', '-').lower()
-                value = value.lstrip()
-                # add value to dictionary
-                if sub_num is not None:
-                    contents[sub_prop][-1][key] = value
+            key = key.replace(' ', '-').lower()
+            value = value.lstrip()
+            # add value to dictionary
+            if sub_num is not None:
+                contents[sub_prop][-1][key] = value
+            else:
+                # a third level is always represented as a dictionary and
+                # we need to detect if we are at third level
+                # example:
+                # Content Information:
+                #     Content View:
+                #         ID:   10
+                #         Name: Default Organization View
+                # the "ID" and "Name" are located at third indent level
+                # "content view" is located at second indent level
+                if current_indent_level == 2 and second_level_key:
+                    # we are at third level indentation
+                    if not contents[sub_prop][second_level_key]:
+                        contents[sub_prop][second_level_key] = {}
+                    contents[sub_prop][second_level_key][key] = value
                 else:
-                    # a third level is always represented as a dictionary and
-                    # we need to detect if we are at third level
-                    # example:
-                    # Content Information:
-                    #     Content View:
-                    #         ID:   10
-                    #         Name: Default Organization View
-                    # the "ID" and "Name" are located at third indent level
-                    # "content view" is located at second indent level
-                    if current_indent_level == 2 and second_level_key:
-                        # we are at third level indentation
-                        if not contents[sub_prop][second_level_key]:
-                            contents[sub_prop][second_level_key] = {}
-                        contents[sub_prop][second_level_key][key] = value
-                    else:
-                        contents[sub_prop][key] = value
-                    if current_indent_level == 1 and not value:
-                        # always set the last possible second level key
-                        # that can form a third level
-                        second_level_key = key
+                    contents[sub_prop][key] = value
+                if current_indent_level == 1 and not value:
+                    # always set the last possible second level key
+                    # that can form a third level
+                    second_level_key = key
         else:
             sub_num = None  # new property implies no sub property
-            key, value = line.lstrip().split(":", 1)
-            key = key.lstrip().replace(' ', '-').lower()
-            if value.lstrip() == '':  # 'key:' no value, new sub-property
+            key, value = stripped.split(':', 1)
+            key = key.replace(' ', '-').lower()
+            value = value.lstrip()
+            if value == '':  # 'key:' no value, new sub-property
                 sub_prop = key
                 contents[sub_prop] = {}
             else:  # 'key: value' line
-                contents[key] = value.lstrip()
+                contents[key] = value
 
     return contents
@@ -0,0 +1,282 @@
+"""Hammer command tree cached by Satellite version.
+
+:func:`crawl_command_tree` reads the help of every hammer command and returns
+the tree of the commands with their options, in the format of
+``tests/foreman/data/hammer_commands.json``. The commands are read level by
+level, the help of all the commands of a level is read at the same time on the
+channels of a single pooled connection.
+
+The tree only changes with the Satellite version, so :func:`get_command_tree`
+stores it in a ``hammer_commands-<version>.json`` file under
+``command_tree_dir`` from configuration's ``hammer`` section and only crawls it
+when the file of the server version is missing.
+
+When ``validate_options`` is enabled in configuration's ``hammer`` section,
+:meth:`robottelo.cli.base.Base._construct_command` calls :func:`validate` so a
+command with an option hammer does not know fails locally, as hammer would,
+without a round trip to the server. The CLI factories also log the default
+options of the ``make_*`` functions which their create command does not
+accept.
+"""
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+
+from robottelo import ssh
+from robottelo.cli import hammer
+from robottelo.config import settings
+
+logger = logging.getLogger(__name__)
+
+#: Name of the cached command tree file of a Satellite version.
+TREE_FILE = 'hammer_commands-{0}.json'
+
+#: Reads the Satellite package version, or the hammer and plugins versions
+#: on an upstream server.
+_VERSION_COMMAND = (
+    u'rpm -q --quiet satellite && '
+    u"rpm -q --queryformat '%{VERSION}-%{RELEASE}' satellite || "
+    u'hammer --version'
+)
+
+#: Option lines of hammer help with several names, e.g. a deprecated one.
+_OPTION_NAMES_REGEX = re.compile(r'^ (?:-\w, )?(--[\w-]+(?:, --[\w-]+)+)')
+
+
+class HammerCommandError(Exception):
+    """Raised when a hammer command or one of its options does not exist."""
+
+
+class HammerCommandTreeError(Exception):
+    """Raised when the hammer command tree can not be read from the
+    server.
+    """
+
+
+def get_command_tree_dir():
+    """Return the directory of the cached command trees."""
+    return settings.hammer.command_tree_dir or os.path.join(
+        settings.tmp_dir or tempfile.gettempdir(),
+        'robottelo',
+        'hammer_commands'
+    )
+
+
+def get_server_version():
+    """Return the Satellite version of the server from configuration's
+    ``server`` section, e.g. ``6.4.2-1.el7sat``, or the versions of hammer and
+    its plugins on an upstream server, usable in a file name.
+    """
+    result = ssh.command(_VERSION_COMMAND, output_format='plain')
+    if result.return_code != 0:
+        raise HammerCommandTreeError(
+            u'Can not read the server version: {0}'.format(result.stderr))
+    return re.sub(r'[^\w.-]+', u'_', (result.stdout or u'').strip())
+
+
+def parse_command_help(output):
+    """Parse the help ``output`` of a hammer command like
+    :func:`robottelo.cli.hammer.parse_help`, adding the other names of the
+    options accepted under several names as their ``aliases``.
+    """
+    contents = hammer.parse_help(output)
+    options = dict(
+        (option['name'], option) for option in contents['options'])
+    for line in output:
+        match = _OPTION_NAMES_REGEX.search(line)
+        if match is None:
+            continue
+        names = [name[2:] for name in match.group(1).split(', ')]
+        option = options.get(names[0])
+        if option is not None:
+            option[u'aliases'] = names[1:]
+    return contents
+
+
+def crawl_command_tree(hostname=None, max_channels=None):
+    """Read the help of every hammer command on ``hostname`` and return the
+    command tree.
+
+    :param str hostname: The hostname of the server running hammer. If it is
+        ``None`` ``hostname`` from configuration's ``server`` section will be
+        used.
+    :param int max_channels: Maximum number of help commands run at the same
+        time. If it is ``None`` ``max_channels`` from configuration's
+        ``ssh_client`` section will be used.
+    :raises HammerCommandTreeError: if the help of a command can not be
+        read.
+    """
+    tree = {}
+    level = [(u'hammer', tree)]
+    with ssh.get_session(
+            hostname=hostname, max_channels=max_channels) as session:
+        while level:
+            results = session.map(
+                [u'LANG={0} {1} --help'.format(settings.locale, command)
+                 for command, _ in level],
+                output_format='plain'
+            )
+            next_level = []
+            for (command, node), result in zip(level, results):
+                if result.return_code != 0:
+                    raise HammerCommandTreeError(
+                        u'Can not read the help of {0}: {1}'.format(
+                            command, result.stderr))
+                node.update(parse_command_help(
+                    (result.stdout or u'').splitlines()))
+                next_level.extend(
+                    (u'{0} {1}'.format(command, subcommand['name']),
+                     subcommand)
+                    for subcommand in node['subcommands']
+                )
+            level = next_level
+    return tree
+
+
+def index_command_tree(tree):
+    """Return the names of the options accepted by each command of ``tree``,
+    by command without the leading ``hammer``, e.g. ``'content-view version
+    promote'``.
+    """
+    index = {}
+    nodes = [(u'', tree)]
+    while nodes:
+        command, node = nodes.pop()
+        names = set()
+        for option in node.get('options', ()):
+            names.add(option['name'])
+            names.update(option.get('aliases', ()))
+        index[command] = frozenset(names)
+        nodes.extend(
+            (u'{0} {1}'.format(command, subcommand['name']).strip(),
+             subcommand)
+            for subcommand in node.get('subcommands', ())
+        )
+    return index
+
+
+def _command_tree_path(version):
+    """Return the path of the cached command tree of ``version``."""
+    return os.path.join(get_command_tree_dir(), TREE_FILE.format(version))
+
+
+def _load_command_tree(version):
+    """Return the command tree of ``version`` from its file, crawling and
+    storing it when the file is missing.
+    """
+    path = _command_tree_path(version)
+    if os.path.exists(path):
+        with open(path) as handler:
+            return json.load(handler)
+    logger.info('Crawling the hammer command tree of Satellite %s', version)
+    tree = crawl_command_tree()
+    directory = os.path.dirname(path)
+    if not os.path.isdir(directory):
+        try:
+            os.makedirs(directory)
+        except OSError:
+            # created by another process in the meantime
+            if not os.path.isdir(directory):
+                raise
+    # the file is renamed once complete, so other processes never read a
+    # partial tree
+    handle, temp_path = tempfile.mkstemp(dir=directory, suffix='.json')
+    with os.fdopen(handle, 'w') as handler:
+        json.dump(tree, handler, indent=2, sort_keys=True)
+    os.rename(temp_path, path)
+    return tree
+
+
+_trees_lock = threading.Lock()
+_trees = {}
+_server_version = []
+
+
+def _get_command_index(version=None):
+    """Return the command tree of ``version`` and its index, cached in the
+    process.
+    """
+    with _trees_lock:
+        if version is None:
+            if not _server_version:
+                _server_version.append(get_server_version())
+            version = _server_version[0]
+        if version not in _trees:
+            tree = _load_command_tree(version)
+            _trees[version] = (tree, index_command_tree(tree))
+        return _trees[version]
+
+
+def get_command_tree(version=None):
+    """Return the hammer command tree of the Satellite ``version``.
+
+    :param str version: The Satellite version. If it is ``None`` the version
+        of the server from configuration's ``server`` section will be used.
+    """
+    return _get_command_index(version)[0]
+
+
+def clear_command_trees():
+    """Forget the command trees loaded by this process, the cached files are
+    kept.
+    """
+    with _trees_lock:
+        _trees.clear()
+        del _server_version[:]
+
+
+def remove_command_tree(version):
+    """Remove the cached command tree of ``version``, it is crawled again on
+    its next use.
+    """
+    with _trees_lock:
+        _trees.pop(version, None)
+        path = _command_tree_path(version)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _normalize_command(command):
+    """Return ``command`` with single spaces between its words, the CLI
+    classes build some subcommands with a trailing space.
+    """
+    return u' '.join(command.split())
+
+
+def unknown_options(command, options, version=None):
+    """Return the sorted names of ``options`` which the hammer ``command``
+    does not accept.
+
+    :param str command: The hammer command without the leading ``hammer``,
+        e.g. ``'organization create'``.
+    :param options: The option names, without the leading ``--``.
+    :param str version: The Satellite version, as for
+        :func:`get_command_tree`.
+    :raises HammerCommandError: if the command does not exist.
+    :raises HammerCommandTreeError: if the command tree can not be read.
+    """
+    command = _normalize_command(command)
+    index = _get_command_index(version)[1]
+    accepted = index.get(command)
+    if accepted is None:
+        raise HammerCommandError(
+            u"Error: No such sub-command '{0}'.".format(command))
+    return sorted(set(options) - accepted)
+
+
+def validate(command, options, version=None):
+    """Raise :class:`HammerCommandError` with the hammer error message when
+    ``command`` does not exist or does not accept one of ``options``.
+
+    The arguments are the same as :func:`unknown_options`.
+    """
+    command = _normalize_command(command)
+    unknown = unknown_options(command, options, version)
+    if unknown:
+        raise HammerCommandError(
+            u"Error: Unrecognised option '--{0}'.\n\n"
+            u"See: 'hammer {1} --help'.".format(unknown[0], command)
+        )
@@ -0,0 +1,191 @@
+"""Hammer sessions authenticating each user once.
+
+When hammer is given ``-u`` and ``-p``, it authenticates against the API for
+every command. With ``use_sessions`` enabled in its configuration, ``hammer
+auth login`` authenticates once and stores the session cookie under
+``~/.hammer/sessions``, the next commands only send the cookie.
+
+Hammer keeps a single session per server in a home directory, so each user
+gets its own home directory on the server, under ``sessions_dir`` from
+configuration's ``hammer`` section, named after the user and its password. It
+holds a copy of the hammer configuration of the ssh user, without its
+credentials and with ``use_sessions`` enabled. The copy is prepared in a
+temporary directory and moved into place, so the processes sharing the home
+directory never read a partial configuration. The commands of a user are run
+with ``HOME`` set to that directory and without ``-u`` and ``-p``.
+
+:meth:`robottelo.cli.base.Base.execute` uses the sessions when ``sessions`` is
+enabled in configuration's ``hammer`` section and the command is not run in
+the resident hammer process of :mod:`robottelo.cli.hammer_shell`.
+
+The home directories and their session cookies stay on the server, so a new
+process, e.g. a pytest-xdist worker or a test forked by ``pytest --boxed``,
+runs its commands in the existing session right away. A user only logs in
+when a command fails to authenticate: its session expired, was never opened,
+or its password was changed on the server. The user then logs in and the
+command is run once more, with ``-u`` and ``-p`` if the user can not log in.
+"""
+import hashlib
+import logging
+import posixpath
+import re
+import threading
+
+from six.moves import shlex_quote
+
+from robottelo import ssh
+from robottelo.config import settings
+
+logger = logging.getLogger(__name__)
+
+#: Hammer configuration file enabling the sessions, it is loaded after the
+#: ``foreman.yml`` one.
+SESSIONS_CONFIG = 'robottelo_sessions.yml'
+
+#: Error of the commands run in a session home directory which was never
+#: prepared, hammer would use the configuration of the server otherwise.
+NO_SESSION_ERROR = u'Missing credentials: no hammer session'
+
+#: Error messages of hammer when the session can not authenticate the user.
+_AUTH_ERROR_REGEX = re.compile(
+    r'Invalid username or password|Unable to authenticate user|'
+    r'Session has expired|[Cc]redentials are not configured|'
+    r'Missing credentials|401 Unauthorized'
+)
+
+
+class HammerSessionError(Exception):
+    """Raised when a user can not log in a hammer session."""
+
+
+def is_auth_error(response):
+    """Return whether the hammer command ``response`` failed because its user
+    was not authenticated.
+    """
+    return response.return_code != 0 and bool(
+        _AUTH_ERROR_REGEX.search(response.stderr or u''))
+
+
+class HammerSession(object):
+    """The hammer session of ``user`` on ``hostname``.
+
+    :param str user: The user to log in.
+    :param str password: The user password.
+    :param str hostname: The hostname of the server running hammer. If it is
+        ``None`` ``hostname`` from configuration's ``server`` section will be
+        used.
+    """
+
+    def __init__(self, user, password, hostname=None):
+        self.user = user
+        self.password = password
+        self.hostname = hostname or settings.server.hostname
+        self.home = posixpath.join(
+            settings.hammer.sessions_dir,
+            hashlib.sha1(
+                u'{0}:{1}'.format(user, password).encode('utf-8')).hexdigest()
+        )
+        self.logged_in = False
+        self._lock = threading.Lock()
+
+    @property
+    def env(self):
+        """Environment variables running hammer in the session."""
+        return {u'HOME': self.home}
+
+    @property
+    def config_file(self):
+        """The hammer configuration file enabling the sessions."""
+        return posixpath.join(
+            self.home, '.hammer', 'cli.modules.d', SESSIONS_CONFIG)
+
+    @property
+    def check(self):
+        """Shell command run before hammer, failing with an authentication
+        error when the session home directory was never prepared.
+        """
+        return u'test -e {0} || {{ echo {1} >&2; exit 1; }};'.format(
+            shlex_quote(self.config_file), shlex_quote(NO_SESSION_ERROR))
+
+    def login(self):
+        """Prepare the session home directory and log the user in, unless it
+        is already logged in.
+
+        :raises HammerSessionError: if the user can not log in.
+        """
+        with self._lock:
+            if self.logged_in:
+                return
+            cmd = (
+                u'mkdir -p {home} && chmod 700 {home} && '
+                u'if ! test -e {config_file}; then '
+                u'tmp=$(mktemp -d {home}/.hammer.XXXXXX) && '
+                u'cp -r ~/.hammer/. "$tmp"/ 2>/dev/null; '
+                u'mkdir -p "$tmp"/cli.modules.d && '
+                u"sed -i -e '/:username:/d;/:password:/d;/:use_sessions:/d' "
+                u'"$tmp"/cli.modules.d/foreman.yml 2>/dev/null; '
+                u"printf ':foreman:\\n  :use_sessions: true\\n' "
+                u'> "$tmp"/cli.modules.d/{sessions_config} && '
+                # another process may have moved its copy first
+                u'{{ mv -T "$tmp" {hammer_dir} 2>/dev/null || '
+                u'rm -rf "$tmp"; }}; '
+                u'fi && '
+                u'LANG={locale} HOME={home} hammer --interactive no '
+                u'auth login --username {user} --password {password}'
+            ).format(
+                home=shlex_quote(self.home),
+                config_file=shlex_quote(self.config_file),
+                hammer_dir=shlex_quote(posixpath.join(self.home, '.hammer')),
+                sessions_config=SESSIONS_CONFIG,
+                locale=settings.locale,
+                user=shlex_quote(self.user),
+                password=shlex_quote(self.password),
+            )
+            result = ssh.command(
+                cmd.encode('utf-8'),
+                hostname=self.hostname,
+                output_format='plain'
+            )
+            if result.return_code != 0:
+                raise HammerSessionError(
+                    u'{0} can not log in hammer on {1}: {2}'.format(
+                        self.user, self.hostname, result.stderr))
+            self.logged_in = True
+        logger.info('hammer session of %s opened on %s',
+                    self.user, self.hostname)
+
+    def invalidate(self):
+        """Forget that the user is logged in, the next :meth:`login` logs it
+        in again.
+        """
+        with self._lock:
+            self.logged_in = False
+
+
+_sessions_lock = threading.Lock()
+_sessions = {}
+
+
+def get_hammer_session(user, password, hostname=None):
+    """Return the hammer session of ``user`` with ``password`` on
+    ``hostname``.
+
+    The user is not logged in: the commands use the session already opened on
+    the server, if any, and :meth:`HammerSession.login` is called when they
+    fail to authenticate.
+    """
+    hostname = hostname or settings.server.hostname
+    with _sessions_lock:
+        session = _sessions.get((hostname, user))
+        if session is None or session.password != password:
+            session = HammerSession(user, password, hostname)
+            _sessions[(hostname, user)] = session
+    return session
+
+
+def clear_hammer_sessions():
+    """Forget the hammer sessions of this process, the sessions opened on
+    the server are kept.
+    """
+    with _sessions_lock:
+        _sessions.clear()
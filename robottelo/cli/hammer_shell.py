@@ -0,0 +1,269 @@
+"""Resident hammer process running the CLI commands.
+
+Starting ``hammer`` costs the Ruby interpreter startup and the loading of the
+hammer modules and API documentation, which is most of the time spent by a
+simple ``info`` command. A :class:`HammerShell` keeps a Ruby process open on
+the server which loads hammer once and then forks a child per command. The
+children start with everything already loaded, run the command like the
+``hammer`` executable would and report its exit code, stdout and stderr.
+
+Each command is run in its own child, so the credentials and the other options
+given to a command do not leak into the next one and a single resident
+process per host serves every user.
+
+:meth:`robottelo.cli.base.Base.execute` uses it when ``shell`` is enabled in
+configuration's ``hammer`` section and falls back to one-shot ``hammer``
+commands when the resident process can not be started.
+"""
+import base64
+import json
+import logging
+import os
+import socket
+import threading
+import time
+
+import paramiko
+
+from six.moves import shlex_quote
+
+from robottelo import ssh
+from robottelo.config import settings
+
+logger = logging.getLogger(__name__)
+
+#: Line printed by the resident process once hammer is loaded.
+READY_MARKER = 'robottelo-hammer-shell-ready'
+
+#: Ruby script of the resident process, the path of the ``hammer`` executable
+#: is its first argument. A request is a JSON line with the hammer
+#: ``command`` line and the ``env`` variables to set, the response is a line
+#: with the exit code and the base64 encoded stdout and stderr.
+HAMMER_SERVER = r'''
+require 'base64'
+require 'json'
+require 'tempfile'
+
+hammer = ARGV.shift
+
+# Load hammer, its modules and API documentation, hammer exits when done
+saved_stdout = $stdout.dup
+saved_stderr = $stderr.dup
+begin
+  $stdout.reopen('/dev/null', 'w')
+  $stderr.reopen('/dev/null', 'w')
+  ARGV.replace(['--version'])
+  load hammer
+rescue SystemExit
+ensure
+  $stdout.reopen(saved_stdout)
+  $stderr.reopen(saved_stderr)
+end
+
+def run_hammer(hammer, command, env)
+  out = Tempfile.new('hammer-out')
+  err = Tempfile.new('hammer-err')
+  # let the shell split the command line, as for one-shot commands
+  args = IO.popen(['sh', '-c', "printf '%s\\0' #{command}"], &:read)
+  pid = fork do
+    $VERBOSE = nil
+    $stdin.reopen('/dev/null')
+    $stdout.reopen(out)
+    $stderr.reopen(err)
+    ENV.update(env)
+    ARGV.replace(args.split("\0"))
+    status = 0
+    begin
+      load hammer
+    rescue SystemExit => error
+      status = error.status
+    end
+    $stdout.flush
+    $stderr.flush
+    # do not run the at_exit handlers inherited from the resident process
+    exit!(status)
+  end
+  Process.wait(pid)
+  out.rewind
+  err.rewind
+  [$?.exitstatus || 1, out.read, err.read]
+ensure
+  out.close!
+  err.close!
+end
+
+$stdout.sync = true
+puts 'robottelo-hammer-shell-ready'
+while (line = $stdin.gets)
+  request = JSON.parse(line)
+  status, out, err = run_hammer(hammer, request['command'], request['env'])
+  puts [
+    status, Base64.strict_encode64(out), Base64.strict_encode64(err)
+  ].join(' ')
+end
+'''
+
+
+class HammerShellError(Exception):
+    """Raised when the resident hammer process can not be used."""
+
+
+class HammerShell(object):
+    """A resident hammer process on ``hostname``.
+
+    :param str hostname: The hostname of the server running hammer. If it is
+        ``None`` ``hostname`` from configuration's ``server`` section will be
+        used.
+    :param int timeout: Time to wait for hammer to be loaded. If it is
+        ``None`` ``command_timeout`` from configuration's ``ssh_client``
+        section will be used.
+    :raises HammerShellError: if the resident process does not start.
+    """
+
+    def __init__(self, hostname=None, timeout=None):
+        if timeout is None:
+            timeout = settings.ssh_client.command_timeout
+        self.hostname = hostname or settings.server.hostname
+        self._lock = threading.Lock()
+        self._client = None
+        try:
+            self._client = ssh.get_client(hostname=self.hostname)
+            self._channel = self._client.get_transport().open_session()
+            self._channel.settimeout(timeout)
+            self._channel.exec_command(
+                'hammer=$(command -v hammer) && '
+                'exec $(head -n 1 "$hammer" | cut -c 3-) -e {0} "$hammer"'
+                .format(shlex_quote(HAMMER_SERVER))
+            )
+            self._stdin = self._channel.makefile('wb')
+            self._stdout = self._channel.makefile('rb')
+            line = self._stdout.readline()
+            if line.strip() != READY_MARKER.encode('ascii'):
+                raise HammerShellError(
+                    'hammer shell failed to start on {0}: {1}'.format(
+                        self.hostname,
+                        ssh.decode_to_utf8(
+                            line + self._channel.makefile_stderr('rb').read())
+                    )
+                )
+        except (socket.error, paramiko.SSHException) as err:
+            self.close()
+            raise HammerShellError(
+                'hammer shell failed to start on {0}: {1}'.format(
+                    self.hostname, err))
+        except Exception:
+            self.close()
+            raise
+        logger.info('hammer shell started on %s', self.hostname)
+
+    @property
+    def closed(self):
+        return self._client is None
+
+    def run(self, command, env=None, output_format=None, timeout=None):
+        """Run a hammer command line in the resident process.
+
+        :param str command: The hammer arguments, as they would follow
+            ``hammer`` on a shell command line.
+        :param dict env: Environment variables to set for the command.
+        :param str output_format: json, csv or None
+        :param int timeout: Time to wait for the command to finish. If it is
+            ``None`` ``command_timeout`` from configuration's ``ssh_client``
+            section will be used.
+        :return: SSHCommandResult
+        :raises SSHCommandTimeoutError: if the command did not finish in
+            time, the resident process is then closed.
+        :raises HammerShellError: if the resident process died.
+        """
+        if timeout is None:
+            timeout = settings.ssh_client.command_timeout
+        if isinstance(command, bytes):
+            command = command.decode('utf-8')
+        request = json.dumps({'command': command, 'env': env or {}})
+        logger.info('>>> [hammer shell] hammer %s', command)
+        with self._lock:
+            if self.closed:
+                raise HammerShellError('hammer shell is closed')
+            try:
+                self._channel.settimeout(timeout)
+                self._stdin.write(request.encode('utf-8') + b'\n')
+                self._stdin.flush()
+                response = self._stdout.readline()
+            except socket.timeout:
+                self.close()
+                raise ssh.SSHCommandTimeoutError(
+                    'hammer command: {0} \n did not respond in the predefined '
+                    'time (timeout={1})'.format(command, timeout)
+                )
+            except socket.error as err:
+                self.close()
+                raise HammerShellError(
+                    'hammer shell failed running: {0}\n{1}'.format(
+                        command, err))
+            if not response:
+                self.close()
+                raise HammerShellError(
+                    'hammer shell exited while running: {0}'.format(command))
+        return_code, stdout, stderr = response.split(b' ')
+        stdout = ssh.decode_to_utf8(base64.b64decode(stdout))
+        stderr = ssh.decode_to_utf8(base64.b64decode(stderr))
+        if stdout:
+            logger.info('<<< stdout\n%s', stdout)
+        if stderr:
+            logger.info('<<< stderr\n%s', stderr)
+        return ssh.make_result(stdout, stderr, int(return_code), output_format)
+
+    def close(self):
+        """Stop the resident process and close its connection."""
+        client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+
+#: Seconds during which the commands do not try to start again a resident
+#: process which failed to start, they run a new hammer process instead.
+START_RETRY_DELAY = 60
+
+_shells_lock = threading.Lock()
+_shells = {}
+_shells_pid = os.getpid()
+
+
+def get_hammer_shell(hostname=None):
+    """Return the resident hammer process of ``hostname``, starting it if
+    needed. The processes are not shared with forked processes.
+
+    :raises HammerShellError: if the resident process can not be started,
+        or failed to start less than :data:`START_RETRY_DELAY` seconds ago.
+    """
+    global _shells_pid  # pylint:disable=global-statement
+    hostname = hostname or settings.server.hostname
+    with _shells_lock:
+        if _shells_pid != os.getpid():
+            # the connections belong to the parent process, do not close them
+            _shells.clear()
+            _shells_pid = os.getpid()
+        shell = _shells.get(hostname)
+        if isinstance(shell, tuple):
+            err, failed_at = shell
+            if time.time() - failed_at < START_RETRY_DELAY:
+                raise err
+            shell = None
+        if shell is None or shell.closed:
+            try:
+                shell = HammerShell(hostname)
+            except HammerShellError as err:
+                logger.warning('%s', err)
+                _shells[hostname] = (err, time.time())
+                raise
+            _shells[hostname] = shell
+        return shell
+
+
+def close_hammer_shells():
+    """Stop all the resident hammer processes of this process."""
+    with _shells_lock:
+        for shell in _shells.values():
+            if isinstance(shell, HammerShell):
+                shell.close()
+        _shells.clear()
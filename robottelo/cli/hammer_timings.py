@@ -0,0 +1,223 @@
+"""Timings of the hammer commands run with ``time -p``.
+
+When ``time_hammer`` is enabled in configuration's ``performance`` section,
+:meth:`robottelo.cli.base.Base.execute` prefixes the hammer commands with
+``time -p``. The ``real``, ``user`` and ``sys`` lines it prints on stderr are
+removed from the command result by :func:`record_response` and kept as a
+sample, with the time the client waited for the command over SSH, for the
+command's ``(command_base, command_sub)``.
+
+The ``real`` time is the time spent by hammer on the server, the rest of the
+client time is the transport overhead: the SSH round trip and the command
+startup.
+
+The samples are kept in memory. When the :data:`TIMINGS_DIR_ENV` environment
+variable names a directory, each process also appends its samples to its own
+JSON lines file there, so the samples of all the pytest-xdist workers can be
+read back by :func:`load_samples` and summarized by :func:`report` at the end
+of the run.
+"""
+import io
+import json
+import logging
+import os
+import re
+import threading
+
+import six
+
+logger = logging.getLogger(__name__)
+
+#: Environment variable naming the directory where the samples are written,
+#: it is inherited by the pytest-xdist workers.
+TIMINGS_DIR_ENV = 'ROBOTTELO_HAMMER_TIMINGS_DIR'
+
+#: A line printed by ``time -p``, like ``real 1.23``.
+_TIME_LINE = re.compile(r'^(real|user|sys) (\d+(?:\.\d+)?)$')
+
+_samples_lock = threading.Lock()
+_samples = []
+
+
+def split_time_output(stderr):
+    """Split the ``time -p`` lines out of a command ``stderr``.
+
+    :param str stderr: the command stderr, ending with the ``time -p`` lines.
+    :return: a tuple of a dict mapping ``real``, ``user`` and ``sys`` to their
+        seconds, or ``None`` if they were not all found, and the stderr
+        without the ``time -p`` lines.
+    """
+    lines = stderr.split('\n')
+    # drop the trailing empty lines to find the last lines printed
+    end = len(lines)
+    while end > 0 and not lines[end - 1].strip():
+        end -= 1
+    timings = {}
+    start = end
+    while start > 0 and len(timings) < 3:
+        match = _TIME_LINE.match(lines[start - 1].strip())
+        if match is None or match.group(1) in timings:
+            break
+        timings[match.group(1)] = float(match.group(2))
+        start -= 1
+    if len(timings) < 3:
+        return None, stderr
+    return timings, '\n'.join(lines[:start] + lines[end:])
+
+
+def split_command(command):
+    """Return the ``(command_base, command_sub)`` of a hammer ``command``,
+    e.g. ``('content-view', 'version info')`` for ``content-view version info
+    --id 1``.
+    """
+    words = command.split(u' --', 1)[0].split()
+    if not words:
+        return u'', u''
+    return words[0], u' '.join(words[1:])
+
+
+def record(command, client_time, timings):
+    """Keep a sample of the hammer ``command`` timings.
+
+    :param str command: the hammer command, with its options.
+    :param float client_time: the seconds the client waited for the command.
+    :param dict timings: the ``real``, ``user`` and ``sys`` seconds.
+    """
+    command_base, command_sub = split_command(command)
+    sample = {
+        u'command_base': command_base,
+        u'command_sub': command_sub,
+        u'client': client_time,
+        u'real': timings['real'],
+        u'user': timings['user'],
+        u'sys': timings['sys'],
+    }
+    timings_dir = os.environ.get(TIMINGS_DIR_ENV)
+    with _samples_lock:
+        _samples.append(sample)
+        if not timings_dir:
+            return
+        path = os.path.join(timings_dir, '{0}.jsonl'.format(os.getpid()))
+        try:
+            with io.open(path, 'a', encoding='utf-8') as handler:
+                handler.write(six.text_type(json.dumps(sample)) + u'\n')
+        except (IOError, OSError) as err:
+            logger.warning('Can not write the hammer timings: %s', err)
+
+
+def record_response(command, response, client_time):
+    """Remove the ``time -p`` lines from ``response.stderr`` and record them
+    for ``command``, see :func:`record`.
+
+    :return: the ``real``, ``user`` and ``sys`` seconds or ``None`` if the
+        response has no ``time -p`` output.
+    """
+    if not isinstance(response.stderr, six.string_types):
+        return None
+    timings, response.stderr = split_time_output(response.stderr)
+    if timings is not None:
+        record(command, client_time, timings)
+    return timings
+
+
+def clear_samples():
+    """Forget the samples kept in memory."""
+    with _samples_lock:
+        del _samples[:]
+
+
+def load_samples(timings_dir=None):
+    """Return the samples of all the processes written to ``timings_dir``, by
+    default the directory of :data:`TIMINGS_DIR_ENV`, or the samples of this
+    process when there is no such directory.
+    """
+    if timings_dir is None:
+        timings_dir = os.environ.get(TIMINGS_DIR_ENV)
+    if not timings_dir:
+        with _samples_lock:
+            return list(_samples)
+    samples = []
+    for name in sorted(os.listdir(timings_dir)):
+        if not name.endswith('.jsonl'):
+            continue
+        with io.open(
+                os.path.join(timings_dir, name), encoding='utf-8') as handler:
+            for line in handler:
+                # skip a line partially written by a killed worker
+                try:
+                    samples.append(json.loads(line))
+                except ValueError:
+                    continue
+    return samples
+
+
+def percentile(values, percent):
+    """Return the nearest-rank ``percent`` percentile of sorted ``values``."""
+    rank = int(-(-len(values) * percent // 100))
+    return values[max(rank, 1) - 1]
+
+
+def summarize(samples):
+    """Summarize the timing samples by ``(command_base, command_sub)``.
+
+    :return: a list of ``(command_base, command_sub, stats)`` sorted by the
+        total client time, largest first. ``stats`` maps ``count`` to the
+        number of samples and each of ``server``, the hammer ``real`` time,
+        ``transport``, the client time minus the server time, and ``client``
+        to a dict of their ``p50``, ``p95``, ``max`` and ``total`` seconds.
+    """
+    groups = {}
+    for sample in samples:
+        key = (sample['command_base'], sample['command_sub'])
+        group = groups.setdefault(
+            key, {'server': [], 'transport': [], 'client': []})
+        group['server'].append(sample['real'])
+        group['transport'].append(max(sample['client'] - sample['real'], 0))
+        group['client'].append(sample['client'])
+    summary = []
+    for (command_base, command_sub), group in groups.items():
+        stats = {'count': len(group['client'])}
+        for name, values in group.items():
+            values.sort()
+            stats[name] = {
+                'p50': percentile(values, 50),
+                'p95': percentile(values, 95),
+                'max': values[-1],
+                'total': sum(values),
+            }
+        summary.append((command_base, command_sub, stats))
+    summary.sort(key=lambda item: item[2]['client']['total'], reverse=True)
+    return summary
+
+
+def report(samples=None):
+    """Return the lines of a report of the hammer timings ``samples``, by
+    default the ones of :func:`load_samples`.
+    """
+    if samples is None:
+        samples = load_samples()
+    if not samples:
+        return []
+    line = u'{0:<40} {1:>6} {2:>26} {3:>26}'
+    lines = [
+        line.format(
+            u'hammer command', u'count',
+            u'server p50/p95/max', u'transport p50/p95/max'),
+    ]
+    server_total = transport_total = 0
+    for command_base, command_sub, stats in summarize(samples):
+        lines.append(line.format(
+            u' '.join((command_base, command_sub)).strip(),
+            stats['count'],
+            *[
+                u'{p50:.2f}/{p95:.2f}/{max:.2f}s'.format(**stats[name])
+                for name in ('server', 'transport')
+            ]
+        ))
+        server_total += stats['server']['total']
+        transport_total += stats['transport']['total']
+    lines.append(
+        u'{0} hammer commands, {1:.2f}s server time, {2:.2f}s transport '
+        u'time'.format(len(samples), server_total, transport_total)
+    )
+    return lines
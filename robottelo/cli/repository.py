@@ -47,20 +47,19 @@ class Repository(Base):
     @classmethod
     def export(cls, options=None):
         """Export a repository"""
-        cls.command_sub = 'export'
         return cls.execute(
-            cls._construct_command(options),
+            cls._construct_command('export', options),
             output_format='csv',
             ignore_stderr=True,
         )
 
     @classmethod
-    def info(cls, options=None):
+    def info(cls, options=None, fields=None):
         """Show a custom repository"""
         cls.command_requires_org = False
 
         try:
-            result = super(Repository, cls).info(options)
+            result = super(Repository, cls).info(options, fields=fields)
         finally:
             cls.command_requires_org = True
 
@@ -69,9 +68,8 @@ class Repository(Base):
     @classmethod
     def synchronize(cls, options, return_raw_response=None, timeout=3600):
         """Synchronizes a repository."""
-        cls.command_sub = 'synchronize'
         return cls.execute(
-            cls._construct_command(options),
+            cls._construct_command('synchronize', options),
             output_format='csv',
             ignore_stderr=True,
             return_raw_response=return_raw_response,
@@ -81,9 +79,8 @@ class Repository(Base):
     @classmethod
     def remove_content(cls, options):
         """Remove content from a repository"""
-        cls.command_sub = 'remove-content'
         return cls.execute(
-            cls._construct_command(options),
+            cls._construct_command('remove-content', options),
             output_format='csv',
             ignore_stderr=True,
         )
@@ -91,9 +88,8 @@ class Repository(Base):
     @classmethod
     def upload_content(cls, options):
         """Upload content to repository."""
-        cls.command_sub = 'upload-content'
         return cls.execute(
-            cls._construct_command(options),
+            cls._construct_command('upload-content', options),
             output_format='csv',
             ignore_stderr=True,
         )
@@ -29,10 +29,10 @@ class SmartClassParameter(Base):
     command_base = 'sc-param'
 
     @classmethod
-    def info(cls, options=None):
+    def info(cls, options=None, fields=None):
         """Gets information for smart class parameter"""
         return super(SmartClassParameter, cls).info(
-            options=options, output_format='json')
+            options=options, output_format='json', fields=fields)
 
     @classmethod
     def add_override_value(cls, options=None):
@@ -57,9 +57,9 @@ class SmartClassParameter(Base):
                                                                 yes/no, 1/0.
             --value VALUE                                       Override value
         """
-        cls.command_sub = 'add-override-value'
         return cls.execute(
-            cls._construct_command(options), output_format='csv')
+            cls._construct_command('add-override-value', options),
+            output_format='csv')
 
     @classmethod
     def remove_override_value(cls, options=None):
@@ -80,6 +80,6 @@ class SmartClassParameter(Base):
                                                                 parameter name
             --smart-class-parameter-id SMART_CLASS_PARAMETER_ID
         """
-        cls.command_sub = 'remove-override-value'
         return cls.execute(
-            cls._construct_command(options), output_format='csv')
+            cls._construct_command('remove-override-value', options),
+            output_format='csv')
@@ -34,10 +34,9 @@ class Subscription(Base):
     @classmethod
     def upload(cls, options=None):
         """Upload a subscription manifest."""
-        cls.command_sub = 'upload'
         timeout = 1500 if bz_bug_is_open(1339696) else 300
         return cls.execute(
-            cls._construct_command(options),
+            cls._construct_command('upload', options),
             ignore_stderr=True,
             timeout=timeout,
         )
@@ -45,10 +44,9 @@ class Subscription(Base):
     @classmethod
     def delete_manifest(cls, options=None):
         """Deletes a subscription manifest."""
-        cls.command_sub = 'delete-manifest'
         timeout = 1500 if bz_bug_is_open(1339696) else 300
         return cls.execute(
-            cls._construct_command(options),
+            cls._construct_command('delete-manifest', options),
             ignore_stderr=True,
             timeout=timeout,
         )
@@ -56,10 +54,9 @@ class Subscription(Base):
     @classmethod
     def refresh_manifest(cls, options=None):
         """Refreshes a subscription manifest."""
-        cls.command_sub = 'refresh-manifest'
         timeout = 1500 if bz_bug_is_open(1339696) else 300
         return cls.execute(
-            cls._construct_command(options),
+            cls._construct_command('refresh-manifest', options),
             ignore_stderr=True,
             timeout=timeout,
         )
@@ -67,5 +64,4 @@ class Subscription(Base):
     @classmethod
     def manifest_history(cls, options=None):
         """Provided history for subscription manifest"""
-        cls.command_sub = 'manifest-history'
-        return cls.execute(cls._construct_command(options))
+        return cls.execute(cls._construct_command('manifest-history', options))
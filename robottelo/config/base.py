@@ -859,6 +859,17 @@ class SSHClientSettings(FeatureSettings):
         super(SSHClientSettings, self).__init__(*args, **kwargs)
         self._command_timeout = None
         self._connection_timeout = None
+        self._connection_pool = None
+        self._pool_max_size = None
+        self._pool_idle_timeout = None
+        self._max_workers = None
+        self._max_channels = None
+        self.broker_socket = None
+        self._parallel_transfers = None
+        self._transfer_workers = None
+        self._transfer_chunk_size = None
+        self._upload_cache = None
+        self._upload_cache_dir = None
 
     @property
     def command_timeout(self):
@@ -870,18 +881,161 @@ class SSHClientSettings(FeatureSettings):
         return self._connection_timeout if (
             self._connection_timeout is not None) else 10
 
+    @property
+    def connection_pool(self):
+        return self._connection_pool if (
+            self._connection_pool is not None) else True
+
+    @property
+    def pool_max_size(self):
+        return self._pool_max_size if (
+            self._pool_max_size is not None) else 10
+
+    @property
+    def pool_idle_timeout(self):
+        return self._pool_idle_timeout if (
+            self._pool_idle_timeout is not None) else 300
+
+    @property
+    def max_workers(self):
+        return self._max_workers if (
+            self._max_workers is not None) else 10
+
+    @property
+    def max_channels(self):
+        return self._max_channels if (
+            self._max_channels is not None) else 10
+
+    @property
+    def parallel_transfers(self):
+        return self._parallel_transfers if (
+            self._parallel_transfers is not None) else False
+
+    @property
+    def transfer_workers(self):
+        return self._transfer_workers if (
+            self._transfer_workers is not None) else 4
+
+    @property
+    def transfer_chunk_size(self):
+        return self._transfer_chunk_size if (
+            self._transfer_chunk_size is not None) else 8388608
+
+    @property
+    def upload_cache(self):
+        return self._upload_cache if (
+            self._upload_cache is not None) else False
+
+    @property
+    def upload_cache_dir(self):
+        return self._upload_cache_dir if (
+            self._upload_cache_dir is not None
+        ) else '/var/cache/robottelo/uploads'
+
     def read(self, reader):
         """Read SSHClient settings."""
         self._command_timeout = reader.get(
             'ssh_client', 'command_timeout', default=300, cast=int)
         self._connection_timeout = reader.get(
             'ssh_client', 'connection_timeout', default=10, cast=int)
+        self._connection_pool = reader.get(
+            'ssh_client', 'connection_pool', default=True, cast=bool)
+        self._pool_max_size = reader.get(
+            'ssh_client', 'pool_max_size', default=10, cast=int)
+        self._pool_idle_timeout = reader.get(
+            'ssh_client', 'pool_idle_timeout', default=300, cast=int)
+        self._max_workers = reader.get(
+            'ssh_client', 'max_workers', default=10, cast=int)
+        self._max_channels = reader.get(
+            'ssh_client', 'max_channels', default=10, cast=int)
+        self.broker_socket = reader.get('ssh_client', 'broker_socket')
+        self._parallel_transfers = reader.get(
+            'ssh_client', 'parallel_transfers', default=False, cast=bool)
+        self._transfer_workers = reader.get(
+            'ssh_client', 'transfer_workers', default=4, cast=int)
+        self._transfer_chunk_size = reader.get(
+            'ssh_client', 'transfer_chunk_size', default=8388608, cast=int)
+        self._upload_cache = reader.get(
+            'ssh_client', 'upload_cache', default=False, cast=bool)
+        self._upload_cache_dir = reader.get(
+            'ssh_client', 'upload_cache_dir',
+            default='/var/cache/robottelo/uploads')
 
     def validate(self):
         """Validate SSHClient settings."""
         return []
 
 
+class HammerSettings(FeatureSettings):
+    """Hammer CLI execution settings definitions."""
+    def __init__(self, *args, **kwargs):
+        super(HammerSettings, self).__init__(*args, **kwargs)
+        self._shell = None
+        self._lazy_create_info = None
+        self._read_cache = None
+        self._compact_rows = None
+        self._sessions = None
+        self._sessions_dir = None
+        self._validate_options = None
+        self._command_tree_dir = None
+
+    @property
+    def shell(self):
+        return self._shell if self._shell is not None else False
+
+    @property
+    def lazy_create_info(self):
+        return self._lazy_create_info if (
+            self._lazy_create_info is not None) else False
+
+    @property
+    def read_cache(self):
+        return self._read_cache if self._read_cache is not None else False
+
+    @property
+    def compact_rows(self):
+        return self._compact_rows if self._compact_rows is not None else False
+
+    @property
+    def sessions(self):
+        return self._sessions if self._sessions is not None else False
+
+    @property
+    def sessions_dir(self):
+        return self._sessions_dir or '/root/.robottelo/hammer_sessions'
+
+    @property
+    def validate_options(self):
+        return self._validate_options if (
+            self._validate_options is not None) else False
+
+    @property
+    def command_tree_dir(self):
+        return self._command_tree_dir
+
+    def read(self, reader):
+        """Read hammer settings."""
+        self._shell = reader.get('hammer', 'shell', default=False, cast=bool)
+        self._lazy_create_info = reader.get(
+            'hammer', 'lazy_create_info', default=False, cast=bool)
+        self._read_cache = reader.get(
+            'hammer', 'read_cache', default=False, cast=bool)
+        self._compact_rows = reader.get(
+            'hammer', 'compact_rows', default=False, cast=bool)
+        self._sessions = reader.get(
+            'hammer', 'sessions', default=False, cast=bool)
+        self._sessions_dir = reader.get(
+            'hammer', 'sessions_dir',
+            default='/root/.robottelo/hammer_sessions')
+        self._validate_options = reader.get(
+            'hammer', 'validate_options', default=False, cast=bool)
+        self._command_tree_dir = reader.get('hammer', 'command_tree_dir')
+
+    def validate(self):
+        """Validate hammer settings."""
+        return []
+
+
 class TransitionSettings(FeatureSettings):
     """Transition settings definitions."""
     def __init__(self, *args, **kwargs):
@@ -961,6 +1115,7 @@ class SharedFunctionSettings(FeatureSettings):
         self.redis_db = None
         self.redis_password = None
         self.call_retries = None
+        self.entity_pool_size = None
 
     def read(self, reader):
         """Read shared settings."""
@@ -982,6 +1137,8 @@ class SharedFunctionSettings(FeatureSettings):
             'shared_function', 'redis_password', None)
         self.call_retries = reader.get(
             'shared_function', 'call_retries', 2, int)
+        self.entity_pool_size = reader.get(
+            'shared_function', 'entity_pool_size', 0, int)
 
     def validate(self):
         """Validate the shared settings"""
@@ -1051,6 +1208,7 @@ class Settings(object):
         self.ec2 = EC2Settings()
         self.fake_capsules = FakeCapsuleSettings()
         self.fake_manifest = FakeManifestSettings()
+        self.hammer = HammerSettings()
         self.ldap = LDAPSettings()
         self.ipa = LDAPIPASettings()
         self.oscap = OscapSettings()
@@ -0,0 +1,262 @@
+# -*- encoding: utf-8 -*-
+"""Pools of entities created ahead of time and leased to the tests of all the
+processes of a test run.
+
+Many tests only need a new entity as the parent of the one they test. A
+:class:`SharedPool` keeps such entities ready in the shared function storage:
+:meth:`SharedPool.lease` hands a free entity to a single caller, creating one
+right away when none is free. Each lease records the pytest-xdist worker and
+the process which took it.
+
+The pool state is stored under the namespace scope of the shared functions,
+read and written under the storage lock, so the pytest-xdist workers share
+the same pools. The master process calls :func:`set_run_scope` before the
+workers start, so that they all use its scope. The process running the tests,
+the pytest-xdist worker or the master, calls
+:meth:`SharedPool.refill_if_needed` between the tests: with ``--boxed`` each
+test runs in a forked process exiting once the test ends, which could not
+finish a refill. Each created entity is added to the pool right away, so the
+entities of a refill cut off are not lost. The master process calls
+:meth:`SharedPool.finish` at the end of the session to destroy the leased
+entities. The free entities are kept for the next run when the shared
+functions ``scope`` is configured, as they were never used, and destroyed
+otherwise.
+
+Usage::
+
+    def make_orgs(count):
+        for _ in range(count):
+            yield make_org()
+
+    def destroy_orgs(orgs):
+        for org in orgs:
+            Org.delete({'id': org['id']})
+
+    org_pool = SharedPool('org', make_orgs, destroy_orgs, size=5)
+    org = org_pool.lease()
+
+Note: the pool stores the entities as json, they must be json compatible.
+"""
+import datetime
+import errno
+import logging
+import os
+import socket
+
+from robottelo.decorators.func_shared.shared import (
+    _DATETIME_FORMAT,
+    _get_default_scope,
+    _get_default_storage_handler,
+    _get_function_name_key,
+)
+
+logger = logging.getLogger(__name__)
+
+#: Environment variable naming the namespace scope of the pools of a run, set
+#: by the master process and inherited by the pytest-xdist workers.
+POOL_SCOPE_ENV = 'ROBOTTELO_SHARED_POOL_SCOPE'
+
+_POOL_SCOPE_CONTEXT = 'pool'
+
+# a refill not done after this time is considered dead, e.g. its
+# process was killed on an other host, and an other process starts a new one
+REFILL_TIMEOUT = 1800
+
+
+def set_run_scope():
+    """Use the shared functions scope, or the master process id, as the scope
+    of the pools of this process and of the processes it starts.
+
+    :return: the run scope
+    """
+    scope = _get_default_scope()
+    if scope == str(os.getppid()):
+        # no scope is configured, the default scope of the workers is the id
+        # of their parent, this process
+        scope = str(os.getpid())
+    os.environ[POOL_SCOPE_ENV] = scope
+    return scope
+
+
+def _get_run_scope():
+    """Return the scope of the pools of the run"""
+    return os.environ.get(POOL_SCOPE_ENV) or _get_default_scope()
+
+
+def _now():
+    return datetime.datetime.utcnow().strftime(_DATETIME_FORMAT)
+
+
+def _refill_running(refill):
+    """Return whether the process of the pool ``refill`` may still be
+    creating its batch.
+    """
+    if refill.get('host') == socket.gethostname():
+        try:
+            os.kill(refill['pid'], 0)
+        except OSError as err:
+            if err.errno == errno.ESRCH:
+                return False
+    started = datetime.datetime.strptime(
+        refill['started_at'], _DATETIME_FORMAT)
+    return (datetime.datetime.utcnow() - started).total_seconds() < (
+        REFILL_TIMEOUT)
+
+
+class SharedPool(object):
+    """A pool of entities shared by all the processes of a test run.
+
+    :param str name: The pool name, unique by kind of entity.
+    :param create_batch: Callable creating ``count`` entities, called as
+        ``create_batch(count)`` and returning an iterable of the json
+        compatible entities. When it yields each entity once created, the
+        entities created before an error are added to the pool, so they are
+        destroyed with the others.
+    :param destroy: Callable destroying a list of entities created by the
+        pool, called as ``destroy(entities)``.
+    :param int size: The number of entities to keep free, a batch of ``size``
+        entities is created when less are free.
+    :param storage_handler: The shared functions storage handler, by default
+        the configured one.
+    """
+
+    def __init__(self, name, create_batch, destroy, size,
+                 storage_handler=None):
+        self.name = name
+        self.create_batch = create_batch
+        self.destroy = destroy
+        self.size = size
+        self._storage_handler = storage_handler
+
+    @property
+    def storage(self):
+        if self._storage_handler is None:
+            self._storage_handler = _get_default_storage_handler()
+        return self._storage_handler
+
+    @property
+    def key(self):
+        return _get_function_name_key(
+            self.name,
+            scope=_get_run_scope,
+            scope_context=_POOL_SCOPE_CONTEXT
+        )
+
+    def _update(self, func):
+        """Call ``func`` with the pool state under the storage lock, store the
+        state it modified and return its result.
+        """
+        with self.storage.lock(self.key) as data:
+            self.storage.when_lock_acquired(data)
+            state = self.storage.get(self.key) or {}
+            state.setdefault('free', [])
+            state.setdefault('leased', [])
+            state.setdefault('refill', None)
+            result = func(state)
+            self.storage.set(self.key, state)
+        return result
+
+    def state(self):
+        """Return the pool state: the ``free`` entities, the ``leased`` ones
+        with their lease and the running ``refill``.
+        """
+        return self._update(lambda state: state)
+
+    def _refill_needed(self, state):
+        """Return whether this process must refill the pool, marking the
+        refill as started when it must. Only the pools leased from during the
+        run are refilled.
+        """
+        if not state['leased'] or len(state['free']) >= self.size:
+            return False
+        refill = state['refill']
+        if refill is not None and _refill_running(refill):
+            return False
+        state['refill'] = {
+            'host': socket.gethostname(),
+            'pid': os.getpid(),
+            'started_at': _now(),
+        }
+        return True
+
+    def refill(self):
+        """Create a batch of ``size`` entities, adding each one to the free
+        ones once created.
+        """
+        created = 0
+        try:
+            for entity in self.create_batch(self.size):
+                self._update(
+                    lambda state, entity=entity: state['free'].append(entity))
+                created += 1
+        except Exception as err:
+            logger.error(
+                'pool {0} failed to create a batch, after {1} entities: '
+                '{2}'.format(self.name, created, err))
+        finally:
+            self._update(lambda state: state.update(refill=None))
+        logger.info('pool {0} created {1} entities'.format(
+            self.name, created))
+
+    def refill_if_needed(self):
+        """Refill the pool when it was leased from and less than ``size``
+        entities are free, unless an other process is refilling it.
+
+        :return: whether the pool was refilled
+        """
+        if not self._update(self._refill_needed):
+            return False
+        self.refill()
+        return True
+
+    def _lease(self, entity):
+        return {
+            'entity': entity,
+            'worker': os.environ.get('PYTEST_XDIST_WORKER', 'master'),
+            'pid': os.getpid(),
+            'leased_at': _now(),
+        }
+
+    def lease(self):
+        """Return a free entity, leased to the caller until the end of the
+        run. The entity is created right away when none is free.
+        """
+        def take(state):
+            if not state['free']:
+                return None
+            entity = state['free'].pop(0)
+            state['leased'].append(self._lease(entity))
+            return entity
+
+        entity = self._update(take)
+        if entity is None:
+            logger.debug('pool {0} is empty, creating an entity'.format(
+                self.name))
+            entity = next(iter(self.create_batch(1)))
+            self._update(
+                lambda state: state['leased'].append(self._lease(entity)))
+        return entity
+
+    def finish(self, recycle=False):
+        """Destroy the leased entities, and the free ones unless ``recycle``
+        is set, and forget them.
+
+        :return: the number of destroyed entities
+        """
+        def pop(state):
+            entities = [lease['entity'] for lease in state['leased']]
+            state['leased'] = []
+            if not recycle:
+                entities.extend(state['free'])
+                state['free'] = []
+            return entities
+
+        entities = self._update(pop)
+        if entities:
+            try:
+                self.destroy(entities)
+            except Exception as err:
+                logger.error(
+                    'pool {0} failed to destroy its entities: {1}'.format(
+                        self.name, err))
+        return len(entities)
@@ -525,46 +525,42 @@ def create_repo(name, repo_fetch_url=None, packages=None, wipe_repodata=False,
     :rtype: str
     """
     repo_path = '{}/{}'.format(PULP_PUBLISHED_YUM_REPOS_PATH, name)
-    result = ssh.command(
-        'sudo -u apache mkdir -p {}'.format(repo_path), hostname=hostname)
-    if result.return_code != 0:
-        raise CLIReturnCodeError(
-            result.return_code, result.stderr, 'Unable to create repo dir')
+    # (command, error message) pairs, all run in one round trip
+    steps = [
+        ('sudo -u apache mkdir -p {}'.format(repo_path),
+         'Unable to create repo dir'),
+    ]
     if repo_fetch_url:
         # Add trailing slash if it's not there already
         if not repo_fetch_url.endswith('/'):
             repo_fetch_url += '/'
         for package in packages:
-            result = ssh.command(
-                'wget -P {} {}'
-                .format(repo_path, urljoin(repo_fetch_url, package)),
-                hostname=hostname,
-            )
-            if result.return_code != 0:
-                raise CLIReturnCodeError(
-                    result.return_code,
-                    result.stderr,
-                    'Unable to download package {}'.format(package),
-                )
+            steps.append((
+                'wget -P {} {}'.format(
+                    repo_path, urljoin(repo_fetch_url, package)),
+                'Unable to download package {}'.format(package),
+            ))
     if wipe_repodata:
-        result = ssh.command(
+        steps.append((
             'rm -rf {}/{}'.format(repo_path, 'repodata/'),
-            hostname=hostname
-        )
+            'Unable to delete repodata folder',
+        ))
+    # the createrepo error message includes its stderr
+    steps.append(('createrepo {}'.format(repo_path), None))
+    results = ssh.command_batch(
+        [cmd for cmd, _ in steps], hostname=hostname, stop_on_failure=True)
+    for result, (_, error_msg) in zip(results, steps):
         if result.return_code != 0:
             raise CLIReturnCodeError(
                 result.return_code,
                 result.stderr,
-                'Unable to delete repodata folder',
+                error_msg or 'Unable to create repository. stderr contains '
+                'following info:\n{}'.format(result.stderr),
             )
-    result = ssh.command('createrepo {}'.format(repo_path), hostname=hostname)
-    if result.return_code != 0:
+    if len(results) != len(steps):
         raise CLIReturnCodeError(
-            result.return_code,
-            result.stderr,
-            'Unable to create repository. stderr contains following info:\n{}'
-            .format(result.stderr),
-        )
+            -1, u'', 'Unable to create repository, the remote script was '
+            'interrupted')
 
     published_url = 'http://{}{}/pulp/repos/{}/'.format(
         settings.server.hostname,
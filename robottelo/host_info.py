@@ -92,20 +92,20 @@ def get_repo_files(repo_path, extension='rpm', hostname=None):
     """
     if not repo_path.endswith('/'):
         repo_path += '/'
-    result = ssh.command(
-        "find {} -name '*.{}' | awk -F/ '{{print $NF}}'"
-        .format(repo_path, extension),
-        hostname=hostname,
-    )
+    with ssh.command_stream(
+            "find {} -name '*.{}' | awk -F/ '{{print $NF}}'"
+            .format(repo_path, extension),
+            hostname=hostname) as result:
+        # strip empty lines and sort alphabetically (as order may be wrong
+        # because of different paths)
+        repo_files = sorted(repo_file for repo_file in result if repo_file)
     if result.return_code != 0:
         raise CLIReturnCodeError(
             result.return_code,
             result.stderr,
             'No .{} found'.format(extension)
         )
-    # strip empty lines and sort alphabetically (as order may be wrong because
-    # of different paths)
-    return sorted([repo_file for repo_file in result.stdout if repo_file])
+    return repo_files
 
 
 def get_repomd_revision(repo_path, hostname=None):
@@ -0,0 +1,1456 @@
+"""Utility module to handle the shared ssh connection."""
+import base64
+import codecs
+import hashlib
+import json
+import logging
+import os
+import re
+import select
+import socket
+import threading
+import time
+import uuid
+
+import paramiko
+import six
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from six.moves import queue, shlex_quote
+from robottelo.cli import hammer
+from robottelo.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Escape codes for colors displayed in the output
+_COLOR_CODES_REGEX = re.compile(r'\x1b\[\d\d?m')
+
+
+class SSHCommandTimeoutError(Exception):
+    """Raised when the SSH command has not finished executing after a
+    predefined period of time.
+    """
+
+
+class SSHTransferError(Exception):
+    """Raised when a file transfer does not produce the expected file."""
+
+
+class SSHBrokerError(Exception):
+    """Raised when the ssh broker fails to run a command."""
+
+
+class SSHBrokerUnavailable(SSHBrokerError):
+    """Raised when the ssh broker can not be reached."""
+
+
+def decode_to_utf8(text):  # pragma: no cover
+    """Paramiko returns bytes object and we need to ensure it is utf-8 before
+    parsing
+    """
+    try:
+        return text.decode('utf-8')
+    except (AttributeError, UnicodeEncodeError):
+        return text
+
+
+class SSHCommandResult(object):
+    """Structure that returns in all ssh commands results."""
+
+    def __init__(
+            self, stdout=None, stderr=None, return_code=0, output_format=None):
+        self.stdout = stdout
+        self.stderr = stderr
+        self.return_code = return_code
+        self.output_format = output_format
+        # set by command_many
+        self.hostname = None
+        self.elapsed = None
+        self.error = None
+        #  Does not make sense to return suspicious output if ($? <> 0)
+        if output_format and self.return_code == 0:
+            if output_format == 'csv':
+                self.stdout = hammer.parse_csv(
+                    stdout, compact=settings.hammer.compact_rows
+                ) if stdout else {}
+            if output_format == 'json':
+                self.stdout = hammer.parse_json(stdout) if stdout else None
+
+    def __repr__(self):
+        tmpl = u'SSHCommandResult(stdout={stdout!r}, stderr={stderr!r}, ' + \
+               u'return_code={return_code!r}, output_format={output_format!r})'
+        return tmpl.format(**self.__dict__)
+
+
+class SSHClient(paramiko.SSHClient):
+    """Extended SSHClient allowing custom methods"""
+
+    def run(self, cmd, *args, **kwargs):
+        """This method exists to allow the reuse of existing connections when
+        running multiple ssh commands as in the following example of use:
+
+            with robotello.ssh.get_connection() as connection:
+                connection.run('ls /tmp')
+                connection.run('another command')
+
+        `self` is always passed as the connection when used in context manager
+        only when using `ssh.get_connection` function.
+
+        Note: This method is named `run` to avoid conflicts with existing
+        `exec_command` and local function `execute_command`.
+        """
+        return execute_command(cmd, self, *args, **kwargs)
+
+
+def _call_paramiko_sshclient():  # pragma: no cover
+    """Call ``paramiko.SSHClient``.
+
+    This function does not alter the behaviour of ``paramiko.SSHClient``. It
+    exists solely for the sake of easing unit testing: it can be overridden for
+    mocking purposes.
+
+    """
+    return SSHClient()
+
+
+def _get_credentials(hostname=None, username=None, password=None,
+                     key_filename=None):
+    """Fill the missing connection credentials from the ``server`` section of
+    the configuration.
+
+    :return: A tuple ``(hostname, username, password, key_filename)``
+    """
+    if hostname is None:
+        hostname = settings.server.hostname
+    if username is None:
+        username = settings.server.ssh_username
+    if key_filename is None and password is None:
+        key_filename = settings.server.ssh_key
+    if password is None:
+        password = settings.server.ssh_password
+    return hostname, username, password, key_filename
+
+
+def get_client(hostname=None, username=None, password=None,
+               key_filename=None, timeout=None):
+    """Returns a SSH client connected to given hostname"""
+    hostname, username, password, key_filename = _get_credentials(
+        hostname, username, password, key_filename)
+    if timeout is None:
+        timeout = settings.ssh_client.connection_timeout
+    client = _call_paramiko_sshclient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    client.connect(
+        hostname=hostname,
+        username=username,
+        key_filename=key_filename,
+        password=password,
+        timeout=timeout
+    )
+    client._id = hex(id(client))
+    return client
+
+
+@contextmanager
+def get_connection(hostname=None, username=None, password=None,
+                   key_filename=None, timeout=None):
+    """Yield an ssh connection object.
+
+    The connection will be configured with the specified arguments or will
+    fall-back to server configuration in the configuration file.
+
+    Yield this SSH connection. The connection is automatically closed when the
+    caller is done using it using ``contextlib``, so clients should use the
+    ``with`` statement to handle the object::
+
+        with get_connection() as connection:
+            ...
+
+    :param str hostname: The hostname of the server to establish connection. If
+        it is ``None`` ``hostname`` from configuration's ``server`` section
+        will be used.
+    :param str username: The username to use when connecting. If it is ``None``
+        ``ssh_username`` from configuration's ``server`` section will be used.
+    :param str password: The password to use when connecting. If it is ``None``
+        ``ssh_password`` from configuration's ``server`` section will be used.
+        Should be applied only in case ``key_filename`` is not set
+    :param str key_filename: The path of the ssh private key to use when
+        connecting to the server. If it is ``None`` ``key_filename`` from
+        configuration's ``server`` section will be used.
+    :param int timeout: Time to wait for establish the connection.
+
+    :return: An SSH connection.
+    :rtype: ``paramiko.SSHClient``
+
+    """
+    if timeout is None:
+        timeout = settings.ssh_client.connection_timeout
+    client = get_client(
+        hostname, username, password, key_filename, timeout
+    )
+    try:
+        logger.debug('Instantiated Paramiko client {0}'.format(client._id))
+        logger.info('Connected to [%s]', hostname)
+        yield client
+    finally:
+        client.close()
+        logger.debug('Destroyed Paramiko client {0}'.format(client._id))
+
+
+def _close_client(client):
+    """Close a Paramiko client, logging instead of raising on failures."""
+    try:
+        client.close()
+    except Exception as err:  # pragma: no cover
+        logger.debug(
+            'Failed to close Paramiko client %s: %s',
+            getattr(client, '_id', None), err
+        )
+    else:
+        logger.debug(
+            'Destroyed Paramiko client {0}'.format(
+                getattr(client, '_id', None)))
+
+
+class SSHConnectionPool(object):
+    """Per-process pool of idle authenticated SSH clients.
+
+    Clients are keyed by ``(hostname, username, password, key_filename)`` so
+    a client is only handed back to callers using the same credentials. Idle
+    clients are health checked before being reused, evicted once they have
+    been idle for more than ``idle_timeout`` seconds, and at most ``max_size``
+    idle clients are kept, the least recently used being closed first.
+
+    Connections inherited from a parent process (e.g. when running pytest with
+    ``--boxed``) are dropped without being closed as they share the parent's
+    sockets.
+
+    :param int max_size: Maximum number of idle clients kept in the pool. If
+        it is ``None`` ``pool_max_size`` from configuration's ``ssh_client``
+        section will be used.
+    :param int idle_timeout: Seconds a client can stay idle before being
+        closed. If it is ``None`` ``pool_idle_timeout`` from configuration's
+        ``ssh_client`` section will be used.
+    """
+
+    def __init__(self, max_size=None, idle_timeout=None):
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._idle = []  # (key, client, released_at), oldest first
+        self._pid = os.getpid()
+
+    @property
+    def max_size(self):
+        if self._max_size is not None:
+            return self._max_size
+        return settings.ssh_client.pool_max_size
+
+    @property
+    def idle_timeout(self):
+        if self._idle_timeout is not None:
+            return self._idle_timeout
+        return settings.ssh_client.pool_idle_timeout
+
+    def __len__(self):
+        with self._lock:
+            self._check_pid()
+            return len(self._idle)
+
+    def _check_pid(self):
+        """Forget the clients created by another process. Must be called with
+        the lock held.
+        """
+        if self._pid != os.getpid():
+            self._idle = []
+            self._pid = os.getpid()
+
+    def _pop_expired(self):
+        """Remove and return the clients idle for too long. Must be called
+        with the lock held.
+        """
+        deadline = time.time() - self.idle_timeout
+        expired = [item for item in self._idle if item[2] < deadline]
+        if expired:
+            self._idle = [item for item in self._idle if item[2] >= deadline]
+        return expired
+
+    @staticmethod
+    def is_alive(client):
+        """Check whether the client transport is still usable."""
+        get_transport = getattr(client, 'get_transport', None)
+        if get_transport is None:
+            return False
+        transport = get_transport()
+        if transport is None or not transport.is_active():
+            return False
+        try:
+            transport.send_ignore()
+        except (EOFError, socket.error, paramiko.SSHException):
+            return False
+        return True
+
+    def acquire(self, key):
+        """Return a healthy idle client for ``key`` or ``None`` if there is
+        no such client in the pool.
+        """
+        client = None
+        with self._lock:
+            self._check_pid()
+            discarded = self._pop_expired()
+            for index in range(len(self._idle) - 1, -1, -1):
+                if self._idle[index][0] == key:
+                    client = self._idle.pop(index)[1]
+                    break
+        for item in discarded:
+            _close_client(item[1])
+        if client is not None and not self.is_alive(client):
+            logger.debug(
+                'Discarding dead Paramiko client {0}'.format(
+                    getattr(client, '_id', None)))
+            _close_client(client)
+            return self.acquire(key)
+        return client
+
+    def release(self, key, client):
+        """Give back ``client`` to the pool so it can be reused."""
+        with self._lock:
+            self._check_pid()
+            self._idle.append((key, client, time.time()))
+            discarded = self._pop_expired()
+            while len(self._idle) > self.max_size:
+                discarded.append(self._idle.pop(0))
+        for item in discarded:
+            _close_client(item[1])
+
+    def clear(self):
+        """Close all idle clients."""
+        with self._lock:
+            self._check_pid()
+            discarded, self._idle = self._idle, []
+        for item in discarded:
+            _close_client(item[1])
+
+
+_connection_pool = SSHConnectionPool()
+
+
+def get_connection_pool():
+    """Return the process wide :class:`SSHConnectionPool`."""
+    return _connection_pool
+
+
+def close_connections():
+    """Close all the idle connections kept in the connection pool."""
+    _connection_pool.clear()
+
+
+@contextmanager
+def get_pooled_connection(hostname=None, username=None, password=None,
+                          key_filename=None, timeout=None):
+    """Yield an ssh connection borrowed from the connection pool.
+
+    Works as :func:`get_connection` but, instead of being closed, the
+    connection is given back to the pool when the caller is done using it, so
+    the next call with the same credentials skips the SSH handshake. If the
+    caller raises, the connection is closed as its state is unknown.
+
+    When ``connection_pool`` from configuration's ``ssh_client`` section is
+    disabled this is the same as :func:`get_connection`.
+
+    :param str hostname: The hostname of the server to establish connection. If
+        it is ``None`` ``hostname`` from configuration's ``server`` section
+        will be used.
+    :param str username: The username to use when connecting. If it is ``None``
+        ``ssh_username`` from configuration's ``server`` section will be used.
+    :param str password: The password to use when connecting. If it is ``None``
+        ``ssh_password`` from configuration's ``server`` section will be used.
+        Should be applied only in case ``key_filename`` is not set
+    :param str key_filename: The path of the ssh private key to use when
+        connecting to the server. If it is ``None`` ``key_filename`` from
+        configuration's ``server`` section will be used.
+    :param int timeout: Time to wait for establish the connection.
+
+    :return: An SSH connection.
+    :rtype: ``paramiko.SSHClient``
+
+    """
+    if not settings.ssh_client.connection_pool:
+        with get_connection(hostname, username, password, key_filename,
+                            timeout) as client:
+            yield client
+        return
+    key = _get_credentials(hostname, username, password, key_filename)
+    client = _connection_pool.acquire(key)
+    if client is None:
+        if timeout is None:
+            timeout = settings.ssh_client.connection_timeout
+        client = get_client(*key, timeout=timeout)
+        logger.debug('Instantiated Paramiko client {0}'.format(client._id))
+        logger.info('Connected to [%s]', key[0])
+    else:
+        logger.debug('Reusing Paramiko client {0}'.format(client._id))
+    try:
+        yield client
+    except BaseException:
+        _close_client(client)
+        raise
+    _connection_pool.release(key, client)
+
+
+class SSHSession(object):
+    """Run many commands at the same time over one authenticated connection.
+
+    Every command gets its own channel on the connection transport, so
+    independent commands run in parallel without paying for extra SSH
+    handshakes. At most ``max_channels`` channels are open at the same time,
+    the other commands wait for a free one. Commands are submitted in a
+    futures style::
+
+        with get_session() as session:
+            futures = [session.submit(cmd) for cmd in commands]
+            results = [future.result() for future in futures]
+
+    :param connection: SSH Paramiko client connection
+    :param int max_channels: Maximum number of channels open at the same time.
+        If it is ``None`` ``max_channels`` from configuration's ``ssh_client``
+        section will be used. Keep it below the ``MaxSessions`` of the server
+        sshd, which defaults to 10.
+    """
+
+    def __init__(self, connection, max_channels=None):
+        if max_channels is None:
+            max_channels = settings.ssh_client.max_channels
+        self.connection = connection
+        self.max_channels = max_channels
+        self._executor = ThreadPoolExecutor(max_workers=max_channels)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def submit(self, cmd, output_format=None, timeout=None,
+               connection_timeout=None):
+        """Schedule ``cmd`` to be run on its own channel.
+
+        The arguments are the same as :func:`execute_command`.
+
+        :return: a ``concurrent.futures.Future`` which result is the command
+            SSHCommandResult.
+        """
+        return self._executor.submit(
+            execute_command, cmd, self.connection, output_format, timeout,
+            connection_timeout
+        )
+
+    def map(self, cmds, output_format=None, timeout=None,
+            connection_timeout=None):
+        """Run all the ``cmds`` at the same time and wait for them.
+
+        :return: a list of SSHCommandResult, in the same order as ``cmds``.
+        :raises: the first exception raised by a command, once all the
+            commands are done.
+        """
+        futures = [
+            self.submit(cmd, output_format, timeout, connection_timeout)
+            for cmd in cmds
+        ]
+        return [future.result() for future in futures]
+
+    def close(self):
+        """Wait for the running commands and stop accepting new ones. The
+        connection is left open.
+        """
+        self._executor.shutdown(wait=True)
+
+
+@contextmanager
+def get_session(hostname=None, username=None, password=None,
+                key_filename=None, timeout=None, max_channels=None):
+    """Yield a :class:`SSHSession` over a pooled connection.
+
+    The connection arguments are the same as :func:`get_connection`.
+
+    :param int max_channels: Maximum number of channels open at the same time.
+        If it is ``None`` ``max_channels`` from configuration's ``ssh_client``
+        section will be used.
+    """
+    with get_pooled_connection(hostname=hostname, username=username,
+                               password=password, key_filename=key_filename,
+                               timeout=timeout) as connection:
+        with SSHSession(connection, max_channels) as session:
+            yield session
+
+
+def add_authorized_key(key, hostname=None, username=None, password=None,
+                       key_filename=None, timeout=None):
+    """Appends a local public ssh key to remote authorized keys
+
+    refer to: remote_execution_ssh_keys provisioning template
+
+    :param key: either a file path, key string or a file-like obj to append.
+    :param str hostname: The hostname of the server to establish connection. If
+        it is ``None`` ``hostname`` from configuration's ``server`` section
+        will be used.
+    :param str username: The username to use when connecting. If it is ``None``
+        ``ssh_username`` from configuration's ``server`` section will be used.
+    :param str password: The password to use when connecting. If it is ``None``
+        ``ssh_password`` from configuration's ``server`` section will be used.
+        Should be applied only in case ``key_filename`` is not set
+    :param str key_filename: The path of the ssh private key to use when
+        connecting to the server. If it is ``None`` ``key_filename`` from
+        configuration's ``server`` section will be used.
+    :param int timeout: Time to wait for establish the connection.
+    """
+
+    if getattr(key, 'read', None):  # key is a file-like object
+        key_content = key.read()  # pragma: no cover
+    elif is_ssh_pub_key(key):  # key is a valid key-string
+        key_content = key
+    elif os.path.exists(key):  # key is a path to a pub key-file
+        with open(key, 'r') as key_file:  # pragma: no cover
+            key_content = key_file.read()
+    else:
+        raise AttributeError('Invalid key')
+
+    if timeout is None:
+        timeout = settings.ssh_client.connection_timeout
+
+    key_content = key_content.strip()
+    ssh_path = '~/.ssh'
+    auth_file = os.path.join(ssh_path, 'authorized_keys')
+
+    with get_pooled_connection(hostname=hostname, username=username,
+                               password=password, key_filename=key_filename,
+                               timeout=timeout) as con:
+
+        ssh_user = username or settings.server.ssh_username
+        execute_batch([
+            # ensure ssh directory exists
+            'mkdir -p %s' % ssh_path,
+            # append the key if doesn't exists
+            "grep -q '{key}' {dest} || echo '{key}' >> {dest}".format(
+                key=key_content, dest=auth_file),
+            # set proper permissions
+            'chmod 700 %s' % ssh_path,
+            'chmod 600 %s' % auth_file,
+            'chown -R %s %s' % (ssh_user, ssh_path),
+            # Restore SELinux context with restorecon, if it's available:
+            'command -v restorecon && restorecon -RvF %s || true' % ssh_path,
+        ], con)
+
+
+#: SFTP channel window size, paramiko defaults to 2MiB which limits the
+#: throughput of connections with some latency.
+SFTP_WINDOW_SIZE = 2 ** 25
+
+
+def _open_sftp(connection):
+    """Open an SFTP session on ``connection`` with a large window."""
+    return paramiko.SFTPClient.from_transport(
+        connection.get_transport(), window_size=SFTP_WINDOW_SIZE)
+
+
+def _chunk_ranges(size, chunk_size):
+    """Split ``size`` bytes in ``(offset, length)`` chunks."""
+    return [
+        (offset, min(chunk_size, size - offset))
+        for offset in range(0, size, chunk_size)
+    ]
+
+
+def _local_digests(path, chunk_size):
+    """Return the sha256 hex digest of each chunk of the local ``path``, an
+    empty list if the file does not exist.
+    """
+    if not os.path.isfile(path):
+        return []
+    digests = []
+    with open(path, 'rb') as handler:
+        for data in iter(lambda: handler.read(chunk_size), b''):
+            digests.append(hashlib.sha256(data).hexdigest())
+    return digests
+
+
+def _remote_digests(connection, path, chunk_size=None, max_size=None):
+    """Return the sha256 hex digest of each chunk of the remote ``path``, an
+    empty list if the file does not exist. The digest of the whole file is
+    returned if ``chunk_size`` is ``None``. Only the first ``max_size`` bytes
+    are considered when it is set.
+    """
+    path = shlex_quote(path)
+    if chunk_size is None:
+        cmd = 'if [ -f {0} ]; then sha256sum {0}; fi'.format(path)
+    else:
+        cmd = (
+            'if [ -f {0} ]; then size=$(stat -c %s {0}); {2}i=0; '
+            'while [ $((i * {1})) -lt $size ]; do '
+            'dd if={0} bs={1} skip=$i count=1 2>/dev/null | '
+            'head -c $((size - i * {1})) | sha256sum; '
+            'i=$((i + 1)); done; fi'.format(
+                path,
+                chunk_size,
+                '' if max_size is None else
+                '[ $size -gt {0} ] && size={0}; '.format(max_size)
+            )
+        )
+    result = execute_command(cmd, connection, output_format='plain')
+    if result.return_code != 0:
+        raise SSHTransferError(
+            'Failed to compute the checksum of {0}: {1}'.format(
+                path, result.stderr))
+    return [line.split()[0] for line in (result.stdout or u'').splitlines()]
+
+
+def _local_digest(path):
+    """Return the sha256 hex digest of the local ``path``."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handler:
+        for data in iter(lambda: handler.read(2 ** 20), b''):
+            digest.update(data)
+    return digest.hexdigest()
+
+
+def _verify_transfer(connection, local_file, remote_file):
+    """Raise SSHTransferError if the local and remote files differ."""
+    remote_digest = _remote_digests(connection, remote_file)
+    if remote_digest != [_local_digest(local_file)]:
+        raise SSHTransferError(
+            'Checksum mismatch between local {0} and remote {1}'.format(
+                local_file, remote_file))
+
+
+def _pending_chunks(chunks, digests, other_digests):
+    """Return the chunks which digest differ or is missing in
+    ``other_digests``.
+    """
+    return [
+        chunk for index, chunk in enumerate(chunks)
+        if index >= len(other_digests) or
+        digests[index] != other_digests[index]
+    ]
+
+
+def _copy_chunks(connection, chunks, copy_chunk, workers):
+    """Call ``copy_chunk(sftp, offset, length)`` for each chunk.
+
+    Each worker opens its own SFTP session on ``connection``, sessions are
+    channels of the same transport so no extra handshake is needed.
+    """
+    pending = queue.Queue()
+    for chunk in chunks:
+        pending.put(chunk)
+
+    def worker():
+        sftp = _open_sftp(connection)
+        try:
+            while True:
+                try:
+                    offset, length = pending.get_nowait()
+                except queue.Empty:
+                    return
+                copy_chunk(sftp, offset, length)
+        finally:
+            sftp.close()
+
+    workers = min(workers, len(chunks))
+    if not workers:
+        return
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(worker) for _ in range(workers)]
+    for future in futures:
+        future.result()
+
+
+def _upload_chunks(connection, local_file, remote_file, workers, resume):
+    """Upload ``local_file`` by chunks, see :func:`upload_file`."""
+    chunk_size = settings.ssh_client.transfer_chunk_size
+    size = os.path.getsize(local_file)
+    chunks = _chunk_ranges(size, chunk_size)
+    remote_digests = []
+    if resume:
+        remote_digests = _remote_digests(
+            connection, remote_file, chunk_size, size)
+        chunks = _pending_chunks(
+            chunks, _local_digests(local_file, chunk_size), remote_digests)
+    sftp = _open_sftp(connection)
+    try:
+        with sftp.open(remote_file, 'r+' if remote_digests else 'w') as fd:
+            fd.truncate(size)
+    finally:
+        sftp.close()
+
+    def copy_chunk(sftp, offset, length):
+        with open(local_file, 'rb') as local:
+            with sftp.open(remote_file, 'r+') as remote:
+                remote.set_pipelined(True)
+                local.seek(offset)
+                remote.seek(offset)
+                remote.write(local.read(length))
+
+    _copy_chunks(connection, chunks, copy_chunk, workers)
+
+
+def _download_chunks(connection, remote_file, local_file, workers, resume):
+    """Download ``remote_file`` by chunks, see :func:`download_file`."""
+    chunk_size = settings.ssh_client.transfer_chunk_size
+    sftp = _open_sftp(connection)
+    try:
+        size = sftp.stat(remote_file).st_size
+    finally:
+        sftp.close()
+    chunks = _chunk_ranges(size, chunk_size)
+    local_digests = []
+    if resume:
+        local_digests = _local_digests(local_file, chunk_size)
+        chunks = _pending_chunks(
+            chunks,
+            _remote_digests(connection, remote_file, chunk_size),
+            local_digests
+        )
+    with open(local_file, 'r+b' if local_digests else 'wb') as local:
+        local.truncate(size)
+
+    def copy_chunk(sftp, offset, length):
+        with sftp.open(remote_file, 'r') as remote:
+            with open(local_file, 'r+b') as local:
+                local.seek(offset)
+                for data in remote.readv([(offset, length)]):
+                    local.write(data)
+
+    _copy_chunks(connection, chunks, copy_chunk, workers)
+
+
+_upload_cache_lock = threading.Lock()
+_upload_cache_stats = {'hits': 0, 'copies': 0, 'misses': 0}
+_local_digests_cache = {}
+
+
+def upload_cache_stats():
+    """Return the number of uploads of this process skipped because the
+    remote file already had the content (``hits``), replaced by a remote copy
+    (``copies``) or done because the content was not on the remote host
+    (``misses``).
+    """
+    with _upload_cache_lock:
+        return dict(_upload_cache_stats)
+
+
+def _count_upload(status):
+    with _upload_cache_lock:
+        _upload_cache_stats[status] += 1
+
+
+def _cached_local_digest(path):
+    """Return the sha256 hex digest of the local ``path``, only hashing it
+    again when its size or modification time changed.
+    """
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime)
+    digest = _local_digests_cache.get(key)
+    if digest is None:
+        digest = _local_digests_cache[key] = _local_digest(path)
+    return digest
+
+
+def _upload_cache_lookup(connection, digest, remote_file):
+    """Look for ``digest`` in the upload cache index of the remote host.
+
+    The index is a directory with a file per digest holding the path of the
+    last remote file uploaded with that content and its size and modification
+    time, used to know whether it was changed since. When the content is
+    found ``remote_file`` is made a copy of that file, unless it is the same
+    file.
+
+    :return: ``hits``, ``copies`` or ``misses``
+    """
+    cmd = (
+        'entry={0}; target={1}; '
+        'if [ -f "$entry" ]; then '
+        'path=$(sed -n 1p "$entry"); meta=$(sed -n 2p "$entry"); '
+        'if [ -f "$path" ] && '
+        '[ "$(stat -c \'%s %Y\' "$path")" = "$meta" ]; then '
+        'if [ "$path" = "$target" ]; then echo hits; exit 0; fi; '
+        'cp "$path" "$target" && echo copies && exit 0; '
+        'fi; fi; echo misses'.format(
+            shlex_quote(
+                '{0}/{1}'.format(settings.ssh_client.upload_cache_dir, digest)
+            ),
+            shlex_quote(remote_file),
+        )
+    )
+    result = execute_command(cmd, connection, output_format='plain')
+    status = (result.stdout or u'').strip()
+    if result.return_code != 0 or status not in _upload_cache_stats:
+        logger.warning(
+            'upload cache lookup failed for %s: %s', remote_file,
+            result.stderr)
+        status = 'misses'
+    return status
+
+
+def _upload_cache_record(connection, digest, remote_file):
+    """Record ``remote_file`` as holding the content with ``digest`` in the
+    remote upload cache index.
+    """
+    cache_dir = shlex_quote(settings.ssh_client.upload_cache_dir)
+    result = execute_command(
+        'mkdir -p {0} && target={1} && '
+        'printf \'%s\\n%s\\n\' "$target" "$(stat -c \'%s %Y\' "$target")" '
+        '> {0}/{2}'.format(cache_dir, shlex_quote(remote_file), digest),
+        connection,
+        output_format='plain'
+    )
+    if result.return_code != 0:
+        logger.warning(
+            'upload cache index update failed for %s: %s', remote_file,
+            result.stderr)
+
+
+def upload_file(local_file, remote_file, hostname=None, parallel=None,
+                resume=False, verify=False):
+    """Upload a local file to a remote machine
+
+    :param local_file: either a file path or a file-like object to be uploaded.
+    :param remote_file: a remote file path where the uploaded file will be
+        placed.
+    :param hostname: target machine hostname. If not provided will be used the
+        ``server.hostname`` from the configuration.
+    :param bool parallel: upload chunks of the file over several SFTP sessions
+        at the same time. If it is ``None`` ``parallel_transfers`` from
+        configuration's ``ssh_client`` section will be used.
+    :param bool resume: only upload the chunks which differ from the existing
+        remote file, e.g. to complete an interrupted upload.
+    :param bool verify: compare the sha256 checksums of the local and remote
+        files after the upload.
+    :raises SSHTransferError: if ``verify`` is set and the checksums differ.
+
+    When ``upload_cache`` is enabled in configuration's ``ssh_client`` section,
+    file paths are not uploaded again when their content is already on the
+    remote host, see :func:`upload_cache_stats`.
+
+    ``parallel``, ``resume``, ``verify`` and the upload cache are ignored for
+    file-like objects.
+    """
+    if parallel is None:
+        parallel = settings.ssh_client.parallel_transfers
+    if hasattr(local_file, 'read'):
+        with get_pooled_connection(
+                hostname=hostname) as connection:  # pragma: no cover
+            try:
+                sftp = connection.open_sftp()
+                sftp.putfo(local_file, remote_file)
+            finally:
+                sftp.close()
+        return
+    with get_pooled_connection(hostname=hostname) as connection:
+        digest = None
+        if settings.ssh_client.upload_cache:
+            digest = _cached_local_digest(local_file)
+            status = _upload_cache_lookup(connection, digest, remote_file)
+            _count_upload(status)
+            logger.debug('upload cache %s for %s', status, local_file)
+            if status != 'misses':
+                return
+        if parallel or resume or verify:
+            _upload_chunks(
+                connection, local_file, remote_file,
+                settings.ssh_client.transfer_workers if parallel else 1,
+                resume
+            )
+            if verify:
+                _verify_transfer(connection, local_file, remote_file)
+        else:  # pragma: no cover
+            try:
+                sftp = connection.open_sftp()
+                sftp.put(local_file, remote_file)
+            finally:
+                sftp.close()
+        if digest is not None:
+            _upload_cache_record(connection, digest, remote_file)
+
+
+def download_file(remote_file, local_file=None, hostname=None, parallel=None,
+                  resume=False, verify=False):
+    """Download a remote file to the local machine. If ``hostname`` is not
+    provided will be used the server.
+
+    ``parallel``, ``resume`` and ``verify`` work as in :func:`upload_file`,
+    ``resume`` only downloads the chunks which differ from the existing local
+    file.
+
+    """
+    if local_file is None:  # pragma: no cover
+        local_file = remote_file
+    if parallel is None:
+        parallel = settings.ssh_client.parallel_transfers
+    if parallel or resume or verify:
+        with get_pooled_connection(hostname=hostname) as connection:
+            _download_chunks(
+                connection, remote_file, local_file,
+                settings.ssh_client.transfer_workers if parallel else 1,
+                resume
+            )
+            if verify:
+                _verify_transfer(connection, local_file, remote_file)
+        return
+    with get_pooled_connection(
+            hostname=hostname) as connection:  # pragma: no cover
+        try:
+            sftp = connection.open_sftp()
+            sftp.get(remote_file, local_file)
+        finally:
+            sftp.close()
+
+
+def command(cmd, hostname=None, output_format=None, username=None,
+            password=None, key_filename=None, timeout=None,
+            connection_timeout=None):
+    """Executes SSH command(s) on remote hostname.
+
+    :param str cmd: The command to run
+    :param str output_format: json, csv or None
+    :param str hostname: The hostname of the server to establish connection. If
+        it is ``None`` ``hostname`` from configuration's ``server`` section
+        will be used.
+    :param str username: The username to use when connecting. If it is ``None``
+        ``ssh_username`` from configuration's ``server`` section will be used.
+    :param str password: The password to use when connecting. If it is ``None``
+        ``ssh_password`` from configuration's ``server`` section will be used.
+        Should be applied only in case ``key_filename`` is not set
+    :param str key_filename: The path of the ssh private key to use when
+        connecting to the server. If it is ``None`` ``key_filename`` from
+        configuration's ``server`` section will be used.
+    :param int timeout: Time to wait for the ssh command to finish.
+    :param connection_timeout: Time to wait for establishing the connection.
+    """
+    hostname = hostname or settings.server.hostname
+    if timeout is None:
+        timeout = settings.ssh_client.command_timeout
+    if connection_timeout is None:
+        connection_timeout = settings.ssh_client.connection_timeout
+    if settings.ssh_client.broker_socket:
+        hostname, username, password, key_filename = _get_credentials(
+            hostname, username, password, key_filename)
+        try:
+            return broker_command(
+                settings.ssh_client.broker_socket,
+                {
+                    # the request is json, the hammer commands are encoded
+                    'cmd': decode_to_utf8(cmd),
+                    'hostname': hostname,
+                    'username': username,
+                    'password': password,
+                    'key_filename': key_filename,
+                    'timeout': timeout,
+                    'connection_timeout': connection_timeout,
+                },
+                output_format
+            )
+        except SSHBrokerUnavailable as err:
+            logger.debug('ssh broker not used: %s', err)
+    with get_pooled_connection(hostname=hostname, username=username,
+                               password=password, key_filename=key_filename,
+                               timeout=connection_timeout) as connection:
+        return execute_command(
+            cmd, connection, output_format, timeout, connection_timeout)
+
+
+def broker_command(socket_path, request, output_format=None):
+    """Run a command through the ssh broker listening on ``socket_path``.
+
+    See :mod:`robottelo.ssh_broker` for the broker and its protocol.
+
+    :param str socket_path: The path of the broker Unix domain socket.
+    :param dict request: The command and the :func:`command` connection
+        arguments, as sent to the broker.
+    :param str output_format: json, csv or None
+    :return: SSHCommandResult
+    :raises SSHBrokerUnavailable: if the broker can not be reached, the
+        command was not run.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            sock.settimeout(request['connection_timeout'])
+            sock.connect(socket_path)
+        except socket.error as err:
+            raise SSHBrokerUnavailable(
+                'can not connect to {0}: {1}'.format(socket_path, err))
+        # the broker enforces the command timeout, only wait for its response
+        sock.settimeout(None)
+        sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        response = sock.makefile('rb').readline()
+    finally:
+        sock.close()
+    if not response:
+        raise SSHBrokerError(
+            'ssh broker closed the connection while running: {0}'.format(
+                request['cmd']))
+    response = json.loads(response.decode('utf-8'))
+    if 'error' in response:
+        if response['error'] == 'timeout':
+            raise SSHCommandTimeoutError(response['message'])
+        raise SSHBrokerError(response['message'])
+    return make_result(
+        response['stdout'], response['stderr'], response['return_code'],
+        output_format
+    )
+
+
+#: Seconds a batched command is given to exit once its timeout sent it TERM,
+#: before it is killed.
+_BATCH_KILL_DELAY = 10
+
+#: Exit code of the ``timeout`` command when the command timed out.
+_TIMEOUT_EXIT_CODE = 124
+
+
+def _batch_script(cmds, marker, stop_on_failure=False, timeout=None):
+    """Return a shell script running ``cmds`` and framing the output of each
+    command between ``marker`` lines on stdout and stderr.
+
+    Each command runs in its own shell, so a command changing directory or
+    calling ``exit`` does not affect the others. When ``timeout`` is set,
+    each command is stopped after ``timeout`` seconds, with the exit code
+    124 and a message naming it on its stderr.
+    """
+    lines = []
+    for index, cmd in enumerate(cmds):
+        lines.append(
+            "printf '\\n{0}:start:{1}\\n'; printf '\\n{0}:start:{1}\\n' >&2"
+            .format(marker, index)
+        )
+        if timeout:
+            lines.append(
+                u'timeout -k {0} {1} bash -c {2} < /dev/null; rc=$?'.format(
+                    _BATCH_KILL_DELAY, timeout, shlex_quote(cmd)))
+            lines.append(
+                u'[ $rc -eq {0} ] && printf %s {1} >&2'.format(
+                    _TIMEOUT_EXIT_CODE,
+                    shlex_quote(u'\ncommand timed out after {0}s: {1}'.format(
+                        timeout, cmd))
+                )
+            )
+        else:
+            lines.append('(\n{0}\n) < /dev/null; rc=$?'.format(cmd))
+        lines.append(
+            "printf '\\n{0}:end:{1}:%d\\n' $rc; "
+            "printf '\\n{0}:end:{1}\\n' >&2".format(marker, index)
+        )
+        if stop_on_failure:
+            lines.append('[ $rc -eq 0 ] || exit $rc')
+    return '\n'.join(lines)
+
+
+def _split_batch(result, marker, output_format=None):
+    """Split the SSHCommandResult of a :func:`_batch_script` in one
+    SSHCommandResult per command which has finished.
+    """
+    stdout = result.stdout or u''
+    stderr = result.stderr or u''
+    results = []
+    for match in re.finditer(
+            r'\n{0}:start:(\d+)\n(.*?)\n{0}:end:\1:(\d+)\n'.format(marker),
+            stdout, re.DOTALL):
+        index, cmd_stdout, return_code = match.groups()
+        cmd_stderr = re.search(
+            r'\n{0}:start:{1}\n(.*?)\n{0}:end:{1}\n'.format(marker, index),
+            stderr, re.DOTALL
+        )
+        results.append(make_result(
+            cmd_stdout,
+            cmd_stderr.group(1) if cmd_stderr else u'',
+            int(return_code),
+            output_format
+        ))
+    return results
+
+
+def _batch_timeouts(cmds, timeout=None):
+    """Return the time to wait for each of ``cmds``, ``timeout`` or the
+    ``ssh_client`` section ``command_timeout`` if it is ``None``, and for the
+    whole batch script.
+    """
+    if timeout is None:
+        timeout = settings.ssh_client.command_timeout
+    return timeout, (timeout + _BATCH_KILL_DELAY) * max(len(cmds), 1)
+
+
+def execute_batch(cmds, connection, output_format=None, timeout=None,
+                  connection_timeout=None, stop_on_failure=False):
+    """Execute several commands in one round trip on the given connection.
+
+    The commands are sent as one remote script, each command is stopped
+    after ``timeout``. See :func:`command_batch` for the arguments.
+
+    :return: a list of SSHCommandResult, one per command run.
+    """
+    marker = 'robottelo-batch-{0}'.format(uuid.uuid4().hex)
+    timeout, script_timeout = _batch_timeouts(cmds, timeout)
+    result = execute_command(
+        _batch_script(cmds, marker, stop_on_failure, timeout), connection,
+        'plain', script_timeout, connection_timeout
+    )
+    return _split_batch(result, marker, output_format)
+
+
+def command_batch(cmds, hostname=None, output_format=None, username=None,
+                  password=None, key_filename=None, timeout=None,
+                  connection_timeout=None, stop_on_failure=False):
+    """Executes several SSH commands on remote hostname in one round trip.
+
+    The commands are sent as one remote script, their output is framed with
+    unique delimiters so the stdout, stderr and exit code of each command are
+    kept separate. Each command runs in its own subshell.
+
+    :param list cmds: The commands to run, in order
+    :param bool stop_on_failure: Do not run the remaining commands once one
+        has a non zero exit code.
+    :param int timeout: Time to wait for each command to finish. A command
+        still running after ``timeout`` is stopped: its result has the exit
+        code 124, its stderr names it, and the next commands are run. If it is
+        ``None`` ``command_timeout`` from configuration's ``ssh_client``
+        section will be used.
+
+    The other arguments are the same as :func:`command`.
+
+    :return: a list of SSHCommandResult, one per command run. It is shorter
+        than ``cmds`` when ``stop_on_failure`` stopped the batch, the last
+        result being the failed one.
+    """
+    marker = 'robottelo-batch-{0}'.format(uuid.uuid4().hex)
+    timeout, script_timeout = _batch_timeouts(cmds, timeout)
+    result = command(
+        _batch_script(cmds, marker, stop_on_failure, timeout),
+        hostname=hostname, output_format='plain', username=username,
+        password=password, key_filename=key_filename, timeout=script_timeout,
+        connection_timeout=connection_timeout
+    )
+    return _split_batch(result, marker, output_format)
+
+
+def map_hosts(func, hostnames, max_workers=None):
+    """Call ``func(hostname)`` for each host of ``hostnames`` at the same
+    time, over a bounded pool of threads.
+
+    :param func: a callable receiving a hostname.
+    :param hostnames: the hostnames to call ``func`` with.
+    :param int max_workers: Maximum number of hosts handled at the same time.
+        If it is ``None`` ``max_workers`` from configuration's ``ssh_client``
+        section will be used.
+    :return: the ``func`` results, in the same order as ``hostnames``.
+    :raises: the first exception raised by ``func``, once all the calls are
+        done.
+    """
+    hostnames = list(hostnames)
+    if not hostnames:
+        return []
+    if max_workers is None:
+        max_workers = settings.ssh_client.max_workers
+    with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(hostnames))) as executor:
+        futures = [executor.submit(func, hostname) for hostname in hostnames]
+    return [future.result() for future in futures]
+
+
+def command_many(cmd, hostnames, max_workers=None, **kwargs):
+    """Executes SSH command(s) on several remote hosts at the same time.
+
+    Every result has its ``hostname`` and the ``elapsed`` seconds set. When
+    the command could not be run on a host, e.g. the connection failed, the
+    result ``return_code`` is ``-1``, ``error`` is the exception raised and
+    ``stderr`` its message.
+
+    :param str cmd: The command to run on every host.
+    :param hostnames: The hostnames of the servers to run the command on.
+    :param int max_workers: Maximum number of hosts handled at the same time.
+        If it is ``None`` ``max_workers`` from configuration's ``ssh_client``
+        section will be used.
+    :param kwargs: Other arguments passed to :func:`command`.
+    :return: a list of SSHCommandResult, in the same order as ``hostnames``.
+    """
+    def run(hostname):
+        start = time.time()
+        try:
+            result = command(cmd, hostname=hostname, **kwargs)
+        except Exception as err:
+            logger.error('Failed to run [%s] on %s: %s', cmd, hostname, err)
+            result = SSHCommandResult(
+                stdout=[], stderr=u'{0}'.format(err), return_code=-1)
+            result.error = err
+        result.hostname = hostname
+        result.elapsed = time.time() - start
+        return result
+
+    return map_hosts(run, hostnames, max_workers)
+
+
+def _clean_output_lines(lines):
+    """Clean hammer output lines, yielding them one at a time.
+
+    For output we don't really want to see all of Rails traffic information,
+    so strip it out. Empty fields are returned as "" which gives us u'""', so
+    remove them as well as any color code characters.
+    """
+    for line in lines:
+        line = line.replace('""', '')
+        if not line.startswith('['):
+            yield _COLOR_CODES_REGEX.sub('', line)
+
+
+def _split_lines(chunks):
+    """Decode utf-8 encoded ``chunks`` of bytes and yield the lines as soon
+    as they are complete. The last line is always yielded, even if empty, to
+    match ``str.split('\\n')``.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    pending = u''
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        lines = pending.split(u'\n')
+        pending = lines.pop()
+        for line in lines:
+            yield line
+    yield pending + decoder.decode(b'', final=True)
+
+
+class SSHCommandStream(object):
+    """Iterate over the stdout lines of a command as they are received.
+
+    The lines are decoded and cleaned the same way :func:`execute_command`
+    does for hammer output, but only the line being processed is kept in
+    memory so parsing overlaps with the transfer. Once the iteration is over
+    ``return_code`` and ``stderr`` are set. A stream can be iterated only
+    once; call :meth:`close` to stop reading early.
+
+    :param cmd: the command running on ``channel``.
+    :param channel: the ``paramiko.Channel`` running ``cmd``.
+    :param timeout: Time to wait for the ssh command to finish.
+    """
+
+    chunk_size = 32768
+
+    def __init__(self, cmd, channel, timeout=None):
+        self.cmd = cmd
+        self.channel = channel
+        self.timeout = timeout
+        self.return_code = None
+        self.stderr = None
+        self._stderr = []
+        self._deadline = time.time() + timeout if timeout else None
+
+    def __iter__(self):
+        return _clean_output_lines(_split_lines(self._iter_chunks()))
+
+    def _raise_timeout(self):
+        logger.error('ssh command did not respond in the predefined time'
+                     ' (timeout=%s) and will be interrupted', self.timeout)
+        self.close()
+        raise SSHCommandTimeoutError(
+            'ssh command: {0} \n did not respond in the predefined time '
+            '(timeout={1})'.format(self.cmd, self.timeout)
+        )
+
+    def _remaining(self):
+        """Return the seconds left before timing out or ``None``."""
+        if self._deadline is None:
+            return None
+        remaining = self._deadline - time.time()
+        if remaining <= 0:
+            self._raise_timeout()
+        return remaining
+
+    def _wait_for_output(self):
+        """Wait until stdout or stderr has data, or the command closed its
+        output.
+        """
+        if (self.channel.recv_ready() or self.channel.recv_stderr_ready() or
+                self.channel.eof_received):
+            return
+        readable, _, _ = select.select([self.channel], [], [],
+                                       self._remaining())
+        if not readable:
+            self._raise_timeout()
+
+    def _iter_chunks(self):
+        while True:
+            self._wait_for_output()
+            # drain stderr before reading stdout, a command which filled the
+            # stderr window would never write to stdout
+            while self.channel.recv_stderr_ready():
+                self._stderr.append(
+                    self.channel.recv_stderr(self.chunk_size))
+            if self.channel.recv_ready():
+                yield self.channel.recv(self.chunk_size)
+            elif self.channel.eof_received:
+                break
+        self._finish()
+
+    def _finish(self):
+        """Collect stderr and the exit status once stdout is exhausted."""
+        remaining = self._remaining()
+        if remaining is not None and not _wait_for_exit_status(
+                self.channel, remaining):
+            self._raise_timeout()
+        chunk = self.channel.recv_stderr(self.chunk_size)
+        while chunk:
+            self._stderr.append(chunk)
+            chunk = self.channel.recv_stderr(self.chunk_size)
+        self.return_code = self.channel.recv_exit_status()
+        self.stderr = _COLOR_CODES_REGEX.sub(
+            '', decode_to_utf8(b''.join(self._stderr)))
+        if self.stderr:
+            logger.info('<<< stderr\n%s', self.stderr)
+
+    def close(self):
+        """Close the channel, stopping the remote output transfer."""
+        self.channel.close()
+
+
+def execute_command_stream(cmd, connection, timeout=None,
+                           connection_timeout=None):
+    """Execute a command via ssh in the given connection and return a
+    :class:`SSHCommandStream` yielding its output lines.
+
+    :param cmd: a command to be executed via ssh
+    :param connection: SSH Paramiko client connection
+    :param timeout: Time to wait for the ssh command to finish.
+    :param connection_timeout: Time to wait for establishing the connection.
+    :return: SSHCommandStream
+    """
+    if timeout is None:
+        timeout = settings.ssh_client.command_timeout
+    if connection_timeout is None:
+        connection_timeout = settings.ssh_client.connection_timeout
+    logger.info('>>> %s', cmd)
+    _, stdout, _ = connection.exec_command(cmd, timeout=connection_timeout)
+    return SSHCommandStream(cmd, stdout.channel, timeout)
+
+
+@contextmanager
+def command_stream(cmd, hostname=None, username=None, password=None,
+                   key_filename=None, timeout=None, connection_timeout=None):
+    """Executes SSH command on remote hostname and yield a
+    :class:`SSHCommandStream` over its output lines, for example::
+
+        with command_stream('find /var/lib/pulp') as stream:
+            rpms = [line for line in stream if line.endswith('.rpm')]
+        if stream.return_code != 0:
+            ...
+
+    The arguments are the same as :func:`command`. The stream is closed when
+    leaving the ``with`` block, even if it was not fully consumed.
+    """
+    if connection_timeout is None:
+        connection_timeout = settings.ssh_client.connection_timeout
+    with get_pooled_connection(hostname=hostname, username=username,
+                               password=password, key_filename=key_filename,
+                               timeout=connection_timeout) as connection:
+        stream = execute_command_stream(
+            cmd, connection, timeout, connection_timeout)
+        try:
+            yield stream
+        finally:
+            stream.close()
+
+
+def _wait_for_exit_status(channel, timeout):
+    """Block until the command running on ``channel`` exits or ``timeout``
+    seconds elapse.
+
+    Paramiko sets ``channel.status_event`` as soon as the exit status is
+    received (or the channel is closed), so the caller is woken up right away
+    instead of polling ``exit_status_ready``.
+
+    :param channel: a ``paramiko.Channel`` running a command.
+    :param timeout: Time to wait for the command to finish.
+    :return: ``True`` if the command exited in time, ``False`` otherwise.
+    """
+    channel.status_event.wait(timeout)
+    return channel.exit_status_ready()
+
+
+def execute_command(cmd, connection, output_format=None, timeout=None,
+                    connection_timeout=None):
+    """Execute a command via ssh in the given connection
+
+    :param cmd: a command to be executed via ssh
+    :param connection: SSH Paramiko client connection
+    :param output_format: plain|json|csv|list valid only for hammer commands
+    :param timeout: Time to wait for the ssh command to finish.
+    :param connection_timeout: Time to wait for establishing the connection.
+    :return: SSHCommandResult
+    """
+    if timeout is None:
+        timeout = settings.ssh_client.command_timeout
+    if connection_timeout is None:
+        connection_timeout = settings.ssh_client.connection_timeout
+    logger.info('>>> %s', cmd)
+    _, stdout, stderr = connection.exec_command(
+        cmd, timeout=connection_timeout)
+    if timeout and not _wait_for_exit_status(stdout.channel, timeout):
+        logger.error('ssh command did not respond in the predefined time'
+                     ' (timeout=%s) and will be interrupted', timeout)
+        raise SSHCommandTimeoutError(
+            'ssh command: {0} \n did not respond in the predefined time '
+            '(timeout={1})'.format(cmd, timeout)
+        )
+
+    errorcode = stdout.channel.recv_exit_status()
+
+    stdout = stdout.read()
+    stderr = stderr.read()
+    if stdout:
+        # Convert to unicode string
+        stdout = decode_to_utf8(stdout)
+        logger.info('<<< stdout\n%s', stdout)
+    if stderr:
+        # Convert to unicode string and remove all color codes characters
+        stderr = _COLOR_CODES_REGEX.sub('', decode_to_utf8(stderr))
+        logger.info('<<< stderr\n%s', stderr)
+    return make_result(stdout, stderr, errorcode, output_format)
+
+
+def make_result(stdout, stderr, return_code, output_format=None):
+    """Build the SSHCommandResult of a command from its decoded output."""
+    if stderr:
+        stderr = _COLOR_CODES_REGEX.sub('', stderr)
+    # we don't want a list as output of 'plain' just pure text
+    if stdout and output_format not in ('json', 'plain'):
+        # Mostly only for hammer commands
+        stdout = list(_clean_output_lines(stdout.split('\n')))
+    return SSHCommandResult(
+        stdout, stderr, return_code, output_format)
+
+
+def is_ssh_pub_key(key):
+    """Validates if a string is in valid ssh pub key format
+
+    :param key: A string containing a ssh public key encoded in base64
+    :return: Boolean
+    """
+
+    if not isinstance(key, six.string_types):
+        raise ValueError(
+            "Key should be a string type, received: %s" % type(key))
+
+    # 1) a valid pub key has 3 parts separated by space
+    try:
+        key_type, key_string, comment = key.split()
+    except ValueError:  # need more than one value to unpack
+        return False
+
+    # 2) The second part (key string) should be a valid base64
+    try:
+        base64.decodestring(key_string.encode('ascii'))
+    except base64.binascii.Error:
+        return False
+
+    # 3) The first part, the type, should be one of below
+    return key_type in (
+        'ecdsa-sha2-nistp256', 'ssh-dss', 'ssh-rsa', 'ssh-ed25519'
+    )
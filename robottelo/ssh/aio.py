@@ -0,0 +1,60 @@
+"""asyncio interface of :mod:`robottelo.ssh`, Python 3 only.
+
+The coroutines run the blocking :mod:`robottelo.ssh` functions in the event
+loop default executor, so slow independent operations can overlap::
+
+    import asyncio
+    from robottelo.ssh import aio
+
+    loop = asyncio.get_event_loop()
+    first, second = loop.run_until_complete(asyncio.gather(
+        aio.command('first command'),
+        aio.command('second command'),
+    ))
+
+Every call still goes through the connection pool, no extra handshake is done
+for commands run one after another on the same host.
+"""
+import asyncio
+import functools
+
+from robottelo import ssh
+
+
+async def run_in_executor(func, *args, **kwargs):
+    """Run the blocking ``func(*args, **kwargs)`` in the event loop default
+    executor and return its result.
+    """
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(
+        None, functools.partial(func, *args, **kwargs))
+
+
+async def command(cmd, hostname=None, output_format=None, username=None,
+                  password=None, key_filename=None, timeout=None,
+                  connection_timeout=None):
+    """Coroutine version of :func:`robottelo.ssh.command`."""
+    return await run_in_executor(
+        ssh.command, cmd, hostname=hostname, output_format=output_format,
+        username=username, password=password, key_filename=key_filename,
+        timeout=timeout, connection_timeout=connection_timeout
+    )
+
+
+async def command_many(cmd, hostnames, max_workers=None, **kwargs):
+    """Coroutine version of :func:`robottelo.ssh.command_many`."""
+    return await run_in_executor(
+        ssh.command_many, cmd, hostnames, max_workers=max_workers, **kwargs)
+
+
+async def upload_file(local_file, remote_file, hostname=None):
+    """Coroutine version of :func:`robottelo.ssh.upload_file`."""
+    return await run_in_executor(
+        ssh.upload_file, local_file, remote_file, hostname=hostname)
+
+
+async def download_file(remote_file, local_file=None, hostname=None):
+    """Coroutine version of :func:`robottelo.ssh.download_file`."""
+    return await run_in_executor(
+        ssh.download_file, remote_file, local_file=local_file,
+        hostname=hostname)
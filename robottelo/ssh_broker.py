@@ -0,0 +1,146 @@
+"""Local broker keeping the ssh connections open across test processes.
+
+The tests are run by pytest-xdist with ``--boxed``, every test runs in a fresh
+fork and the connections pooled by :mod:`robottelo.ssh` are lost after each
+test. The broker is a long running process holding that pool, test processes
+send their commands to it over a Unix domain socket, the same way OpenSSH
+``ControlMaster`` shares one connection between ``ssh`` invocations.
+
+Start the broker before running the tests::
+
+    python -m robottelo.ssh_broker --socket /tmp/robottelo-ssh-broker.sock &
+
+and set ``broker_socket`` in the ``[ssh_client]`` section of the configuration
+to the same path. :func:`robottelo.ssh.command` falls back to its own
+connections when the broker is not running.
+
+Each connection to the broker carries one request, a JSON object on a single
+line with the ``cmd`` to run and the ``hostname``, ``username``, ``password``,
+``key_filename``, ``timeout`` and ``connection_timeout`` to run it with. The
+broker answers with a JSON line holding the decoded ``stdout``, ``stderr`` and
+``return_code`` of the command, or an ``error`` and its ``message`` when the
+command could not be run.
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import logging
+import os
+import socket
+
+from six.moves import socketserver
+
+from robottelo import ssh
+from robottelo.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def run_request(request):
+    """Run the command of a broker request and return the response."""
+    try:
+        with ssh.get_pooled_connection(
+                hostname=request['hostname'],
+                username=request['username'],
+                password=request['password'],
+                key_filename=request['key_filename'],
+                timeout=request['connection_timeout']) as connection:
+            result = ssh.execute_command(
+                request['cmd'], connection, 'plain', request['timeout'],
+                request['connection_timeout']
+            )
+    except ssh.SSHCommandTimeoutError as err:
+        return {'error': 'timeout', 'message': str(err)}
+    except Exception as err:
+        logger.exception('ssh broker failed to run: %s', request['cmd'])
+        return {
+            'error': type(err).__name__,
+            'message': 'ssh broker failed to run: {0}\n{1}: {2}'.format(
+                request['cmd'], type(err).__name__, err),
+        }
+    return {
+        # the output is bytes when empty
+        'stdout': result.stdout or u'',
+        'stderr': result.stderr or u'',
+        'return_code': result.return_code,
+    }
+
+
+class SSHBrokerHandler(socketserver.StreamRequestHandler):
+    """Answer one broker request."""
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        response = run_request(json.loads(line.decode('utf-8')))
+        self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+
+
+class SSHBroker(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serve broker requests on the Unix domain socket ``socket_path``.
+
+    Requests are run in their own thread, so the commands of concurrent test
+    processes do not wait for each other. The socket is only accessible by its
+    owner as the requests carry the ssh credentials.
+    """
+    daemon_threads = True
+
+    def __init__(self, socket_path):
+        if os.path.exists(socket_path):
+            _remove_stale_socket(socket_path)
+        old_umask = os.umask(0o177)
+        try:
+            socketserver.UnixStreamServer.__init__(
+                self, socket_path, SSHBrokerHandler)
+        finally:
+            os.umask(old_umask)
+
+    def server_close(self):
+        socketserver.UnixStreamServer.server_close(self)
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+        ssh.close_connections()
+
+
+def _remove_stale_socket(socket_path):
+    """Remove the socket left by a broker which is no longer running.
+
+    :raises RuntimeError: if a broker is still listening on ``socket_path``.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except socket.error:
+        os.remove(socket_path)
+    else:
+        raise RuntimeError(
+            'an ssh broker is already listening on {0}'.format(socket_path))
+    finally:
+        sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument(
+        '--socket',
+        help='path of the Unix domain socket to listen on, defaults to '
+             'broker_socket from the ssh_client configuration section')
+    args = parser.parse_args()
+    settings.configure()
+    socket_path = args.socket or settings.ssh_client.broker_socket
+    if not socket_path:
+        parser.error('no socket path given or configured')
+    server = SSHBroker(socket_path)
+    print('ssh broker listening on {0}'.format(socket_path))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -238,19 +238,13 @@ class VirtualMachine(object):
                 logger.error('Failed to unregister the host: {0}\n{1}'.format(
                     self.hostname, exp.message))
 
-        ssh.command(
-            u'virsh destroy {0}'.format(self.target_image),
-            hostname=self.provisioning_server,
-            connection_timeout=30
-        )
-        ssh.command(
-            u'virsh undefine {0}'.format(self.target_image),
-            hostname=self.provisioning_server,
-            connection_timeout=30
-        )
         image_name = u'{0}.img'.format(self.target_image)
-        ssh.command(
-            u'rm {0}'.format(os.path.join(self.image_dir, image_name)),
+        ssh.command_batch(
+            [
+                u'virsh destroy {0}'.format(self.target_image),
+                u'virsh undefine {0}'.format(self.target_image),
+                u'rm {0}'.format(os.path.join(self.image_dir, image_name)),
+            ],
             hostname=self.provisioning_server,
             connection_timeout=30
         )
@@ -264,16 +258,15 @@ class VirtualMachine(object):
         :raises robottelo.vm.VirtualMachineError: If package wasn't installed.
 
         """
-        self.run(
-            u'wget -nd -r -l1 --no-parent -A \'{0}.rpm\' {1}'
-            .format(package_name, repo_url)
+        self._run_checked_batch(
+            [
+                u'wget -nd -r -l1 --no-parent -A \'{0}.rpm\' {1}'
+                .format(package_name, repo_url),
+                u'rpm -i {0}.rpm'.format(package_name),
+                u'rpm -q {0}'.format(package_name),
+            ],
+            u'Failed to install {0} rpm.'.format(package_name)
         )
-        self.run(u'rpm -i {0}.rpm'.format(package_name))
-        result = self.run(u'rpm -q {0}'.format(package_name))
-        if result.return_code != 0:
-            raise VirtualMachineError(
-                u'Failed to install {0} rpm.'.format(package_name)
-            )
 
     def enable_repo(self, repo, force=False):
         """Enables specified Red Hat repository on the virtual machine. Does
@@ -305,10 +298,10 @@ class VirtualMachine(object):
             installed.
 
         """
-        self.run('yum install -y katello-agent')
-        result = self.run('rpm -q katello-agent')
-        if result.return_code != 0:
-            raise VirtualMachineError('Failed to install katello-agent')
+        self._run_checked_batch(
+            ['yum install -y katello-agent', 'rpm -q katello-agent'],
+            'Failed to install katello-agent'
+        )
         gofer_check = self.run(
             u'for i in {1..5}; do service goferd status '
             u'&& exit 0; sleep 1; done; exit 1'
@@ -322,10 +315,10 @@ class VirtualMachine(object):
         :raises robottelo.vm.VirtualMachineError: If katello-host-tools wasn't
             installed.
         """
-        self.run('yum install -y katello-host-tools')
-        result = self.run('rpm -q katello-host-tools')
-        if result.return_code != 0:
-            raise VirtualMachineError('Failed to install katello-host-tools')
+        self._run_checked_batch(
+            ['yum install -y katello-host-tools', 'rpm -q katello-host-tools'],
+            'Failed to install katello-host-tools'
+        )
 
     def install_katello_ca(self):
         """Downloads and installs katello-ca rpm on the virtual machine.
@@ -441,6 +434,50 @@ class VirtualMachine(object):
 
         return ssh.command(cmd, hostname=self.ip_addr, timeout=timeout)
 
+    def run_batch(self, cmds, timeout=None, stop_on_failure=False):
+        """Runs several ssh commands on the virtual machine in one round trip
+
+        :param list cmds: Commands to run on the virtual machine, in order
+        :param int timeout: Time to wait for each command to finish
+        :param bool stop_on_failure: Do not run the remaining commands once
+            one has failed
+        :return: A list of :class:`robottelo.ssh.SSHCommandResult` instances,
+            one per command run, see :func:`robottelo.ssh.command_batch`
+        :rtype: list
+        :raises robottelo.vm.VirtualMachineError: If the virtual machine is not
+            created.
+
+        """
+        if not self._created:
+            raise VirtualMachineError(
+                'The virtual machine should be created before running any ssh '
+                'command'
+            )
+
+        return ssh.command_batch(
+            cmds,
+            hostname=self.ip_addr,
+            timeout=timeout,
+            stop_on_failure=stop_on_failure
+        )
+
+    def _run_checked_batch(self, cmds, error_message):
+        """Runs ``cmds`` with :meth:`run_batch`, the last one checking that
+        the previous ones did their job.
+
+        :raises robottelo.vm.VirtualMachineError: with ``error_message`` if
+            the last command failed or was not run.
+        """
+        results = self.run_batch(cmds)
+        if len(results) != len(cmds):
+            raise VirtualMachineError(
+                u'{0}: only {1} of {2} commands were run, the remote script '
+                u'was interrupted'.format(
+                    error_message, len(results), len(cmds))
+            )
+        if results[-1].return_code != 0:
+            raise VirtualMachineError(error_message)
+
     def get(self, remote_path, local_path=None):
         """Get a remote file from the virtual machine."""
         if not self._created:
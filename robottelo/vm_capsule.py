@@ -160,11 +160,12 @@ class CapsuleVirtualMachine(VirtualMachine):
             self.run('{0} update'.format(ddns_bin_client))
 
         def ensure_host_resolved(
-                ssh_func, host_to_ping, ip_addr, time_sleep=60, retries=10):
+                hostname, host_to_ping, ip_addr, time_sleep=60, retries=10):
             resolved = False
             retry_max_index = retries - 1
             for retry_index in range(retries):
-                ssh_func_result = ssh_func('ping -c 1 {}'.format(host_to_ping))
+                ssh_func_result = ssh.command(
+                    'ping -c 1 {}'.format(host_to_ping), hostname=hostname)
                 ssh_func_output = ''.join(ssh_func_result.stdout)
                 if ssh_func_result.return_code == 0 and (
                             '({})'.format(ip_addr) in ssh_func_output):
@@ -177,17 +178,24 @@ class CapsuleVirtualMachine(VirtualMachine):
 
             return resolved
 
-        # Ensure capsule hostname is resolvable from the server host
-        hostname_resolved = ensure_host_resolved(
-            ssh.command, self._capsule_hostname, self.ip_addr)
-        if not hostname_resolved:
+        # Ensure capsule hostname is resolvable from the server host and at
+        # capsule host, both hosts are checked at the same time
+        expected_resolution = {
+            settings.server.hostname: {'ip_addr': self.ip_addr},
+            self.ip_addr: {'ip_addr': '127.0.0.1', 'retries': 1},
+        }
+        server_resolved, capsule_resolved = ssh.map_hosts(
+            lambda hostname: ensure_host_resolved(
+                hostname,
+                self._capsule_hostname,
+                **expected_resolution[hostname]
+            ),
+            [settings.server.hostname, self.ip_addr]
+        )
+        if not server_resolved:
             raise CapsuleVirtualMachineError(
                 'Failed to resolver the capsule hostname from the server')
-
-        # Ensure capsule hostname is resolvable at capsule host
-        hostname_resolved = ensure_host_resolved(
-            self.run, self._capsule_hostname, '127.0.0.1', retries=1)
-        if not hostname_resolved:
+        if not capsule_resolved:
             raise CapsuleVirtualMachineError(
                 'Failed to resolver the capsule hostname from capsule')
 
@@ -0,0 +1,311 @@
+#!/usr/bin/env python2
+"""Micro benchmarks for :mod:`robottelo.cli`.
+
+Each benchmark is a subcommand, run ``scripts/benchmark_cli.py --help`` to list
+them. The benchmarks do not need a Satellite server: ``ssh.command`` is
+replaced by a simulated hammer which renders the requested CSV rows after a
+fixed round trip latency plus a cost per rendered row.
+
+``list-paging``
+    Compare ``Base.list``, which reads up to 10000 entities in a single
+    command, against ``Base.iter_list`` which reads them by pages, both to
+    get the first entity and to read all of them.
+
+``parse-info``
+    Time ``hammer.parse_info`` on each hammer info output of a corpus, by
+    default the one of ``tests/robottelo/data/hammer_info``.
+
+``parse-csv``
+    Compare the time to parse a large hammer CSV output and read all its
+    values, and the memory taken by the result, for the list of dicts of
+    ``hammer.parse_csv`` and the ``hammer.CSVResult`` of its compact mode.
+
+``factory``
+    Time the CLI factories creating an organization, a product, a repository
+    and the whole ``setup_org_for_a_custom_repo`` flow against the fake
+    hammer of ``scripts/fake_hammer.py``, with the number of hammer commands
+    and ssh round trips of each and the time spent by robottelo itself, out
+    of the simulated latencies. ``custom_repo_serial`` runs the same flow with
+    its task graph limited to one task at a time, as the flow ran before its
+    independent steps were run concurrently, and the last line prints the
+    wall clock time gained by running them concurrently. The simulated
+    latencies of concurrent commands overlap, so the time spent by robottelo
+    is negative for ``custom_repo``.
+
+"""
+from __future__ import print_function
+
+import argparse
+import glob
+import io
+import os
+import re
+import sys
+import time
+import timeit
+
+import fake_hammer
+from robottelo import ssh
+from robottelo.cli import hammer
+from robottelo.cli.base import Base
+
+INFO_CORPUS_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.pardir, 'tests', 'robottelo', 'data', 'hammer_info'
+)
+
+
+class SimulatedHammer(object):
+    """Replace ``ssh.command`` by a hammer listing ``count`` entities."""
+
+    def __init__(self, count, latency, row_cost):
+        self.count = count
+        self.latency = latency
+        self.row_cost = row_cost
+        self.commands = 0
+
+    def _option(self, cmd, name, default):
+        match = re.search(r'--{0}="(\d+)"'.format(name), cmd)
+        return int(match.group(1)) if match else default
+
+    def command(self, cmd, output_format=None, **kwargs):
+        """Return the requested page of entities as hammer would."""
+        if isinstance(cmd, bytes):
+            cmd = cmd.decode('utf-8')
+        self.commands += 1
+        per_page = self._option(cmd, 'per-page', 20)
+        page = self._option(cmd, 'page', 1)
+        start = min((page - 1) * per_page, self.count)
+        end = min(start + per_page, self.count)
+        lines = [u'Id,Name,Label,Description']
+        lines.extend(
+            u'{0},entity-{0},entity_{0},Description of entity {0}'.format(
+                index)
+            for index in range(start, end)
+        )
+        time.sleep(self.latency + (end - start) * self.row_cost)
+        return ssh.make_result(u'\n'.join(lines), u'', 0, output_format)
+
+    def __enter__(self):
+        self._command = ssh.command
+        ssh.command = self.command
+        return self
+
+    def __exit__(self, *exc_info):
+        ssh.command = self._command
+
+
+class Entity(Base):
+    """A CLI class listing the simulated entities."""
+    command_base = 'entity'
+
+
+def time_call(func):
+    """Return the seconds ``func()`` took and its result."""
+    start = time.time()
+    result = func()
+    return time.time() - start, result
+
+
+def list_paging(args):
+    """Print the time to get the first and all the entities."""
+    cases = [
+        ('list', lambda: Entity.list()[:1], lambda: Entity.list()),
+        ('iter_list', lambda: next(Entity.iter_list(page_size=args.page_size)),
+         lambda: list(Entity.iter_list(page_size=args.page_size))),
+    ]
+    print('{0} entities, {1}s latency, {2}s per row'.format(
+        args.count, args.latency, args.row_cost))
+    print('{0:>10} {1:>10} {2:>10} {3:>10} {4:>10}'.format(
+        'method', 'first', 'all', 'commands', 'entities'))
+    for name, first, every in cases:
+        with SimulatedHammer(
+                args.count, args.latency, args.row_cost) as hammer:
+            first_time = min(
+                time_call(first)[0] for _ in range(args.repeat))
+            hammer.commands = 0
+            all_time, entities = min(
+                time_call(every) for _ in range(args.repeat))
+            commands = hammer.commands // args.repeat
+        print('{0:>10} {1:>9.3f}s {2:>9.3f}s {3:>10} {4:>10}'.format(
+            name, first_time, all_time, commands, len(entities)))
+
+
+def parse_info(args):
+    """Print the time to parse each info output of the corpus."""
+    print('{0:>20} {1:>8} {2:>12}'.format('output', 'lines', 'per parse'))
+    total = 0
+    for path in sorted(glob.glob(os.path.join(args.corpus, '*.txt'))):
+        with io.open(path, encoding='utf-8') as handler:
+            output = handler.read().splitlines()
+        elapsed = min(timeit.repeat(
+            lambda: hammer.parse_info(output),
+            repeat=args.repeat,
+            number=args.number
+        )) / args.number
+        total += elapsed
+        print('{0:>20} {1:>8} {2:>10.1f}us'.format(
+            os.path.basename(path)[:-4], len(output), elapsed * 10 ** 6))
+    print('{0:>20} {1:>8} {2:>10.1f}us'.format('total', '', total * 10 ** 6))
+
+
+def deep_size(obj, seen=None):
+    """Return the bytes taken by ``obj`` and the objects it holds, counting
+    the shared objects once.
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += deep_size(key, seen) + deep_size(value, seen)
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            size += deep_size(item, seen)
+    elif isinstance(obj, hammer.CSVResult):
+        size += deep_size(obj.keys, seen) + deep_size(obj.rows, seen)
+    return size
+
+
+def parse_csv(args):
+    """Print the time to parse and read a CSV output and the result size."""
+    lines = [u'ID,Name,Version,Architecture,Filename,Description']
+    lines.extend(
+        u'{0},package-{0},1.{0}-1.el7,x86_64,package-{0}-1.{0}-1.el7.rpm,'
+        u'Description of package {0}'.format(index)
+        for index in range(args.count)
+    )
+
+    def read(result):
+        return [row['name'] for row in result]
+
+    print('{0} rows'.format(args.count))
+    print('{0:>10} {1:>10} {2:>10} {3:>12}'.format(
+        'result', 'parse', 'read', 'memory'))
+    for name, compact in (('dicts', False), ('compact', True)):
+        parse_time = min(timeit.repeat(
+            lambda: hammer.parse_csv(lines, compact=compact),
+            repeat=args.repeat,
+            number=1
+        ))
+        result = hammer.parse_csv(lines, compact=compact)
+        read_time = min(timeit.repeat(
+            lambda: read(result), repeat=args.repeat, number=1))
+        print('{0:>10} {1:>9.3f}s {2:>9.3f}s {3:>10.1f}MB'.format(
+            name, parse_time, read_time, deep_size(result) / 1024.0 ** 2))
+
+
+def factory(args):
+    """Print the time, the hammer commands and the round trips of the CLI
+    factories flows.
+    """
+    from robottelo.cli import factory as cli_factory
+
+    def repository_flow():
+        org = cli_factory.make_org()
+        product = cli_factory.make_product({u'organization-id': org['id']})
+        return cli_factory.make_repository({u'product-id': product['id']})
+
+    def custom_repo_flow():
+        return cli_factory.setup_org_for_a_custom_repo(
+            {u'url': u'http://example.com/repo'})
+
+    run_task_graph = cli_factory._run_task_graph
+
+    def custom_repo_serial_flow():
+        cli_factory._run_task_graph = (
+            lambda tasks, max_workers=None: run_task_graph(tasks, 1))
+        try:
+            return custom_repo_flow()
+        finally:
+            cli_factory._run_task_graph = run_task_graph
+
+    flows = [
+        ('make_org', cli_factory.make_org),
+        ('make_repository', repository_flow),
+        ('custom_repo', custom_repo_flow),
+        ('custom_repo_serial', custom_repo_serial_flow),
+    ]
+    means = {}
+    print('{0}s latency, {1}s hammer startup, {2} hammer'.format(
+        args.latency, args.startup, 'spawned' if args.spawn else 'in process'))
+    print('{0:>18} {1:>10} {2:>10} {3:>10} {4:>10} {5:>10}'.format(
+        'flow', 'mean', 'min', 'commands', 'trips', 'overhead'))
+    for name, flow in flows:
+        with fake_hammer.FakeSSH(
+                latency=args.latency,
+                startup=args.startup,
+                action_costs={u'synchronize': args.startup},
+                spawn=args.spawn) as fake_ssh:
+            times = [time_call(flow)[0] for _ in range(args.repeat)]
+        mean = sum(times) / len(times)
+        means[name] = mean
+        print('{0:>18} {1:>9.3f}s {2:>9.3f}s {3:>10.1f} {4:>10.1f} '
+              '{5:>9.3f}s'.format(
+                  name, mean, min(times),
+                  fake_ssh.commands / float(args.repeat),
+                  fake_ssh.round_trips / float(args.repeat),
+                  mean - fake_ssh.simulated / args.repeat))
+    print('custom_repo task graph gain: {0:.3f}s ({1:.1f}x)'.format(
+        means['custom_repo_serial'] - means['custom_repo'],
+        means['custom_repo_serial'] / means['custom_repo']))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    subparsers = parser.add_subparsers()
+
+    paging = subparsers.add_parser(
+        'list-paging', help='full list against paged iteration')
+    paging.add_argument(
+        '--count', type=int, default=20000, help='number of entities')
+    paging.add_argument('--page-size', type=int, default=1000)
+    paging.add_argument(
+        '--latency', type=float, default=0.2,
+        help='simulated command round trip in seconds')
+    paging.add_argument(
+        '--row-cost', type=float, default=0.0002,
+        help='simulated seconds spent by the server per listed entity')
+    paging.add_argument('--repeat', type=int, default=3)
+    paging.set_defaults(func=list_paging)
+
+    info = subparsers.add_parser(
+        'parse-info', help='hammer info output parsing time')
+    info.add_argument(
+        '--corpus', default=INFO_CORPUS_DIR,
+        help='directory of the <name>.txt info outputs')
+    info.add_argument(
+        '--number', type=int, default=1000, help='parses per measure')
+    info.add_argument('--repeat', type=int, default=3)
+    info.set_defaults(func=parse_info)
+
+    csv_parsing = subparsers.add_parser(
+        'parse-csv', help='hammer CSV output parsing time and memory')
+    csv_parsing.add_argument(
+        '--count', type=int, default=10000, help='number of rows')
+    csv_parsing.add_argument('--repeat', type=int, default=3)
+    csv_parsing.set_defaults(func=parse_csv)
+
+    factories = subparsers.add_parser(
+        'factory', help='CLI factories against the fake hammer')
+    factories.add_argument(
+        '--latency', type=float, default=0.05,
+        help='simulated ssh round trip in seconds')
+    factories.add_argument(
+        '--startup', type=float, default=0.5,
+        help='simulated hammer startup in seconds')
+    factories.add_argument('--repeat', type=int, default=3)
+    factories.add_argument(
+        '--spawn', action='store_true',
+        help='run each hammer command in a new fake hammer process')
+    factories.set_defaults(func=factory)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python2
+"""Micro benchmarks for :mod:`robottelo.ssh`.
+
+Each benchmark is a subcommand, run ``scripts/benchmark_ssh.py --help`` to list
+them. Unless stated otherwise the benchmarks do not need a Satellite server.
+
+``command-latency``
+    Compare the time spent waiting for short commands to exit when polling
+    ``exit_status_ready`` every second (what ``execute_command`` used to do)
+    against waiting on the channel's ``status_event``. Commands are simulated
+    by a channel whose exit status arrives after the given duration. Use
+    ``--remote`` to also time ``sleep`` commands through ``ssh.command`` on the
+    configured server.
+
+``sftp-transfer``
+    Upload and download a file of random data with ``ssh.upload_file`` and
+    ``ssh.download_file``, once with a single SFTP stream and once by parallel
+    chunks, and print the throughput. Needs an sshd, by default the local one
+    with the current user and its ``~/.ssh/id_rsa`` key.
+
+"""
+from __future__ import print_function
+
+import argparse
+import getpass
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from robottelo import ssh
+from robottelo.config import settings
+
+
+class SimulatedChannel(object):
+    """Mimic the exit status part of ``paramiko.Channel`` for a command
+    exiting after ``duration`` seconds.
+    """
+
+    def __init__(self, duration):
+        self.status_event = threading.Event()
+        self._timer = threading.Timer(duration, self.status_event.set)
+        self._timer.start()
+
+    def exit_status_ready(self):
+        return self.status_event.is_set()
+
+    def cancel(self):
+        self._timer.cancel()
+
+
+def poll_exit_status(channel, timeout):
+    """Wait for the exit status the way ``execute_command`` used to."""
+    end_time = time.time() + timeout
+    while time.time() < end_time:
+        if channel.exit_status_ready():
+            return True
+        time.sleep(1)
+    return False
+
+
+def time_wait(wait_func, duration, timeout):
+    """Return the seconds ``wait_func`` took for a command lasting
+    ``duration`` seconds.
+    """
+    channel = SimulatedChannel(duration)
+    start = time.time()
+    try:
+        wait_func(channel, timeout)
+    finally:
+        channel.cancel()
+    return time.time() - start
+
+
+def command_latency(args):
+    """Print the exit wait latency for each command duration."""
+    print('{0:>10} {1:>10} {2:>10} {3:>10}'.format(
+        'command', 'polling', 'event', 'saved'))
+    for duration in args.durations:
+        polling = min(
+            time_wait(poll_exit_status, duration, args.timeout)
+            for _ in range(args.repeat)
+        )
+        event = min(
+            time_wait(ssh._wait_for_exit_status, duration, args.timeout)
+            for _ in range(args.repeat)
+        )
+        print('{0:>9.3f}s {1:>9.3f}s {2:>9.3f}s {3:>9.3f}s'.format(
+            duration, polling, event, polling - event))
+    if args.remote:
+        settings.configure()
+        print('\nssh.command on {0}'.format(settings.server.hostname))
+        for duration in args.durations:
+            start = time.time()
+            for _ in range(args.repeat):
+                ssh.command('sleep {0}'.format(duration))
+            elapsed = (time.time() - start) / args.repeat
+            print('{0:>9.3f}s {1:>9.3f}s'.format(duration, elapsed))
+
+
+def time_transfer(func, *args, **kwargs):
+    """Return the seconds ``func(*args, **kwargs)`` took."""
+    start = time.time()
+    func(*args, **kwargs)
+    return time.time() - start
+
+
+def sftp_transfer(args):
+    """Print the upload and download throughput of each transfer mode."""
+    settings.server.hostname = args.hostname
+    settings.server.ssh_username = args.username
+    settings.server.ssh_password = args.password
+    settings.server.ssh_key = None if args.password else args.key_filename
+    settings.ssh_client._transfer_workers = args.workers
+    settings.ssh_client._transfer_chunk_size = args.chunk_size * 2 ** 20
+    tmpdir = tempfile.mkdtemp()
+    try:
+        local_file = os.path.join(tmpdir, 'local')
+        remote_file = os.path.join(args.remote_dir, 'robottelo-benchmark')
+        downloaded_file = os.path.join(tmpdir, 'downloaded')
+        with open(local_file, 'wb') as handler:
+            for _ in range(args.size):
+                handler.write(os.urandom(2 ** 20))
+        print('{0:>10} {1:>12} {2:>12}'.format('mode', 'upload', 'download'))
+        for mode, parallel in (('stream', False), ('parallel', True)):
+            upload = min(
+                time_transfer(ssh.upload_file, local_file, remote_file,
+                              parallel=parallel, verify=args.verify)
+                for _ in range(args.repeat)
+            )
+            download = min(
+                time_transfer(ssh.download_file, remote_file,
+                              downloaded_file, parallel=parallel,
+                              verify=args.verify)
+                for _ in range(args.repeat)
+            )
+            print('{0:>10} {1:>9.1f}MB/s {2:>9.1f}MB/s'.format(
+                mode, args.size / upload, args.size / download))
+        ssh.command('rm -f {0}'.format(remote_file))
+    finally:
+        ssh.close_connections()
+        shutil.rmtree(tmpdir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    subparsers = parser.add_subparsers()
+
+    latency = subparsers.add_parser(
+        'command-latency', help='exit status wait latency')
+    latency.add_argument(
+        '--durations', type=float, nargs='+',
+        default=[0.05, 0.3, 1.2, 2.5],
+        help='simulated command durations in seconds')
+    latency.add_argument('--repeat', type=int, default=3)
+    latency.add_argument('--timeout', type=float, default=300)
+    latency.add_argument(
+        '--remote', action='store_true',
+        help='also time commands on the configured server')
+    latency.set_defaults(func=command_latency)
+
+    transfer = subparsers.add_parser(
+        'sftp-transfer', help='file transfer throughput')
+    transfer.add_argument('--hostname', default='localhost')
+    transfer.add_argument('--username', default=getpass.getuser())
+    transfer.add_argument('--password')
+    transfer.add_argument(
+        '--key-filename', default=os.path.expanduser('~/.ssh/id_rsa'))
+    transfer.add_argument(
+        '--remote-dir', default='/tmp',
+        help='remote directory receiving the uploaded file')
+    transfer.add_argument(
+        '--size', type=int, default=256, help='file size in MiB')
+    transfer.add_argument(
+        '--chunk-size', type=int, default=8, help='chunk size in MiB')
+    transfer.add_argument('--workers', type=int, default=4)
+    transfer.add_argument('--repeat', type=int, default=3)
+    transfer.add_argument(
+        '--verify', action='store_true', help='verify the checksums')
+    transfer.set_defaults(func=sftp_transfer)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,565 @@
+#!/usr/bin/env python2
+"""Offline stand-in for ``hammer`` and the ssh commands running it.
+
+:class:`FakeHammer` keeps entities in memory and answers the hammer commands
+the way hammer would: ``create`` returns the ``Message,Id,Name`` CSV row,
+``info`` renders the entity as hammer does, ``list`` the CSV of the matching
+entities page. A few subcommands used by the CLI factories have side effects,
+e.g. ``content-view publish`` adds a version to the content view and the
+products of an organization are listed as its subscriptions. Any other
+subcommand succeeds. The ``info`` outputs are completed by the sections of
+the canned outputs of ``tests/robottelo/data/hammer_info`` which the entity
+does not have, so they are as large as real ones.
+
+:class:`FakeSSH` replaces ``ssh.command`` and ``ssh.command_batch`` by the
+fake hammer, with a simulated latency for each round trip, for each hammer
+startup and for some subcommands. It runs the fake hammer in process, or as
+a new process of this script when ``spawn`` is set.
+
+Run as a script, this is a ``hammer`` executable keeping its entities in the
+JSON file named by ``FAKE_HAMMER_STATE``::
+
+    FAKE_HAMMER_STATE=/tmp/hammer.json scripts/fake_hammer.py \\
+        --output=csv organization create --name="org"
+
+"""
+from __future__ import print_function
+
+import csv
+import io
+import json
+import os
+import re
+import shlex
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import six
+
+#: Directory of the canned ``<command_base>.txt`` info outputs.
+CORPUS_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.pardir, 'tests', 'robottelo', 'data', 'hammer_info'
+)
+
+#: Environment variable naming the state file of the hammer executable.
+STATE_ENV = 'FAKE_HAMMER_STATE'
+
+#: hammer exit code when an entity is not found.
+EX_DATAERR = 65
+
+#: hammer exit code when the command line is not valid.
+EX_USAGE = 64
+
+#: Columns of the CSV lists, by command base.
+LIST_COLUMNS = {
+    'subscription': [
+        'id', 'uuid', 'name', 'type', 'contract', 'account', 'support',
+        'end-date', 'quantity', 'consumed',
+    ],
+    'content-view version': [
+        'id', 'name', 'version', 'lifecycle-environments',
+    ],
+}
+DEFAULT_LIST_COLUMNS = ['id', 'name', 'label', 'description']
+
+_TITLE_WORDS = {'id': 'ID', 'ids': 'IDs', 'url': 'URL', 'uuid': 'UUID'}
+
+#: :class:`FakeHammer` methods handling the subcommands, by their last word.
+_ACTIONS = {
+    'create': '_create',
+    'info': '_info',
+    'list': '_list',
+    'update': '_update',
+    'delete': '_delete',
+    'publish': '_publish',
+    'add-repository': '_add_repository',
+    'promote': '_promote',
+}
+
+#: Messages of the subcommands, by their last word.
+_MESSAGES = {
+    'create': u'{0} created',
+    'update': u'{0} updated',
+    'delete': u'{0} deleted',
+}
+
+
+class FakeHammerError(Exception):
+    """A hammer command error, with the hammer exit code."""
+
+    def __init__(self, return_code, message):
+        super(FakeHammerError, self).__init__(message)
+        self.return_code = return_code
+        self.message = message
+
+
+def title(key):
+    """Return the hammer label of a field, e.g. ``Organization ID`` for
+    ``organization-id``.
+    """
+    return u' '.join(
+        _TITLE_WORDS.get(word, word.capitalize()) for word in key.split('-'))
+
+
+def titled(value):
+    """Return ``value`` with the hammer labels as dicts keys, like the
+    hammer JSON output.
+    """
+    if isinstance(value, dict):
+        return dict((title(key), titled(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return [titled(item) for item in value]
+    return value
+
+
+def render_info(entity, indent=u''):
+    """Return the lines of the hammer info output of ``entity``."""
+    lines = []
+    width = max([len(title(key)) for key in entity] or [0]) + 1
+    for key, value in entity.items():
+        label = title(key) + u':'
+        if isinstance(value, dict):
+            lines.append(indent + label)
+            lines.extend(render_info(value, indent + u'    '))
+        elif isinstance(value, list):
+            lines.append(indent + label)
+            for number, item in enumerate(value, 1):
+                prefix = u'{0} {1}) '.format(indent, number)
+                if isinstance(item, dict):
+                    item_lines = render_info(item, indent + u'    ')
+                    lines.append(prefix + item_lines[0].lstrip())
+                    lines.extend(item_lines[1:])
+                else:
+                    lines.append(prefix + six.text_type(item))
+        else:
+            lines.append(u'{0}{1:<{2}} {3}'.format(
+                indent, label, width, value).rstrip())
+    return lines
+
+
+def render_csv(columns, rows):
+    """Return the hammer CSV output of ``rows`` dicts."""
+    output = six.StringIO()
+    writer = csv.writer(output, lineterminator='\n')
+    values = [[title(column) for column in columns]]
+    values.extend(
+        [six.text_type(row.get(column, u'')) for column in columns]
+        for row in rows
+    )
+    for row in values:
+        if six.PY2:
+            row = [value.encode('utf-8') for value in row]
+        writer.writerow(row)
+    output = output.getvalue()
+    if six.PY2:
+        output = output.decode('utf-8')
+    return output
+
+
+def canned_sections(command_base, corpus_dir=CORPUS_DIR):
+    """Return the top level sections of the canned info output of
+    ``command_base``, as a list of ``(key, lines)``.
+    """
+    path = os.path.join(
+        corpus_dir, '{0}.txt'.format(command_base.replace('-', '_')))
+    if not os.path.exists(path):
+        return []
+    sections = []
+    with io.open(path, encoding='utf-8') as handler:
+        for line in handler.read().splitlines():
+            if line and not line[0].isspace():
+                key = line.split(u':', 1)[0].strip().replace(u' ', u'-')
+                sections.append((key.lower(), [line]))
+            elif sections:
+                sections[-1][1].append(line)
+    return sections
+
+
+class FakeHammer(object):
+    """Answer hammer command lines from the entities kept in ``state``.
+
+    :param dict state: The entities by command base and the next entity id,
+        as saved by a previous :class:`FakeHammer`. A new state is created
+        when it is ``None``.
+    :param str corpus_dir: The directory of the canned info outputs.
+    """
+
+    def __init__(self, state=None, corpus_dir=CORPUS_DIR):
+        self.state = state or {'next_id': 1, 'entities': {}}
+        self.corpus_dir = corpus_dir
+        self._canned = {}
+        self._lock = threading.Lock()
+
+    def run(self, args):
+        """Run the hammer command of ``args``, the words following
+        ``hammer`` on a command line.
+
+        :return: a tuple of the exit code, stdout and stderr.
+        """
+        try:
+            output_format, words, options = self._parse_args(args)
+            if len(words) < 2:
+                raise FakeHammerError(
+                    EX_USAGE, u'Error: no subcommand given')
+            command_base, action = u' '.join(words[:-1]), words[-1]
+            with self._lock:
+                handler = getattr(self, _ACTIONS.get(action, '_action'))
+                result = handler(command_base, action, options)
+        except FakeHammerError as err:
+            return err.return_code, u'', err.message + u'\n'
+        return 0, self._render(result, output_format), u''
+
+    @staticmethod
+    def _parse_args(args):
+        """Return the output format, subcommand words and options of
+        ``args``.
+        """
+        output_format = None
+        words = []
+        options = {}
+        args = list(args)
+        while args:
+            arg = args.pop(0)
+            if arg in ('-u', '-p', '--interactive', '-c'):
+                args.pop(0)
+            elif arg.startswith('--output'):
+                output_format = (
+                    arg.split('=', 1)[1] if '=' in arg else args.pop(0))
+            elif arg.startswith('--'):
+                if '=' in arg:
+                    key, value = arg[2:].split('=', 1)
+                elif args and not args[0].startswith('-'):
+                    key, value = arg[2:], args.pop(0)
+                else:
+                    key, value = arg[2:], True
+                options[key] = value
+            elif not arg.startswith('-'):
+                words.append(arg)
+        return output_format, words, options
+
+    def _render(self, result, output_format):
+        """Return the output of a command result: a message, an entity for
+        ``info`` or a list of rows with their columns.
+        """
+        kind, value = result
+        if output_format == 'json':
+            if kind == 'info':
+                value = value[0]
+            elif kind == 'rows':
+                value = value[1]
+            else:
+                value = value[0]
+            return json.dumps(titled(value), indent=2)
+        if kind == 'info':
+            info, command_base = value
+            lines = render_info(info)
+            for key, section in self._canned_sections(command_base):
+                if key not in info:
+                    lines.extend(section)
+            return u'\n'.join(lines) + u'\n'
+        if kind == 'rows':
+            columns, rows = value
+            if output_format == 'csv':
+                return render_csv(columns, rows)
+            return u'\n'.join(
+                u' | '.join(six.text_type(row.get(column, u''))
+                            for column in columns)
+                for row in rows
+            ) + u'\n'
+        if output_format == 'csv':
+            return render_csv(['message', 'id', 'name'], value)
+        return u''.join(u'{0}\n'.format(row['message']) for row in value)
+
+    def _canned_sections(self, command_base):
+        if command_base not in self._canned:
+            self._canned[command_base] = canned_sections(
+                command_base, self.corpus_dir)
+        return self._canned[command_base]
+
+    def _entities(self, command_base):
+        return self.state['entities'].setdefault(command_base, [])
+
+    def _new_entity(self, command_base, fields):
+        entity = {u'id': six.text_type(self.state['next_id'])}
+        self.state['next_id'] += 1
+        entity.update(fields)
+        self._entities(command_base).append(entity)
+        return entity
+
+    def _find(self, command_base, options, required=True):
+        """Return the entity selected by the ``id`` or ``name`` options."""
+        for key in ('id', 'name'):
+            if key in options:
+                for entity in self._entities(command_base):
+                    if entity.get(key) == options[key]:
+                        return entity
+                break
+        if required:
+            raise FakeHammerError(
+                EX_DATAERR,
+                u'Could not find {0}, please set one of options --id, '
+                u'--name.'.format(command_base)
+            )
+        return None
+
+    @staticmethod
+    def _message(command_base, action, entity=None):
+        row = {'message': _MESSAGES.get(action, u'{0} ' + action).format(
+            title(command_base.split()[-1]))}
+        if entity is not None:
+            row.update(id=entity['id'], name=entity.get('name', u''))
+        return 'message', [row]
+
+    def _create(self, command_base, action, options):
+        fields = dict(
+            (key, value) for key, value in options.items()
+            if value is not True
+        )
+        fields.setdefault(u'name', u'{0}-{1}'.format(
+            command_base.split()[-1], self.state['next_id']))
+        fields.setdefault(u'label', re.sub(r'\W', u'_', fields['name']))
+        entity = self._new_entity(command_base, fields)
+        if command_base == 'content-view':
+            entity[u'versions'] = []
+            entity[u'repository-ids'] = []
+        return self._message(command_base, action, entity)
+
+    def _info(self, command_base, action, options):
+        return 'info', (self._find(command_base, options), command_base)
+
+    def _list(self, command_base, action, options):
+        if command_base == 'subscription':
+            entities = self._subscriptions(options.get('organization-id'))
+        else:
+            entities = [
+                entity for entity in self._entities(command_base)
+                if all(entity.get(key) == options[key] for key in (
+                    'organization-id', 'product-id', 'content-view-id')
+                    if key in options)
+            ]
+        match = re.match(
+            r'\s*(\w+)\s*=\s*"?([^"]*)"?\s*$', options.get('search', u''))
+        if match:
+            key, value = match.groups()
+            entities = [
+                entity for entity in entities
+                if entity.get(key) == value
+            ]
+        per_page = int(options.get('per-page', 20))
+        start = (int(options.get('page', 1)) - 1) * per_page
+        return 'rows', (
+            LIST_COLUMNS.get(command_base, DEFAULT_LIST_COLUMNS),
+            entities[start:start + per_page]
+        )
+
+    def _subscriptions(self, organization_id):
+        """The products of an organization are its subscriptions."""
+        return [
+            {
+                u'id': product['id'],
+                u'uuid': u'{0:032x}'.format(int(product['id'])),
+                u'name': product['name'],
+                u'type': u'Physical',
+                u'quantity': u'Unlimited',
+                u'consumed': u'0',
+            }
+            for product in self._entities('product')
+            if organization_id is None or
+            product.get('organization-id') == organization_id
+        ]
+
+    def _update(self, command_base, action, options):
+        entity = self._find(command_base, options)
+        entity.update(
+            (key, value) for key, value in options.items()
+            if key not in ('id', 'new-name') and value is not True
+        )
+        if 'new-name' in options:
+            entity['name'] = options['new-name']
+        return self._message(command_base, action, entity)
+
+    def _delete(self, command_base, action, options):
+        entity = self._find(command_base, options)
+        self._entities(command_base).remove(entity)
+        return self._message(command_base, action)
+
+    def _publish(self, command_base, action, options):
+        content_view = self._find(command_base, options)
+        version = self._new_entity('content-view version', {
+            u'name': u'{0} {1}.0'.format(
+                content_view['name'], len(content_view['versions']) + 1),
+            u'version': u'{0}.0'.format(len(content_view['versions']) + 1),
+            u'content-view-id': content_view['id'],
+            u'lifecycle-environments': u'Library',
+        })
+        content_view['versions'].append({
+            u'id': version['id'],
+            u'version': version['version'],
+            u'published': time.strftime('%Y/%m/%d %H:%M:%S'),
+        })
+        return self._message(command_base, action, content_view)
+
+    def _add_repository(self, command_base, action, options):
+        content_view = self._find(command_base, options)
+        content_view['repository-ids'].append(options['repository-id'])
+        return 'message', [
+            {'message': u'The repository has been associated.'}]
+
+    def _promote(self, command_base, action, options):
+        version = self._find(command_base, options)
+        version['lifecycle-environments'] += u', {0}'.format(
+            options.get('to-lifecycle-environment-id'))
+        return self._message(command_base, action, version)
+
+    def _action(self, command_base, action, options):
+        """Any other subcommand succeeds on the selected entity, if any."""
+        entity = self._find(command_base, options, required=False)
+        return self._message(command_base, action, entity)
+
+
+class FakeSSH(object):
+    """Replace ``ssh.command`` and ``ssh.command_batch`` by a fake hammer.
+
+    :param FakeHammer hammer: The fake hammer answering the commands, a new
+        one is created when it is ``None``.
+    :param float latency: The seconds of each ssh round trip.
+    :param float startup: The seconds of each hammer startup.
+    :param dict action_costs: Extra seconds spent by the server on a
+        subcommand, by its last word, e.g. ``{'synchronize': 2}``.
+    :param bool spawn: Run each hammer command in a new process of this
+        script instead of in process.
+
+    :attr:`round_trips`, :attr:`commands` and :attr:`simulated` count the ssh
+    round trips, the hammer commands and the seconds of simulated latency.
+    A command line which does not run hammer fails with exit code 127. The
+    ``time -p`` prefix of ``time_hammer`` is honoured.
+    """
+
+    def __init__(self, hammer=None, latency=0.0, startup=0.0,
+                 action_costs=None, spawn=False):
+        self.hammer = hammer or FakeHammer()
+        self.latency = latency
+        self.startup = startup
+        self.action_costs = action_costs or {}
+        self.spawn = spawn
+        self.round_trips = 0
+        self.commands = 0
+        self.simulated = 0.0
+        self._state_path = None
+        self._originals = None
+
+    def _sleep(self, seconds):
+        """Wait ``seconds`` and count them in :attr:`simulated`."""
+        self.simulated += seconds
+        time.sleep(seconds)
+
+    def _run_line(self, cmd):
+        """Run a shell command line calling hammer."""
+        if isinstance(cmd, bytes):
+            cmd = cmd.decode('utf-8')
+        words = shlex.split(cmd)
+        timed = False
+        while words and words[0] != 'hammer':
+            word = words.pop(0)
+            if word == 'time':
+                timed = True
+            elif '=' not in word and word != '-p':
+                return 127, u'', u'{0}: command not found\n'.format(word)
+        if not words:
+            return 127, u'', u'hammer is not run\n'
+        self.commands += 1
+        args = words[1:]
+        start = time.time()
+        self._sleep(self.startup + max(
+            [self.action_costs.get(arg, 0) for arg in args] or [0]))
+        if self.spawn:
+            process = subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__)] + args,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env=dict(os.environ, **{STATE_ENV: self._state_path}),
+            )
+            stdout, stderr = process.communicate()
+            return_code = process.returncode
+            stdout = stdout.decode('utf-8')
+            stderr = stderr.decode('utf-8')
+        else:
+            return_code, stdout, stderr = self.hammer.run(args)
+        if timed:
+            stderr += u'real {0:.2f}\nuser 0.00\nsys 0.00\n'.format(
+                time.time() - start)
+        return return_code, stdout, stderr
+
+    def command(self, cmd, hostname=None, output_format=None, timeout=None,
+                connection_timeout=None, **kwargs):
+        """Stand-in for :func:`robottelo.ssh.command`."""
+        from robottelo import ssh
+        self.round_trips += 1
+        self._sleep(self.latency)
+        return_code, stdout, stderr = self._run_line(cmd)
+        return ssh.make_result(stdout, stderr, return_code, output_format)
+
+    def command_batch(self, cmds, hostname=None, output_format=None,
+                      timeout=None, connection_timeout=None,
+                      stop_on_failure=False, **kwargs):
+        """Stand-in for :func:`robottelo.ssh.command_batch`."""
+        from robottelo import ssh
+        self.round_trips += 1
+        self._sleep(self.latency)
+        results = []
+        for cmd in cmds:
+            return_code, stdout, stderr = self._run_line(cmd)
+            results.append(
+                ssh.make_result(stdout, stderr, return_code, output_format))
+            if stop_on_failure and return_code != 0:
+                break
+        return results
+
+    def __enter__(self):
+        from robottelo import ssh
+        if self.spawn:
+            handle, self._state_path = tempfile.mkstemp(suffix='.json')
+            with os.fdopen(handle, 'w') as state_file:
+                json.dump(self.hammer.state, state_file)
+        self._originals = (ssh.command, ssh.command_batch)
+        ssh.command = self.command
+        ssh.command_batch = self.command_batch
+        return self
+
+    def __exit__(self, *exc_info):
+        from robottelo import ssh
+        ssh.command, ssh.command_batch = self._originals
+        if self._state_path is not None:
+            with open(self._state_path) as state_file:
+                self.hammer.state = json.load(state_file)
+            os.remove(self._state_path)
+            self._state_path = None
+
+
+def main(args):
+    """Run the hammer command of ``args`` with the entities of the
+    :data:`STATE_ENV` file.
+    """
+    import fcntl
+    state_path = os.environ.get(STATE_ENV) or os.path.expanduser(
+        '~/.fake_hammer.json')
+    with open(state_path, 'a+') as state_file:
+        fcntl.flock(state_file, fcntl.LOCK_EX)
+        state_file.seek(0)
+        content = state_file.read()
+        hammer = FakeHammer(json.loads(content) if content else None)
+        return_code, stdout, stderr = hammer.run(args)
+        state_file.seek(0)
+        state_file.truncate()
+        json.dump(hammer.state, state_file)
+    sys.stdout.write(stdout)
+    sys.stderr.write(stderr)
+    return return_code
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -1,35 +1,37 @@
 """Generate hammer command tree in json format by inspecting every command's
 help.
 
+The tree is crawled in parallel over one pooled connection and stored in the
+cache of the server Satellite version used to validate the hammer options, see
+:mod:`robottelo.cli.hammer_commands`. It is also written to
+``hammer_commands.json`` in the working directory, or the given file.
+
 """
+import argparse
 import json
 
-from robottelo import ssh
-from robottelo.cli import hammer
+from robottelo.cli import hammer_commands
 from robottelo.config import settings
 
 
-def generate_command_tree(command):
-    """Recursively walk trhough the hammer commands and subcommands and fetch
-    their help. Return a dictionary with the contents.
-
-    """
-    output = ssh.command('{0} --help'.format(command)).stdout
-    contents = hammer.parse_help(output)
-    if len(contents['subcommands']) > 0:
-        for subcommand in contents['subcommands']:
-            subcommand.update(generate_command_tree(
-                '{0} {1}'.format(command, subcommand['name'])
-            ))
-    return contents
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument(
+        'output', nargs='?', default='hammer_commands.json',
+        help='file the command tree is written to')
+    parser.add_argument(
+        '--refresh', action='store_true',
+        help='crawl the tree again even when it is already cached')
+    args = parser.parse_args()
 
+    settings.configure()
+    version = hammer_commands.get_server_version()
+    if args.refresh:
+        hammer_commands.remove_command_tree(version)
+    tree = hammer_commands.get_command_tree(version)
+    with open(args.output, 'w') as f:
+        f.write(json.dumps(tree, indent=2, sort_keys=True))
 
-settings.configure()
 
-# Generate the json file in the working directory
-with open('hammer_commands.json', 'w') as f:
-    f.write(json.dumps(
-        generate_command_tree('hammer'),
-        indent=2,
-        sort_keys=True
-    ))
+if __name__ == '__main__':
+    main()
@@ -2,13 +2,18 @@
 """Configurations for py.test runner"""
 import datetime
 import logging
+import os
+import shutil
+import tempfile
 
 import pytest
 from nailgun import entities
 
 from robottelo.cleanup import EntitiesCleaner
+from robottelo.cli import hammer_timings
 from robottelo.config import settings
 from robottelo.decorators import setting_is_set
+from robottelo.decorators.func_shared import pool
 from robottelo.bz_helpers import get_deselect_bug_ids, group_by_key
 from robottelo.helpers import get_func_name
 
@@ -50,6 +55,73 @@ def pytest_report_header(config):
     return messages
 
 
+def _entity_pools_enabled():
+    """Return whether the CLI factories entity pools are enabled"""
+    return bool(setting_is_set('shared_function') and
+                settings.shared_function.entity_pool_size)
+
+
+def pytest_configure(config):
+    """Collect the hammer timings of all the workers in a directory of this
+    run when ``time_hammer`` is enabled, see
+    :mod:`robottelo.cli.hammer_timings`, and share the CLI factories entity
+    pools of this run between the workers, see
+    :mod:`robottelo.decorators.func_shared.pool`. The workers inherit the
+    environment variables naming the directory and the pools scope.
+    """
+    if hasattr(config, 'slaveinput'):
+        return
+    if not settings.configured:
+        settings.configure()
+    if (settings.performance and settings.performance.time_hammer and
+            hammer_timings.TIMINGS_DIR_ENV not in os.environ):
+        timings_dir = tempfile.mkdtemp(
+            prefix='hammer_timings_', dir=settings.tmp_dir or None)
+        os.environ[hammer_timings.TIMINGS_DIR_ENV] = timings_dir
+        config.hammer_timings_dir = timings_dir
+    if _entity_pools_enabled():
+        pool.set_run_scope()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Refill the CLI factories entity pools after each test, in the process
+    running the tests. With ``--boxed`` the test itself runs in a forked
+    process, which exits once the test ends.
+    """
+    yield
+    if _entity_pools_enabled():
+        # imported here as the factories are only needed with the pools
+        from robottelo.cli.factory import refill_entity_pools
+        refill_entity_pools()
+
+
+def pytest_sessionfinish(session):
+    """Delete the entities leased from the CLI factories pools once all the
+    workers are done.
+    """
+    if hasattr(session.config, 'slaveinput') or not _entity_pools_enabled():
+        return
+    # imported here as the factories are only needed with the pools
+    from robottelo.cli.factory import finish_entity_pools
+    log('Deleted {0} entities of the CLI factories pools'.format(
+        finish_entity_pools()))
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Report the hammer timings of all the workers"""
+    timings_dir = getattr(
+        terminalreporter.config, 'hammer_timings_dir', None)
+    if timings_dir is None:
+        return
+    lines = hammer_timings.report(hammer_timings.load_samples(timings_dir))
+    shutil.rmtree(timings_dir, ignore_errors=True)
+    if lines:
+        terminalreporter.write_sep('=', 'hammer timings')
+        for line in lines:
+            terminalreporter.write_line(line)
+
+
 @pytest.fixture(scope="session")
 def worker_id(request):
     """Gets the worker ID when running in multi-threading with xdist
@@ -0,0 +1,95 @@
+"""Tests for module ``robottelo.cli.factory``."""
+import threading
+
+import unittest2
+
+from robottelo.cli.factory import CLIFactoryError, _run_task_graph
+
+
+class RunTaskGraphTestCase(unittest2.TestCase):
+    """Tests for the task graphs of the setup flows."""
+
+    def setUp(self):
+        self.started = []
+        self.lock = threading.Lock()
+
+    def task(self, name, error=None, wait_for=None):
+        """Return a task recording its start, waiting for the ``wait_for``
+        event then raising ``error`` or returning its name.
+        """
+        def func(results):
+            with self.lock:
+                self.started.append(name)
+            if wait_for is not None:
+                wait_for.wait(5)
+            if error is not None:
+                raise error
+            return name
+        return func
+
+    def test_results(self):
+        """The tasks run once their dependencies are done"""
+        results = _run_task_graph([
+            ('org', self.task('org'), ()),
+            ('env', self.task('env'), ('org',)),
+            ('cv', self.task('cv'), ('org',)),
+            ('promote', self.task('promote'), ('env', 'cv')),
+        ], max_workers=2)
+        self.assertEqual(
+            results,
+            {'org': 'org', 'env': 'env', 'cv': 'cv', 'promote': 'promote'}
+        )
+        self.assertEqual(self.started[0], 'org')
+        self.assertEqual(self.started[-1], 'promote')
+
+    def test_first_error_in_flow_order(self):
+        """The error of the first failed task in flow order is raised, even
+        when a later task failed first
+        """
+        later_failed = threading.Event()
+
+        def fail_later(results):
+            try:
+                raise CLIFactoryError('env')
+            finally:
+                later_failed.set()
+
+        with self.assertRaisesRegexp(CLIFactoryError, 'product'):
+            _run_task_graph([
+                ('product', self.task(
+                    'product', CLIFactoryError('product'), later_failed),
+                 ()),
+                ('env', fail_later, ()),
+            ], max_workers=2)
+
+    def test_no_task_started_after_error(self):
+        """The tasks whose dependencies are done after a failure are not
+        started
+        """
+        failed = threading.Event()
+
+        def fail(results):
+            self.started.append('org')
+            try:
+                raise CLIFactoryError('org')
+            finally:
+                failed.set()
+
+        with self.assertRaises(CLIFactoryError):
+            _run_task_graph([
+                ('org', fail, ()),
+                ('env', self.task('env', wait_for=failed), ()),
+                ('cv', self.task('cv'), ('env',)),
+                ('ak', self.task('ak'), ('org',)),
+            ], max_workers=2)
+        self.assertEqual(sorted(self.started), ['env', 'org'])
+
+    def test_unknown_dependency(self):
+        """A task depending on an unknown task raises CLIFactoryError"""
+        with self.assertRaisesRegexp(
+                CLIFactoryError, 'Tasks cv depend on unknown tasks'):
+            _run_task_graph([
+                ('org', self.task('org'), ()),
+                ('cv', self.task('cv'), ('org', 'content-view')),
+            ], max_workers=1)
+        self.assertEqual(self.started, ['org'])
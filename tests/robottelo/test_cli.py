@@ -1,14 +1,23 @@
+import random
 import six
+import threading
+import time
 import unittest2
 
 from functools import partial
+from robottelo.cli import hammer_commands
 from robottelo.cli.base import (
     Base,
     CLIBaseError,
     CLIDataBaseError,
     CLIError,
-    CLIReturnCodeError
+    CLIReturnCodeError,
+    clear_read_cache,
+    read_cache_stats,
 )
+from robottelo.cli.hammer_session import HammerSessionError
+from robottelo.cli.hammer_shell import HammerShellError
+from robottelo.ssh import SSHCommandResult
 
 if six.PY2:
     import mock
@@ -28,8 +37,7 @@ class BaseCliTestCase(unittest2.TestCase):
     def test_construct_command(self):
         """_construct_command builds a command using flags and arguments"""
         Base.command_base = 'basecommand'
-        Base.command_sub = 'subcommand'
-        command_parts = Base._construct_command({
+        command_parts = Base._construct_command('subcommand', {
             u'flag-one': True,
             u'flag-two': False,
             u'argument': u'value',
@@ -43,6 +51,46 @@ class BaseCliTestCase(unittest2.TestCase):
         self.assertNotIn(u'--flag-two', command_parts)
         self.assertEqual(len(command_parts), 4)
 
+    @mock.patch('robottelo.cli.base.hammer_commands.unknown_options')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_construct_command_validate_options(
+            self, settings, unknown_options):
+        """_construct_command rejects the options hammer does not accept
+        without running the command
+        """
+        settings.hammer.validate_options = True
+        unknown_options.return_value = []
+        Base.command_base = 'basecommand'
+        Base._construct_command('subcommand', {
+            u'flag-one': True,
+            u'flag-two': False,
+            u'argument': u'value',
+            u'ommited-arg': None,
+        })
+        command, options, _ = unknown_options.call_args[0]
+        self.assertEqual(command, u'basecommand subcommand')
+        self.assertEqual(sorted(options), [u'argument', u'flag-one'])
+        unknown_options.return_value = [u'argument']
+        with self.assertRaisesRegexp(
+                CLIReturnCodeError, u"Unrecognised option '--argument'"):
+            Base._construct_command('subcommand', {u'argument': u'value'})
+
+    @mock.patch('robottelo.cli.base.hammer_commands.get_server_version')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_construct_command_command_tree_error(
+            self, settings, get_server_version):
+        """_construct_command does not report a command tree which can not be
+        read as a hammer usage error
+        """
+        settings.hammer.validate_options = True
+        get_server_version.side_effect = (
+            hammer_commands.HammerCommandTreeError(u'no route to host'))
+        hammer_commands.clear_command_trees()
+        self.addCleanup(hammer_commands.clear_command_trees)
+        Base.command_base = 'basecommand'
+        with self.assertRaises(hammer_commands.HammerCommandTreeError):
+            Base._construct_command('subcommand', {u'argument': u'value'})
+
     def test_username_password_parameters_lookup(self):
         """Username and password returned are the parameters"""
         username, password = CLIClass._get_username_password('auser', 'apass')
@@ -85,6 +133,21 @@ class BaseCliTestCase(unittest2.TestCase):
         response.stderr = []
         self.assertEqual(response.stdout, base._handle_response(response))
 
+    @unittest2.skipIf(six.PY2, 'asyncio is only available on Python 3')
+    @mock.patch('robottelo.cli.base.Base.execute')
+    def test_execute_async(self, execute):
+        """execute_async runs execute with the same arguments"""
+        import asyncio
+        execute.return_value = 'result'
+        loop = asyncio.new_event_loop()
+        try:
+            result = loop.run_until_complete(
+                Base.execute_async('info --id 1', output_format='csv'))
+        finally:
+            loop.close()
+        self.assertEqual(result, 'result')
+        execute.assert_called_once_with('info --id 1', output_format='csv')
+
     @mock.patch('robottelo.cli.base.Base.logger.warning')
     def test_handle_response_logging_when_stderr_not_empty(self, warning):
         """Check handle_response log stderr when it is not empty"""
@@ -112,6 +175,23 @@ class BaseCliTestCase(unittest2.TestCase):
         """
         self.assert_response_error(CLIReturnCodeError)
 
+    def test_handle_response_error_subcommand(self):
+        """Check handle_response reports the failed subcommand without its
+        options
+        """
+        response = mock.Mock()
+        response.return_code = 1
+        response.stderr = [u'some error']
+        with self.assertRaisesRegexp(
+                CLIReturnCodeError, u'Command "user create" finished'):
+            Base._handle_response(
+                response, command=u'user create --password="secret"')
+        try:
+            Base._handle_response(
+                response, command=u'user create --password="secret"')
+        except CLIReturnCodeError as err:
+            self.assertNotIn(u'secret', err.msg)
+
     def test_handle_data_base_response_error(self):
         """Check handle_response raise ``CLIDataBaseError`` when
         return_code is not 0 and error is related to DB error.
@@ -156,14 +236,15 @@ class BaseCliTestCase(unittest2.TestCase):
     @mock.patch('robottelo.cli.base.Base.execute')
     @mock.patch('robottelo.cli.base.Base._construct_command')
     def test_add_operating_system(self, construct, execute):
-        """Check command_sub edited when executing add_operating_system"""
+        """Check add_operating_system runs the add-operatingsystem
+        subcommand
+        """
         options = {u'foo': u'bar'}
-        self.assertNotEqual('add-operatingsystem', Base.command_sub)
         self.assertEqual(
             execute.return_value,
             Base.add_operating_system(options)
         )
-        self.assertEqual('add-operatingsystem', Base.command_sub)
+        self.assertEqual('add-operatingsystem', construct.call_args[0][0])
         construct.called_once_with(options)
         execute.called_once_with(construct.return_value)
 
@@ -176,7 +257,7 @@ class BaseCliTestCase(unittest2.TestCase):
             execute.return_value,
             Base.create()
         )
-        self.assertEqual('create', Base.command_sub)
+        self.assertEqual('create', construct.call_args[0][0])
         construct.called_once_with({})
         execute.called_once_with(construct.return_value, output_format='csv')
 
@@ -191,7 +272,7 @@ class BaseCliTestCase(unittest2.TestCase):
             execute.return_value,
             Base.create()
         )
-        self.assertEqual('create', Base.command_sub)
+        self.assertEqual('create', construct.call_args[0][0])
         construct.called_once_with({})
         execute.called_once_with(construct.return_value, output_format='csv')
         self.assertFalse(info.called)
@@ -210,7 +291,7 @@ class BaseCliTestCase(unittest2.TestCase):
             execute.return_value,
             Base.create()
         )
-        self.assertEqual('create', Base.command_sub)
+        self.assertEqual('create', construct.call_args[0][0])
         construct.called_once_with({})
         execute.called_once_with(construct.return_value, output_format='csv')
         info.called_once_with({'id': 'foo'})
@@ -229,7 +310,7 @@ class BaseCliTestCase(unittest2.TestCase):
             execute.return_value,
             Base.create({'organization-id': 'org-id'})
         )
-        self.assertEqual('create', Base.command_sub)
+        self.assertEqual('create', construct.call_args[0][0])
         construct.called_once_with({})
         execute.called_once_with(construct.return_value, output_format='csv')
         info.called_once_with({'id': 'foo', 'organization-id': 'org-id'})
@@ -246,10 +327,64 @@ class BaseCliTestCase(unittest2.TestCase):
         ]
         Base.command_requires_org = True
         self.assertRaises(CLIError, Base.create)
-        self.assertEqual('create', Base.command_sub)
+        self.assertEqual('create', construct.call_args[0][0])
         construct.called_once_with({})
         execute.called_once_with(construct.return_value, output_format='csv')
 
+    @mock.patch('robottelo.cli.base.Base.info')
+    @mock.patch('robottelo.cli.base.Base.execute')
+    @mock.patch('robottelo.cli.base.Base._construct_command')
+    def test_add_create_lazy_info_create_fields(
+            self, construct, execute, info):
+        """Check command create with lazy info does not run info when only
+        the fields output by create are read
+        """
+        execute.return_value = [
+            {'id': 'foo', 'name': 'bar', 'message': 'Created.'}]
+        Base.command_requires_org = False
+        result = Base.create(lazy_info=True)
+        self.assertEqual('foo', result['id'])
+        self.assertEqual('bar', result.get('name'))
+        self.assertIn('name', result)
+        self.assertFalse(info.called)
+
+    @mock.patch('robottelo.cli.base.Base.info')
+    @mock.patch('robottelo.cli.base.Base.execute')
+    @mock.patch('robottelo.cli.base.Base._construct_command')
+    def test_add_create_lazy_info_missing_field(
+            self, construct, execute, info):
+        """Check command create with lazy info runs info once when a field
+        not output by create is read
+        """
+        execute.return_value = [{'id': 'foo', 'name': 'bar'}]
+        info.return_value = {'id': 'foo', 'name': 'bar', 'label': 'baz'}
+        Base.command_requires_org = True
+        result = Base.create({'organization-id': 'org-id'}, lazy_info=True)
+        self.assertFalse(info.called)
+        self.assertEqual('baz', result['label'])
+        self.assertIsNone(result.get('description'))
+        self.assertNotIn('description', result)
+        with self.assertRaises(KeyError):
+            result['description']
+        self.assertEqual(info.return_value, result)
+        info.assert_called_once_with(
+            {'id': 'foo', 'organization-id': 'org-id'})
+
+    @mock.patch('robottelo.cli.base.Base.info')
+    @mock.patch('robottelo.cli.base.Base.execute')
+    @mock.patch('robottelo.cli.base.Base._construct_command')
+    def test_add_create_lazy_info_empty_info(
+            self, construct, execute, info):
+        """Check command create with lazy info keeps the create fields when
+        info returns nothing
+        """
+        execute.return_value = [{'id': 'foo', 'name': 'bar'}]
+        info.return_value = {}
+        Base.command_requires_org = False
+        result = Base.create(lazy_info=True)
+        self.assertEqual({'id': 'foo', 'name': 'bar'}, result)
+        info.assert_called_once_with({'id': 'foo'})
+
     def assert_cmd_execution(
             self, construct, execute, base_method, cmd_sub,
             ignore_stderr=False, **base_method_kwargs):
@@ -258,7 +393,7 @@ class BaseCliTestCase(unittest2.TestCase):
             execute.return_value,
             base_method(**base_method_kwargs)
         )
-        self.assertEqual(cmd_sub, Base.command_sub)
+        self.assertEqual(cmd_sub, construct.call_args[0][0])
         construct.called_once_with({})
         execute.called_once_with(
             construct.return_value, ignore_stderr=ignore_stderr
@@ -290,6 +425,8 @@ class BaseCliTestCase(unittest2.TestCase):
         """Check excuted build ssh method and returns raw response"""
         settings.locale = 'en_US'
         settings.performance = False
+        settings.hammer.shell = False
+        settings.hammer.sessions = False
         settings.server.admin_username = 'admin'
         settings.server.admin_password = 'password'
         response = Base.execute('some_cmd', return_raw_response=True)
@@ -302,6 +439,52 @@ class BaseCliTestCase(unittest2.TestCase):
         )
         self.assertIs(response, command.return_value)
 
+    @mock.patch('robottelo.cli.base.hammer_shell.get_hammer_shell')
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_execute_in_hammer_shell(self, settings, command, get_shell):
+        """Check execute runs the command in the resident hammer process"""
+        settings.locale = 'en_US'
+        settings.performance = False
+        settings.hammer.shell = True
+        settings.hammer.sessions = False
+        settings.server.admin_username = 'admin'
+        settings.server.admin_password = 'password'
+        response = Base.execute(
+            'some_cmd', output_format='csv', return_raw_response=True)
+        get_shell.return_value.run.assert_called_once_with(
+            u'-v -u admin -p password --output=csv some_cmd',
+            env={u'LANG': 'en_US'},
+            output_format='csv',
+            timeout=None,
+        )
+        self.assertIs(response, get_shell.return_value.run.return_value)
+        command.assert_not_called()
+
+    @mock.patch('robottelo.cli.base.hammer_shell.get_hammer_shell')
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_execute_hammer_shell_fallback(self, settings, command, get_shell):
+        """Check execute runs a new hammer process if the resident one can not
+        be started
+        """
+        settings.locale = 'en_US'
+        settings.performance = False
+        settings.hammer.shell = True
+        settings.hammer.sessions = False
+        settings.server.admin_username = 'admin'
+        settings.server.admin_password = 'password'
+        get_shell.side_effect = HammerShellError('no ruby')
+        response = Base.execute('some_cmd', return_raw_response=True)
+        command.assert_called_once_with(
+            u'LANG=en_US  hammer -v -u admin -p password  some_cmd'.encode(
+                'utf-8'),
+            output_format=None,
+            timeout=None,
+            connection_timeout=None
+        )
+        self.assertIs(response, command.return_value)
+
     @mock.patch('robottelo.cli.base.Base._handle_response')
     @mock.patch('robottelo.cli.base.ssh.command')
     @mock.patch('robottelo.cli.base.settings')
@@ -309,6 +492,7 @@ class BaseCliTestCase(unittest2.TestCase):
         """Check excuted build ssh method and delegate response handling"""
         settings.locale = 'en_US'
         settings.performance.timer_hammer = True
+        settings.hammer.sessions = False
         settings.server.admin_username = 'admin'
         settings.server.admin_password = 'password'
         response = Base.execute('some_cmd', output_format='json')
@@ -324,10 +508,292 @@ class BaseCliTestCase(unittest2.TestCase):
         )
         handle_resp.assert_called_once_with(
             command.return_value,
-            ignore_stderr=None
+            ignore_stderr=None,
+            command='some_cmd',
         )
         self.assertIs(response, handle_resp.return_value)
 
+    @mock.patch('robottelo.cli.base.hammer_session.get_hammer_session')
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_execute_in_hammer_session(self, settings, command, get_session):
+        """Check execute runs the command in the user hammer session"""
+        settings.locale = 'en_US'
+        settings.performance = False
+        settings.hammer.shell = False
+        settings.hammer.sessions = True
+        settings.server.admin_username = 'admin'
+        settings.server.admin_password = 'password'
+        get_session.return_value.env = {u'HOME': u'/sessions/admin'}
+        get_session.return_value.check = u'check;'
+        command.return_value = SSHCommandResult(u'', u'', 0)
+        response = Base.execute('some_cmd', return_raw_response=True)
+        get_session.assert_called_once_with('admin', 'password')
+        command.assert_called_once_with(
+            u'check; LANG=en_US HOME=/sessions/admin  hammer -v '
+            u'--interactive no  some_cmd'.encode('utf-8'),
+            output_format=None,
+            timeout=None,
+            connection_timeout=None
+        )
+        self.assertIs(response, command.return_value)
+
+    @mock.patch('robottelo.cli.base.hammer_session.get_hammer_session')
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_execute_hammer_session_expired(
+            self, settings, command, get_session):
+        """Check execute logs in again and runs the command once more when
+        the session is not accepted
+        """
+        settings.performance = False
+        settings.hammer.shell = False
+        settings.hammer.sessions = True
+        session = get_session.return_value
+        session.env = {u'HOME': u'/sessions/admin'}
+        expired = SSHCommandResult(
+            u'', u'Session has expired, please run hammer auth login', 129)
+        command.side_effect = [expired, SSHCommandResult(u'', u'', 0)]
+        response = Base.execute('some_cmd', return_raw_response=True)
+        session.invalidate.assert_called_once_with()
+        session.login.assert_called_once_with()
+        self.assertEqual(command.call_count, 2)
+        self.assertEqual(response.return_code, 0)
+
+    @mock.patch('robottelo.cli.base.hammer_session.get_hammer_session')
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_execute_hammer_session_login_error(
+            self, settings, command, get_session):
+        """Check execute passes the credentials when the user can not log in
+        a hammer session
+        """
+        settings.locale = 'en_US'
+        settings.performance = False
+        settings.hammer.shell = False
+        settings.hammer.sessions = True
+        session = get_session.return_value
+        session.env = {u'HOME': u'/sessions/admin'}
+        session.check = u'check;'
+        session.login.side_effect = HammerSessionError('invalid')
+        command.side_effect = [
+            SSHCommandResult(u'', u'Missing credentials', 1),
+            SSHCommandResult(u'', u'Invalid username or password', 129),
+        ]
+        response = Base.execute(
+            'some_cmd', user='admin', password='password',
+            return_raw_response=True
+        )
+        self.assertEqual(response.stderr, u'Invalid username or password')
+        command.assert_called_with(
+            u'LANG=en_US  hammer -v -u admin -p password  some_cmd'.encode(
+                'utf-8'),
+            output_format=None,
+            timeout=None,
+            connection_timeout=None
+        )
+
+    @mock.patch('robottelo.cli.base.hammer_timings.record')
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_execute_records_hammer_timings(self, settings, command, record):
+        """The ``time -p`` output is recorded and removed from stderr"""
+        settings.performance.time_hammer = True
+        settings.hammer.sessions = False
+        command.return_value = SSHCommandResult(
+            u'', u'warning\nreal 1.50\nuser 0.80\nsys 0.10\n', 0)
+        response = Base.execute('org info --id="1"', return_raw_response=True)
+        self.assertEqual(response.stderr, u'warning\n')
+        record.assert_called_once_with(
+            'org info --id="1"',
+            mock.ANY,
+            {'real': 1.5, 'user': 0.8, 'sys': 0.1},
+        )
+
+    @mock.patch('robottelo.cli.base.Base.execute')
+    def test_run_many(self, execute):
+        """Check run_many runs each call with its own options and returns the
+        results in order
+        """
+        execute.side_effect = lambda command, **kwargs: command
+
+        class BaseCommand(Base):
+            command_base = 'basecommand'
+            command_requires_org = False
+
+        results = BaseCommand.run_many([
+            ('delete', {'id': 1}),
+            (BaseCommand.dump, {'id': 2}),
+            (BaseCommand.list, {'id': 3}, {'per_page': False}),
+        ])
+        self.assertEqual(
+            [
+                u'basecommand delete --id="1"',
+                u'basecommand dump --id="2"',
+                u'basecommand list --id="3"',
+            ],
+            results
+        )
+        self.assertEqual([], Base.run_many([]))
+
+    @mock.patch('robottelo.cli.base.Base.execute')
+    def test_run_many_error(self, execute):
+        """Check run_many raises the first error once all calls are done"""
+        def fake_execute(command, **kwargs):
+            if 'fail' in command:
+                raise CLIReturnCodeError(1, u'error', command)
+            return command
+        execute.side_effect = fake_execute
+        with self.assertRaises(CLIReturnCodeError) as context:
+            Base.run_many([
+                ('delete', {'id': 1}),
+                ('delete', {'id': 'fail1'}),
+                ('delete', {'id': 'fail2'}),
+                ('dump', {'id': 4}),
+            ])
+        self.assertIn('fail1', context.exception.msg)
+        self.assertEqual(4, execute.call_count)
+
+    @mock.patch('robottelo.cli.base.ssh.command_batch')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_execute_batch(self, settings, command_batch):
+        """Check execute_batch runs the commands in one batch and returns
+        their parsed output or their error
+        """
+        settings.locale = 'en_US'
+        settings.hammer.sessions = False
+        settings.hammer.compact_rows = False
+        settings.hammer.read_cache = False
+        settings.hammer.validate_options = False
+        settings.server.admin_username = 'admin'
+        settings.server.admin_password = 'password'
+        command_batch.return_value = [
+            SSHCommandResult(u'Message,Id\nCreated,1', u'', 0, 'plain'),
+            SSHCommandResult(u'', u'Not found', 65, 'plain'),
+            SSHCommandResult(u'Id: 2', u'', 0, 'plain'),
+        ]
+
+        class BaseCommand(Base):
+            command_base = 'basecommand'
+
+        class OtherCommand(Base):
+            command_base = 'othercommand'
+
+        results = BaseCommand.execute_batch([
+            ('create', {'name': 'first'}),
+            (OtherCommand, 'delete', {'id': 1}),
+            (BaseCommand, 'info', {'id': 2}, None),
+        ])
+        command_batch.assert_called_once_with(
+            [
+                u'LANG=en_US  hammer -v -u admin -p password --output=csv '
+                u'basecommand create --name="first"',
+                u'LANG=en_US  hammer -v -u admin -p password --output=csv '
+                u'othercommand delete --id="1"',
+                u'LANG=en_US  hammer -v -u admin -p password  '
+                u'basecommand info --id="2"',
+            ],
+            output_format='plain',
+            timeout=None,
+            connection_timeout=None,
+            stop_on_failure=False,
+        )
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0], [{u'message': u'Created', u'id': u'1'}])
+        self.assertIsInstance(results[1], CLIReturnCodeError)
+        self.assertEqual(results[1].return_code, 65)
+        self.assertIn(u'othercommand delete', results[1].msg)
+        self.assertEqual(results[2], [u'Id: 2'])
+
+    @mock.patch('robottelo.cli.base.hammer_session.get_hammer_session')
+    @mock.patch('robottelo.cli.base.ssh.command_batch')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_execute_batch_session_expired(
+            self, settings, command_batch, get_session):
+        """Check execute_batch logs in again and runs the commands which were
+        not authenticated
+        """
+        settings.locale = 'en_US'
+        settings.hammer.sessions = True
+        settings.hammer.read_cache = False
+        settings.hammer.validate_options = False
+        session = get_session.return_value
+        session.env = {u'HOME': u'/sessions/admin'}
+        command_batch.side_effect = [
+            [
+                SSHCommandResult(u'', u'', 0, 'plain'),
+                SSHCommandResult(u'', u'Session has expired', 129, 'plain'),
+                SSHCommandResult(u'', u'Session has expired', 129, 'plain'),
+            ],
+            [
+                SSHCommandResult(u'', u'', 0, 'plain'),
+                SSHCommandResult(u'', u'', 0, 'plain'),
+            ],
+        ]
+        results = Base.execute_batch(
+            [('delete', {'id': 1}), ('delete', {'id': 2}),
+             ('delete', {'id': 3})],
+            output_format=None
+        )
+        session.login.assert_called_once_with()
+        self.assertEqual(command_batch.call_count, 2)
+        self.assertEqual(
+            len(command_batch.call_args_list[1][0][0]), 2)
+        self.assertEqual(results, [u'', u'', u''])
+
+    @mock.patch('robottelo.cli.base.settings')
+    @mock.patch('robottelo.cli.base.Base.execute')
+    def test_run_many_concurrent_subcommands(self, execute, settings):
+        """Check concurrent calls of different subcommands and classes each
+        run their own subcommand
+        """
+        settings.ssh_client.max_workers = 16
+        settings.hammer.validate_options = False
+        lock = threading.Lock()
+        running = [0, 0]
+
+        def fake_execute(command, **kwargs):
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            # let the other threads build their commands meanwhile
+            time.sleep(random.random() / 100)
+            with lock:
+                running[0] -= 1
+            return command
+
+        execute.side_effect = fake_execute
+        classes = [
+            type('Command{0}'.format(index), (Base,), {
+                'command_base': 'command{0}'.format(index)})
+            for index in range(4)
+        ]
+        subcommands = [
+            ('delete', 'delete'),
+            ('delete_parameter', 'delete-parameter'),
+            ('dump', 'dump'),
+            ('set_parameter', 'set-parameter'),
+            ('add_operating_system', 'add-operatingsystem'),
+            ('remove_operating_system', 'remove-operatingsystem'),
+        ]
+        calls = [
+            (getattr(classes[index % 4], subcommands[index % 6][0]),
+             {'id': index})
+            for index in range(240)
+        ]
+        results = Base.run_many(calls)
+        self.assertEqual(240, execute.call_count)
+        self.assertGreater(running[1], 1)
+        for index, result in enumerate(results):
+            self.assertEqual(
+                u'command{0} {1} --id="{2}"'.format(
+                    index % 4,
+                    subcommands[index % 6][1],
+                    index
+                ),
+                result
+            )
+
     @mock.patch('robottelo.cli.base.Base.list')
     def test_exists_without_option_and_empty_return(self, lst_method):
         """Check exists method without options and empty return"""
@@ -397,7 +863,7 @@ class BaseCliTestCase(unittest2.TestCase):
             execute.return_value,
             Base.list(options={'organization-id': 1})
         )
-        self.assertEqual('list', Base.command_sub)
+        self.assertEqual('list', construct.call_args[0][0])
         construct.called_once_with({'per-page': 1000})
         execute.called_once_with(construct.return_value, output_format='csv')
 
@@ -417,6 +883,95 @@ class BaseCliTestCase(unittest2.TestCase):
             'list',
         )
 
+    def test_add_fields(self):
+        """Check _add_fields sets the fields option on a copy of options"""
+        options = {u'id': 1}
+        self.assertIs(options, Base._add_fields(options))
+        self.assertEqual({}, Base._add_fields())
+        self.assertEqual(
+            {u'id': 1, u'fields': u'Id,Name'},
+            Base._add_fields(options, [u'Id', u'Name'])
+        )
+        self.assertEqual(
+            {u'id': 1, u'fields': u'THIN'}, Base._add_fields(options, u'THIN'))
+        self.assertEqual({u'id': 1}, options)
+
+    @mock.patch('robottelo.cli.base.Base.execute')
+    def test_info_fields(self, execute):
+        """Check info only asks hammer for the given fields"""
+        execute.return_value = [u'Id: 1']
+        Base.command_base = 'basecommand'
+        Base.command_requires_org = False
+        self.assertEqual(
+            {u'id': u'1'}, Base.info({u'id': 1}, fields=[u'Id']))
+        self.assertEqual(
+            u'basecommand info --id="1" --fields="Id"',
+            execute.call_args[1]['command']
+        )
+
+    @mock.patch('robottelo.cli.base.Base.execute')
+    def test_list_fields(self, execute):
+        """Check list only asks hammer for the given fields"""
+        Base.command_base = 'basecommand'
+        Base.command_requires_org = False
+        self.assertEqual(
+            execute.return_value,
+            Base.list(per_page=False, fields=[u'Id', u'Name'])
+        )
+        execute.assert_called_once_with(
+            u'basecommand list --fields="Id,Name"', output_format='csv')
+
+    @mock.patch('robottelo.cli.base.Base.list')
+    def test_exists_fields(self, lst_method):
+        """Check exists passes the fields to list"""
+        lst_method.return_value = [{u'id': u'1'}]
+        self.assertEqual(
+            {u'id': u'1'},
+            Base.exists(search=['name', 'foo'], fields=[u'Id'])
+        )
+        lst_method.assert_called_once_with(
+            {u'search': u'name=\\"foo\\"', u'fields': u'Id'})
+
+    @mock.patch('robottelo.cli.base.Base.list')
+    def test_iter_list_pages(self, lst_method):
+        """Check iter_list reads the pages until a partial one"""
+        lst_method.side_effect = [[1, 2], [3, 4], [5]]
+        options = {u'search': u'foo=bar'}
+        self.assertEqual(
+            [1, 2, 3, 4, 5], list(Base.iter_list(options, page_size=2)))
+        self.assertEqual(
+            [
+                mock.call({u'search': u'foo=bar', u'page': page,
+                           u'per-page': 2}, per_page=False)
+                for page in (1, 2, 3)
+            ],
+            lst_method.call_args_list
+        )
+        self.assertEqual({u'search': u'foo=bar'}, options)
+
+    @mock.patch('robottelo.cli.base.Base.list')
+    def test_iter_list_stops_early(self, lst_method):
+        """Check iter_list does not read the next pages when the iteration
+        stops
+        """
+        lst_method.side_effect = [[1, 2], [3, 4], [5]]
+        entities = Base.iter_list(page_size=2)
+        self.assertEqual(1, next(entities))
+        self.assertEqual(2, next(entities))
+        lst_method.assert_called_once_with(
+            {u'page': 1, u'per-page': 2}, per_page=False)
+
+    @mock.patch('robottelo.cli.base.Base.list')
+    def test_iter_list_last_page_full(self, lst_method):
+        """Check iter_list stops on an empty page or a repeated page"""
+        lst_method.side_effect = [[1, 2], []]
+        self.assertEqual([1, 2], list(Base.iter_list(page_size=2)))
+        lst_method.reset_mock()
+        lst_method.side_effect = None
+        lst_method.return_value = [1, 2]
+        self.assertEqual([1, 2], list(Base.iter_list(page_size=2)))
+        self.assertEqual(2, lst_method.call_count)
+
     @mock.patch('robottelo.cli.base.Base.execute')
     @mock.patch('robottelo.cli.base.Base._construct_command')
     def test_puppet_classes(self, construct, execute):
@@ -473,6 +1028,123 @@ class BaseCliTestCase(unittest2.TestCase):
         )
 
 
+class CachedCommand(Base):
+    """Class used for the read cache tests"""
+    command_base = 'cached'
+    command_requires_org = False
+
+
+class OtherCachedCommand(Base):
+    """Class used for the read cache tests"""
+    command_base = 'other'
+    command_requires_org = False
+
+
+class ReadCacheTestCase(unittest2.TestCase):
+    """Tests for the info and list read cache"""
+
+    def setUp(self):
+        clear_read_cache()
+        settings_patcher = mock.patch('robottelo.cli.base.settings')
+        self.settings = settings_patcher.start()
+        self.addCleanup(settings_patcher.stop)
+        self.settings.performance = False
+        self.settings.hammer.shell = False
+        self.settings.hammer.sessions = False
+        self.settings.hammer.read_cache = True
+        self.settings.hammer.validate_options = False
+        command_patcher = mock.patch('robottelo.cli.base.ssh.command')
+        self.command = command_patcher.start()
+        self.addCleanup(command_patcher.stop)
+        self.command.side_effect = self.run_command
+        self.addCleanup(clear_read_cache)
+
+    def run_command(self, cmd, output_format=None, **kwargs):
+        """Answer the info and list commands like hammer would."""
+        response = mock.Mock(return_code=0, stderr=u'')
+        if output_format == 'csv':
+            response.stdout = [{u'id': u'1', u'name': u'foo'}]
+        else:
+            response.stdout = [u'Id: 1', u'Name: foo']
+        return response
+
+    def test_info_cached(self):
+        """Check info is only run once and returns copies of its result"""
+        stats = read_cache_stats()
+        result = CachedCommand.info({u'id': 1})
+        result[u'name'] = u'changed'
+        self.assertEqual(
+            {u'id': u'1', u'name': u'foo'}, CachedCommand.info({u'id': 1}))
+        self.assertEqual(1, self.command.call_count)
+        new_stats = read_cache_stats()
+        self.assertEqual(stats['hits'] + 1, new_stats['hits'])
+        self.assertEqual(stats['misses'] + 1, new_stats['misses'])
+        self.assertGreater(new_stats['hit_rate'], 0)
+
+    def test_cache_key(self):
+        """Check the options, the output format and the credentials are part
+        of the cache key
+        """
+        CachedCommand.list()
+        CachedCommand.list({u'search': u'name=foo'})
+        CachedCommand.info({u'id': 1})
+        CachedCommand.info({u'id': 1}, output_format='json')
+        CachedCommand.with_user(u'user', u'pass').info({u'id': 1})
+        self.assertEqual(5, self.command.call_count)
+        CachedCommand.list({u'search': u'name=foo'})
+        CachedCommand.with_user(u'user', u'pass').info({u'id': 1})
+        self.assertEqual(5, self.command.call_count)
+
+    def test_invalidation(self):
+        """Check other subcommands only invalidate their command results"""
+        CachedCommand.info({u'id': 1})
+        OtherCachedCommand.info({u'id': 1})
+        CachedCommand.list()
+        stats = read_cache_stats()
+        CachedCommand.update({u'id': 1, u'name': u'bar'})
+        self.assertEqual(
+            stats['invalidations'] + 1,
+            read_cache_stats()['invalidations']
+        )
+        self.command.reset_mock()
+        CachedCommand.info({u'id': 1})
+        CachedCommand.list()
+        OtherCachedCommand.info({u'id': 1})
+        self.assertEqual(2, self.command.call_count)
+
+    def test_invalidation_on_error(self):
+        """Check a failed subcommand still invalidates the results"""
+        CachedCommand.info({u'id': 1})
+        self.command.side_effect = [
+            mock.Mock(return_code=1, stderr=u'error', stdout=[])]
+        with self.assertRaises(CLIReturnCodeError):
+            CachedCommand.delete({u'id': 1})
+        self.command.side_effect = self.run_command
+        self.command.reset_mock()
+        CachedCommand.info({u'id': 1})
+        self.assertEqual(1, self.command.call_count)
+
+    def test_read_subcommands_keep_cache(self):
+        """Check info and list subcommands of nested commands and other
+        command lines keep or drop the cached results
+        """
+        CachedCommand.info({u'id': 1})
+        CachedCommand.execute(u'cached version info --id="1"')
+        CachedCommand.execute(u'cached errata list')
+        CachedCommand.info({u'id': 1})
+        self.assertEqual(3, self.command.call_count)
+        CachedCommand.execute(u'other update --id="1"')
+        CachedCommand.info({u'id': 1})
+        self.assertEqual(5, self.command.call_count)
+
+    def test_disabled(self):
+        """Check nothing is cached when the cache is not enabled"""
+        self.settings.hammer.read_cache = False
+        CachedCommand.info({u'id': 1})
+        CachedCommand.info({u'id': 1})
+        self.assertEqual(2, self.command.call_count)
+
+
 class CLIErrorTests(unittest2.TestCase):
     """Tests for the CLIError cli class"""
 
@@ -0,0 +1,207 @@
+# coding: utf-8
+import multiprocessing
+import os
+import shutil
+import socket
+import tempfile
+import uuid
+
+from unittest2 import TestCase
+
+from robottelo.decorators.func_shared.file_storage import FileStorageHandler
+from robottelo.decorators.func_shared.pool import POOL_SCOPE_ENV, SharedPool
+
+
+class EntityFactory(object):
+    """Create and destroy entities with a unique id"""
+
+    def __init__(self):
+        self.batches = []
+        self.destroyed = []
+
+    def create_batch(self, count):
+        batch = [{'id': uuid.uuid4().hex} for _ in range(count)]
+        self.batches.append(batch)
+        return batch
+
+    def destroy(self, entities):
+        self.destroyed.extend(entities)
+
+
+def _lease_entities(root_dir, count, queue):
+    """Lease ``count`` entities and put their ids in ``queue``"""
+    factory = EntityFactory()
+    pool = SharedPool('entity', factory.create_batch, factory.destroy, 2,
+                      storage_handler=FileStorageHandler(root_dir=root_dir))
+    ids = []
+    for _ in range(count):
+        ids.append(pool.lease()['id'])
+        pool.refill_if_needed()
+    queue.put(ids)
+
+
+class SharedPoolTestCase(TestCase):
+
+    def setUp(self):
+        self.root_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root_dir)
+        os.environ[POOL_SCOPE_ENV] = 'test_pool_{0}'.format(os.getpid())
+        self.addCleanup(os.environ.pop, POOL_SCOPE_ENV)
+        self.factory = EntityFactory()
+        self.pool = SharedPool(
+            'entity',
+            self.factory.create_batch,
+            self.factory.destroy,
+            2,
+            storage_handler=FileStorageHandler(root_dir=self.root_dir)
+        )
+
+    def test_key(self):
+        """The pool is stored under the scope of the run"""
+        self.assertEqual(
+            self.pool.key,
+            'test_pool_{0}.shared_function.pool.entity'.format(os.getpid())
+        )
+
+    def test_lease(self):
+        """An entity is created when the pool is empty, the free ones are
+        leased first
+        """
+        first = self.pool.lease()
+        self.assertEqual(self.factory.batches, [[first]])
+        state = self.pool.state()
+        self.assertEqual(state['free'], [])
+        self.assertIsNone(state['refill'])
+        self.pool.refill()
+        free = self.pool.state()['free']
+        second = self.pool.lease()
+        self.assertEqual(second, free[0])
+        state = self.pool.state()
+        self.assertEqual(state['free'], free[1:])
+        self.assertEqual(
+            [lease['entity'] for lease in state['leased']], [first, second])
+        self.assertEqual(state['leased'][0]['pid'], os.getpid())
+        self.assertEqual(
+            state['leased'][0]['worker'],
+            os.environ.get('PYTEST_XDIST_WORKER', 'master')
+        )
+
+    def test_refill_if_needed(self):
+        """A batch is created once the pool was leased from and less than
+        ``size`` entities are free
+        """
+        self.assertFalse(self.pool.refill_if_needed())
+        self.assertEqual(self.factory.batches, [])
+        self.pool.lease()
+        self.assertTrue(self.pool.refill_if_needed())
+        self.assertEqual(len(self.pool.state()['free']), 2)
+        self.assertFalse(self.pool.refill_if_needed())
+        self.pool.lease()
+        self.assertTrue(self.pool.refill_if_needed())
+        state = self.pool.state()
+        self.assertEqual(len(state['free']), 3)
+        self.assertIsNone(state['refill'])
+
+    def test_refill_stores_each_entity(self):
+        """Each entity is stored in the pool once created, before the batch
+        is done
+        """
+        stored = []
+
+        def create_batch(count):
+            for entity in self.factory.create_batch(count):
+                yield entity
+                stored.append(list(self.pool.state()['free']))
+
+        self.pool.create_batch = create_batch
+        self.pool.refill()
+        batch = self.factory.batches[0]
+        self.assertEqual(stored, [batch[:1], batch])
+
+    def test_single_refill(self):
+        """No batch is created while an other process creates one"""
+        self.pool.lease()
+        self.pool._update(lambda state: state.update(
+            refill={'pid': 0, 'started_at': '2100-01-01T00:00:00'}))
+        self.assertFalse(self.pool.refill_if_needed())
+        self.assertEqual(len(self.factory.batches), 1)
+        self.assertEqual(self.pool.state()['free'], [])
+
+    def test_refill_error(self):
+        """A failed batch creation lets the next test start a new one"""
+        self.pool.create_batch = lambda count: 1 / 0
+        self.pool.refill()
+        state = self.pool.state()
+        self.assertEqual(state['free'], [])
+        self.assertIsNone(state['refill'])
+
+    def test_partial_batch(self):
+        """The entities created before a batch creation failed are kept and
+        destroyed with the others
+        """
+        def create_batch(count):
+            for entity in self.factory.create_batch(1):
+                yield entity
+            raise ValueError('no route to host')
+
+        self.pool.create_batch = create_batch
+        self.pool.refill()
+        state = self.pool.state()
+        self.assertEqual(state['free'], self.factory.batches[0])
+        self.assertIsNone(state['refill'])
+        self.assertEqual(self.pool.finish(), 1)
+        self.assertEqual(self.factory.destroyed, self.factory.batches[0])
+
+    def test_dead_refill(self):
+        """A refill of a process which is not running is started again"""
+        process = multiprocessing.Process(target=os.getpid)
+        process.start()
+        process.join()
+        self.pool._update(lambda state: state.update(refill={
+            'host': socket.gethostname(),
+            'pid': process.pid,
+            'started_at': '2100-01-01T00:00:00',
+        }))
+        self.pool.lease()
+        self.assertTrue(self.pool.refill_if_needed())
+        self.assertEqual(
+            sorted(len(batch) for batch in self.factory.batches), [1, 2])
+        self.assertEqual(len(self.pool.state()['free']), 2)
+
+    def test_finish(self):
+        """The leased entities are destroyed, the free ones unless they are
+        recycled
+        """
+        leased = self.pool.lease()
+        self.pool.refill_if_needed()
+        free = self.pool.state()['free']
+        self.assertEqual(self.pool.finish(recycle=True), 1)
+        self.assertEqual(self.factory.destroyed, [leased])
+        self.assertEqual(self.pool.state()['free'], free)
+        self.assertEqual(self.pool.finish(), 2)
+        self.assertEqual(self.factory.destroyed, [leased] + free)
+        self.assertEqual(
+            self.pool.state(), {'free': [], 'leased': [], 'refill': None})
+
+    def test_lease_multiprocess(self):
+        """The processes share the pool and never lease the same entity"""
+        queue = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(
+                target=_lease_entities, args=(self.root_dir, 3, queue))
+            for _ in range(4)
+        ]
+        for process in processes:
+            process.start()
+        ids = []
+        for _ in processes:
+            ids.extend(queue.get(timeout=60))
+        for process in processes:
+            process.join()
+        self.assertEqual(len(ids), 12)
+        self.assertEqual(len(set(ids)), 12)
+        state = self.pool.state()
+        self.assertEqual(
+            sorted(lease['entity']['id'] for lease in state['leased']),
+            sorted(ids)
+        )
@@ -1,9 +1,18 @@
 # -*- encoding: utf-8 -*-
 """Tests for Robottelo's hammer helpers"""
+import copy
+import glob
+import io
+import json
+import os
+import pickle
 import unittest2
 
 from robottelo.cli import hammer
 
+INFO_CORPUS_DIR = os.path.join(
+    os.path.dirname(__file__), 'data', 'hammer_info')
+
 
 class ParseCSVTestCase(unittest2.TestCase):
     """Tests for parsing CSV hammer output"""
@@ -39,6 +48,71 @@ class ParseCSVTestCase(unittest2.TestCase):
         )
 
 
+class ParseCompactCSVTestCase(unittest2.TestCase):
+    """Tests for parsing CSV hammer output as a compact result"""
+
+    output_lines = [
+        u'ID,Name,Description',
+        u'1,first,first entity',
+        u'',
+        u'2,second',
+        u'3,unicode,chårs,extra value',
+    ]
+
+    def test_parse_csv_compact(self):
+        """The compact result compares equal to the list of dicts and keeps
+        one header and a tuple per row
+        """
+        result = hammer.parse_csv(self.output_lines, compact=True)
+        self.assertIsInstance(result, hammer.CSVResult)
+        self.assertEqual(result.keys, (u'id', u'name', u'description'))
+        self.assertEqual(
+            result.rows,
+            [
+                (u'1', u'first', u'first entity'),
+                (u'2', u'second'),
+                (u'3', u'unicode', u'chårs'),
+            ]
+        )
+        self.assertEqual(result, hammer.parse_csv(self.output_lines))
+        self.assertEqual(
+            result.to_dicts(), hammer.parse_csv(self.output_lines))
+
+    def test_read_compact_rows(self):
+        """The compact rows are read like dicts"""
+        result = hammer.parse_csv(self.output_lines, compact=True)
+        self.assertEqual(len(result), 3)
+        self.assertEqual(result[0][u'name'], u'first')
+        self.assertEqual(result[-1][u'description'], u'chårs')
+        self.assertEqual([row[u'id'] for row in result], [u'1', u'2', u'3'])
+        self.assertEqual(result[1], {u'id': u'2', u'name': u'second'})
+        self.assertNotIn(u'description', result[1])
+        self.assertIsNone(result[1].get(u'description'))
+        with self.assertRaises(KeyError):
+            result[1][u'description']
+        self.assertEqual(
+            result[1].to_dict(), {u'id': u'2', u'name': u'second'})
+        self.assertEqual(dict(result[0]), result[0].to_dict())
+        self.assertEqual(
+            result[1:], [{u'id': u'2', u'name': u'second'}, result[2]])
+        self.assertIsInstance(result[1:], hammer.CSVResult)
+
+    def test_parse_csv_compact_duplicated_header(self):
+        """The last column of a repeated header is kept, like in a dict"""
+        output_lines = [u'Name,ID,Name', u'first,1,other']
+        result = hammer.parse_csv(output_lines, compact=True)
+        self.assertEqual(result.keys, (u'id', u'name'))
+        self.assertEqual(result, hammer.parse_csv(output_lines))
+
+    def test_copy_compact_result(self):
+        """A copy of the compact result shares its rows"""
+        result = hammer.parse_csv(self.output_lines, compact=True)
+        result_copy = copy.deepcopy(result)
+        self.assertEqual(result_copy, result)
+        self.assertIs(result_copy.rows[0], result.rows[0])
+        self.assertEqual(pickle.loads(pickle.dumps(result)), result)
+
+
 class ParseJSONTestCase(unittest2.TestCase):
     """Tests for parsing JSON hammer output"""
 
@@ -395,6 +469,46 @@ class ParseInfoTestCase(unittest2.TestCase):
             }
         )
 
+    def test_parse_info_corpus(self):
+        """Can parse the info outputs of the benchmark corpus, each
+        ``<name>.txt`` output is parsed as ``<name>.json``
+        """
+        paths = sorted(glob.glob(os.path.join(INFO_CORPUS_DIR, '*.txt')))
+        self.assertGreater(len(paths), 0)
+        for path in paths:
+            with io.open(path, encoding='utf-8') as handler:
+                output = handler.read().splitlines()
+            with io.open(path[:-4] + '.json', encoding='utf-8') as handler:
+                expected = json.load(handler)
+            self.assertEqual(hammer.parse_info(output), expected, path)
+
+    def test_parse_info_indentation(self):
+        """Can parse info output indented with tabs, which count as 4 spaces,
+        or with less than 4 spaces
+        """
+        output = [
+            'Content Information:',
+            '    Content View:',
+            ' \t\tID:   10',
+            '    Kickstart Repository:',
+            '  Name: ks',
+            'Sync:',
+            '    Errata:',
+            '\t\tId: 3',
+        ]
+        self.assertEqual(
+            hammer.parse_info(output),
+            {
+                'content-information': {
+                    'content-view': {'id': '10'},
+                    'kickstart-repository': '',
+                    'name': 'ks',
+                },
+                'sync': {'errata': ''},
+                'id': '3',
+            }
+        )
+
     def test_parse_json_list(self):
         """Can parse a list in json"""
         self.assertEqual(
@@ -0,0 +1,172 @@
+"""Tests for module ``robottelo.cli.hammer_commands``."""
+import json
+import os
+import shutil
+import tempfile
+
+import six
+import unittest2
+
+from robottelo.cli import hammer_commands
+from robottelo.ssh import SSHCommandResult
+
+if six.PY2:
+    import mock
+else:
+    from unittest import mock
+
+HELP = {
+    u'hammer': (
+        u'Usage:\n'
+        u'    hammer [OPTIONS] SUBCOMMAND [ARG] ...\n'
+        u'\n'
+        u'Subcommands:\n'
+        u' organization                  Manipulate organizations\n'
+        u'\n'
+        u'Options:\n'
+        u' -h, --help                    print help\n'
+    ),
+    u'hammer organization': (
+        u'Usage:\n'
+        u'    hammer organization [OPTIONS] SUBCOMMAND [ARG] ...\n'
+        u'\n'
+        u'Subcommands:\n'
+        u' create                        Create an organization\n'
+        u'\n'
+        u'Options:\n'
+        u' -h, --help                    print help\n'
+    ),
+    u'hammer organization create': (
+        u'Usage:\n'
+        u'    hammer organization create [OPTIONS]\n'
+        u'\n'
+        u'Options:\n'
+        u' --description DESCRIPTION     description\n'
+        u' --label LABEL                 unique label\n'
+        u' --name NAME                   name\n'
+        u' --location-ids, --location-id LOCATION_IDS REPLACE locations\n'
+        u' -h, --help                    print help\n'
+    ),
+}
+
+
+class FakeSession(object):
+    """Answer the help commands from ``HELP``."""
+
+    def __init__(self):
+        self.maps = []
+
+    def map(self, cmds, output_format=None):
+        self.maps.append(cmds)
+        return [
+            SSHCommandResult(HELP[cmd.split(' ', 1)[1][:-7]], u'', 0)
+            for cmd in cmds
+        ]
+
+
+@mock.patch('robottelo.cli.hammer_commands.settings')
+@mock.patch('robottelo.cli.hammer_commands.ssh')
+class HammerCommandsTestCase(unittest2.TestCase):
+    """Tests for the cached hammer command tree."""
+
+    def setUp(self):
+        self.tree_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tree_dir)
+        hammer_commands.clear_command_trees()
+        self.addCleanup(hammer_commands.clear_command_trees)
+
+    def configure(self, ssh, settings):
+        settings.locale = 'en_US'
+        settings.hammer.command_tree_dir = self.tree_dir
+        session = FakeSession()
+        ssh.get_session.return_value.__enter__.return_value = session
+        ssh.command.return_value = SSHCommandResult(
+            u'6.4.2-1.el7sat\n', u'', 0)
+        return session
+
+    def test_parse_command_help_aliases(self, ssh, settings):
+        """The other names of an option are its aliases"""
+        options = hammer_commands.parse_command_help(
+            HELP[u'hammer organization create'].splitlines())['options']
+        self.assertEqual(
+            [(option['name'], option.get('aliases')) for option in options],
+            [(u'description', None), (u'label', None), (u'name', None),
+             (u'location-ids', [u'location-id']), (u'help', None)]
+        )
+
+    def test_crawl_command_tree(self, ssh, settings):
+        """The commands of a level are read at the same time"""
+        session = self.configure(ssh, settings)
+        tree = hammer_commands.crawl_command_tree()
+        self.assertEqual(session.maps, [
+            [u'LANG=en_US hammer --help'],
+            [u'LANG=en_US hammer organization --help'],
+            [u'LANG=en_US hammer organization create --help'],
+        ])
+        organization = tree['subcommands'][0]
+        self.assertEqual(organization['name'], u'organization')
+        self.assertEqual(
+            organization['subcommands'][0]['name'], u'create')
+        self.assertEqual(
+            hammer_commands.index_command_tree(tree),
+            {
+                u'': frozenset([u'help']),
+                u'organization': frozenset([u'help']),
+                u'organization create': frozenset([
+                    u'description', u'label', u'name', u'location-ids',
+                    u'location-id', u'help',
+                ]),
+            }
+        )
+
+    def test_crawl_error(self, ssh, settings):
+        """An error is raised when a help can not be read"""
+        self.configure(ssh, settings)
+        session = ssh.get_session.return_value.__enter__.return_value
+        session.map = lambda cmds, output_format: [
+            SSHCommandResult(u'', u'hammer: command not found', 127)]
+        with self.assertRaises(hammer_commands.HammerCommandTreeError):
+            hammer_commands.crawl_command_tree()
+
+    def test_command_tree_cached_by_version(self, ssh, settings):
+        """The tree is crawled once and stored by server version"""
+        session = self.configure(ssh, settings)
+        tree = hammer_commands.get_command_tree()
+        self.assertEqual(
+            os.listdir(self.tree_dir),
+            ['hammer_commands-6.4.2-1.el7sat.json']
+        )
+        with open(os.path.join(
+                self.tree_dir, 'hammer_commands-6.4.2-1.el7sat.json')) as f:
+            self.assertEqual(json.load(f), tree)
+        hammer_commands.clear_command_trees()
+        self.assertEqual(hammer_commands.get_command_tree(), tree)
+        self.assertEqual(len(session.maps), 3)
+        self.assertEqual(ssh.command.call_count, 2)
+        hammer_commands.remove_command_tree(u'6.4.2-1.el7sat')
+        self.assertEqual(os.listdir(self.tree_dir), [])
+
+    def test_validate(self, ssh, settings):
+        """Unknown commands and options are reported as hammer does"""
+        self.configure(ssh, settings)
+        hammer_commands.validate(
+            u'organization create', [u'name', u'location-id'])
+        self.assertEqual(
+            hammer_commands.unknown_options(
+                u'organization create', [u'name', u'title', u'content']),
+            [u'content', u'title']
+        )
+        with self.assertRaisesRegexp(
+                hammer_commands.HammerCommandError,
+                u"Unrecognised option '--title'"):
+            hammer_commands.validate(
+                u'organization create', [u'name', u'title'])
+        with self.assertRaisesRegexp(
+                hammer_commands.HammerCommandError,
+                u"No such sub-command 'organization remove'"):
+            hammer_commands.validate(u'organization remove', [u'id'])
+
+    def test_validate_normalizes_command(self, ssh, settings):
+        """A subcommand built with extra spaces is found"""
+        self.configure(ssh, settings)
+        hammer_commands.validate(u'organization  create ', [u'name'])
@@ -0,0 +1,101 @@
+"""Tests for module ``robottelo.cli.hammer_session``."""
+import six
+import unittest2
+
+from robottelo.cli import hammer_session
+from robottelo.ssh import SSHCommandResult
+
+if six.PY2:
+    import mock
+else:
+    from unittest import mock
+
+
+@mock.patch('robottelo.cli.hammer_session.settings')
+@mock.patch('robottelo.cli.hammer_session.ssh.command')
+class HammerSessionTestCase(unittest2.TestCase):
+    """Tests for the hammer sessions."""
+
+    def setUp(self):
+        hammer_session.clear_hammer_sessions()
+        self.addCleanup(hammer_session.clear_hammer_sessions)
+
+    def configure(self, settings):
+        settings.locale = 'en_US'
+        settings.server.hostname = 'example.com'
+        settings.hammer.sessions_dir = '/sessions'
+
+    def test_no_login(self, command, settings):
+        """A session is used without logging in, in a home directory by user
+        and password
+        """
+        self.configure(settings)
+        session = hammer_session.get_hammer_session('admin', 'changeme')
+        self.assertIs(
+            hammer_session.get_hammer_session('admin', 'changeme'), session)
+        command.assert_not_called()
+        self.assertFalse(session.logged_in)
+        self.assertTrue(session.home.startswith('/sessions/'))
+        self.assertEqual(session.env, {u'HOME': session.home})
+        self.assertEqual(
+            session.check,
+            u"test -e {0}/.hammer/cli.modules.d/robottelo_sessions.yml || "
+            u"{{ echo 'Missing credentials: no hammer session' >&2; "
+            u"exit 1; }};".format(session.home)
+        )
+        other = hammer_session.get_hammer_session('viewer', 'changeme')
+        self.assertNotEqual(other.home, session.home)
+        new_password = hammer_session.get_hammer_session('admin', 'secret')
+        self.assertIsNot(new_password, session)
+        self.assertNotEqual(new_password.home, session.home)
+
+    def test_login_once(self, command, settings):
+        """A user logs in once, in a home directory moved into place"""
+        self.configure(settings)
+        command.return_value = SSHCommandResult(u'', u'', 0)
+        session = hammer_session.get_hammer_session('admin', 'changeme')
+        session.login()
+        session.login()
+        self.assertEqual(command.call_count, 1)
+        cmd = command.call_args[0][0].decode('utf-8')
+        self.assertIn(
+            u'tmp=$(mktemp -d {0}/.hammer.XXXXXX)'.format(session.home), cmd)
+        self.assertIn(
+            u'mv -T "$tmp" {0}/.hammer'.format(session.home), cmd)
+        self.assertTrue(cmd.endswith(
+            u'LANG=en_US HOME={0} hammer --interactive no auth login '
+            u'--username admin --password changeme'.format(session.home)
+        ))
+        self.assertTrue(session.logged_in)
+
+    def test_login_again(self, command, settings):
+        """A user logs in again after its session is invalidated"""
+        self.configure(settings)
+        command.return_value = SSHCommandResult(u'', u'', 0)
+        session = hammer_session.get_hammer_session('admin', 'changeme')
+        session.login()
+        session.invalidate()
+        session.login()
+        self.assertEqual(command.call_count, 2)
+
+    def test_login_error(self, command, settings):
+        """An error is raised when the user can not log in"""
+        self.configure(settings)
+        command.return_value = SSHCommandResult(
+            u'', u'Invalid username or password', 129)
+        session = hammer_session.get_hammer_session('admin', 'wrong')
+        with self.assertRaises(hammer_session.HammerSessionError):
+            session.login()
+
+    def test_is_auth_error(self, command, settings):
+        """The responses of unauthenticated commands are detected"""
+        for stderr in (hammer_session.NO_SESSION_ERROR,
+                       u'Session has expired',
+                       u'Invalid username or password',
+                       u'Credentials are not configured.'):
+            self.assertTrue(hammer_session.is_auth_error(
+                SSHCommandResult(u'', stderr, 129)))
+        self.assertFalse(hammer_session.is_auth_error(
+            SSHCommandResult(u'', u'Organization not found', 65)))
+        self.assertFalse(hammer_session.is_auth_error(
+            SSHCommandResult(u'', u'Session has expired', 0)))
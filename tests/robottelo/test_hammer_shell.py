@@ -0,0 +1,180 @@
+"""Tests for module ``robottelo.cli.hammer_shell``."""
+import os
+import shutil
+import stat
+import subprocess
+import tempfile
+from distutils.spawn import find_executable
+
+import six
+import unittest2
+
+from robottelo import ssh
+from robottelo.cli import hammer_shell
+
+if six.PY2:
+    import mock
+else:
+    from unittest import mock
+
+#: A fake hammer printing its arguments, it exits with 65 when one of them is
+#: ``fail``.
+FAKE_HAMMER = '''#!/usr/bin/env ruby
+$loaded = ($loaded || 0) + 1
+exit 0 if ARGV == ['--version']
+puts "loaded #{$loaded}"
+puts "lang #{ENV['LANG']}"
+ARGV.each { |arg| puts arg }
+$stderr.puts 'warning' if ARGV.include?('warn')
+exit(ARGV.include?('fail') ? 65 : 0)
+'''
+
+
+class LocalChannel(object):
+    """A ``paramiko.Channel`` running its command in a local process."""
+    def __init__(self, env):
+        self.env = env
+        self.process = None
+
+    def settimeout(self, timeout):
+        """A no-op stub method."""
+
+    def exec_command(self, cmd):
+        self.process = subprocess.Popen(
+            cmd, shell=True, env=self.env, stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+
+    def makefile(self, mode):
+        return self.process.stdin if 'w' in mode else self.process.stdout
+
+    def makefile_stderr(self, mode):
+        return self.process.stderr
+
+
+@unittest2.skipIf(find_executable('ruby') is None, 'ruby is not installed')
+class HammerShellTestCase(unittest2.TestCase):
+    """Tests for class ``robottelo.cli.hammer_shell.HammerShell``."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        hammer = os.path.join(self.tmpdir, 'hammer')
+        with open(hammer, 'w') as handler:
+            handler.write(FAKE_HAMMER)
+        os.chmod(hammer, stat.S_IRWXU)
+        env = dict(os.environ)
+        env['PATH'] = os.pathsep.join([self.tmpdir, env['PATH']])
+        self.channel = LocalChannel(env)
+        self.client = mock.Mock()
+        self.client.get_transport.return_value.open_session.return_value = (
+            self.channel)
+        patcher = mock.patch(
+            'robottelo.cli.hammer_shell.ssh.get_client',
+            return_value=self.client
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        if self.channel.process is not None:
+            self.channel.process.kill()
+            self.channel.process.wait()
+        shutil.rmtree(self.tmpdir)
+
+    def test_run(self):
+        shell = hammer_shell.HammerShell('example.com', timeout=30)
+        result = shell.run(
+            u'-v -u admin -p "pass word" org info --name="a \\"b\\""',
+            env={'LANG': 'en_US'}, timeout=30
+        )
+        self.assertEqual(result.return_code, 0)
+        self.assertEqual(result.stderr, u'')
+        # hammer was loaded once by the resident process
+        self.assertEqual(result.stdout, [
+            u'loaded 2', u'lang en_US', u'-v', u'-u', u'admin', u'-p',
+            u'pass word', u'org', u'info', u'--name=a "b"', u'',
+        ])
+
+    def test_run_failure(self):
+        shell = hammer_shell.HammerShell('example.com', timeout=30)
+        result = shell.run(u'fail warn', timeout=30)
+        self.assertEqual(result.return_code, 65)
+        self.assertEqual(result.stderr, u'warning\n')
+        # commands do not share state
+        result = shell.run(u'info', timeout=30)
+        self.assertEqual(result.return_code, 0)
+        self.assertEqual(result.stdout[0], u'loaded 2')
+
+    def test_closed_shell(self):
+        shell = hammer_shell.HammerShell('example.com', timeout=30)
+        shell.close()
+        self.client.close.assert_called_once_with()
+        with self.assertRaises(hammer_shell.HammerShellError):
+            shell.run(u'info')
+
+    def test_start_failure(self):
+        os.remove(os.path.join(self.tmpdir, 'hammer'))
+        self.channel.env['PATH'] = self.tmpdir
+        with self.assertRaises(hammer_shell.HammerShellError):
+            hammer_shell.HammerShell('example.com', timeout=30)
+        self.client.close.assert_called_once_with()
+
+
+class GetHammerShellTestCase(unittest2.TestCase):
+    """Tests for function ``robottelo.cli.hammer_shell.get_hammer_shell``."""
+
+    def tearDown(self):
+        hammer_shell.close_hammer_shells()
+
+    @mock.patch('robottelo.cli.hammer_shell.HammerShell')
+    def test_shell_is_reused(self, shell_class):
+        shell_class.return_value.closed = False
+        shell = hammer_shell.get_hammer_shell('example.com')
+        self.assertIs(hammer_shell.get_hammer_shell('example.com'), shell)
+        shell_class.assert_called_once_with('example.com')
+
+    @mock.patch('robottelo.cli.hammer_shell.time.time')
+    @mock.patch('robottelo.cli.hammer_shell.HammerShell')
+    def test_start_failure_is_retried_later(self, shell_class, time):
+        shell_class.side_effect = hammer_shell.HammerShellError('no hammer')
+        time.return_value = 1000
+        for _ in range(2):
+            with self.assertRaises(hammer_shell.HammerShellError):
+                hammer_shell.get_hammer_shell('example.com')
+        self.assertEqual(shell_class.call_count, 1)
+        shell_class.side_effect = None
+        shell_class.return_value.closed = False
+        time.return_value = 1000 + hammer_shell.START_RETRY_DELAY
+        self.assertIs(
+            hammer_shell.get_hammer_shell('example.com'),
+            shell_class.return_value
+        )
+        self.assertEqual(shell_class.call_count, 2)
+
+    @mock.patch('robottelo.cli.hammer_shell.os.getpid')
+    @mock.patch('robottelo.cli.hammer_shell.HammerShell')
+    def test_forked_process_starts_its_own_shell(self, shell_class, getpid):
+        shell_class.return_value.closed = False
+        getpid.return_value = 1
+        hammer_shell.get_hammer_shell('example.com')
+        getpid.return_value = 2
+        hammer_shell.get_hammer_shell('example.com')
+        self.assertEqual(shell_class.call_count, 2)
+        shell_class.return_value.close.assert_not_called()
+
+
+class SSHTimeoutTestCase(unittest2.TestCase):
+    """The resident process is closed when a command times out."""
+
+    def test_timeout(self):
+        shell = hammer_shell.HammerShell.__new__(hammer_shell.HammerShell)
+        shell._lock = mock.MagicMock()  # pylint:disable=W0212
+        shell._client = mock.Mock()  # pylint:disable=W0212
+        shell._channel = mock.Mock()  # pylint:disable=W0212
+        shell._stdin = mock.Mock()  # pylint:disable=W0212
+        shell._stdout = mock.Mock()  # pylint:disable=W0212
+        shell._stdout.readline.side_effect = (  # pylint:disable=W0212
+            hammer_shell.socket.timeout())
+        with self.assertRaises(ssh.SSHCommandTimeoutError):
+            shell.run(u'info', timeout=1)
+        self.assertTrue(shell.closed)
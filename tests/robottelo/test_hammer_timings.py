@@ -0,0 +1,140 @@
+"""Tests for module ``robottelo.cli.hammer_timings``."""
+import os
+import shutil
+import tempfile
+
+import six
+import unittest2
+
+from robottelo import ssh
+from robottelo.cli import hammer_timings
+
+if six.PY2:
+    import mock
+else:
+    from unittest import mock
+
+TIME_OUTPUT = u'real 1.50\nuser 0.80\nsys 0.10\n'
+
+
+class SplitTimeOutputTestCase(unittest2.TestCase):
+    """Tests for function ``split_time_output``."""
+
+    def test_split_time_output(self):
+        """The time lines are removed from the stderr"""
+        self.assertEqual(
+            hammer_timings.split_time_output(u'warning\n' + TIME_OUTPUT),
+            ({'real': 1.5, 'user': 0.8, 'sys': 0.1}, u'warning\n')
+        )
+        self.assertEqual(
+            hammer_timings.split_time_output(TIME_OUTPUT),
+            ({'real': 1.5, 'user': 0.8, 'sys': 0.1}, u'')
+        )
+
+    def test_no_time_output(self):
+        """The stderr is kept when it does not end with the time lines"""
+        for stderr in (u'', u'error\n', u'real 1.50\nerror\n',
+                       u'real 1.50\nreal 1.50\nsys 0.10\n'):
+            self.assertEqual(
+                hammer_timings.split_time_output(stderr), (None, stderr))
+
+    def test_split_command(self):
+        """The command base and subcommand are read without the options"""
+        self.assertEqual(
+            hammer_timings.split_command(
+                u'content-view version info --id="1"'),
+            (u'content-view', u'version info')
+        )
+        self.assertEqual(
+            hammer_timings.split_command(u'ping'), (u'ping', u''))
+
+
+class RecordTestCase(unittest2.TestCase):
+    """Tests for recording and reporting the timings."""
+
+    def setUp(self):
+        self.timings_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.timings_dir)
+        patcher = mock.patch.dict(
+            os.environ,
+            {hammer_timings.TIMINGS_DIR_ENV: self.timings_dir}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        hammer_timings.clear_samples()
+        self.addCleanup(hammer_timings.clear_samples)
+
+    def test_record_response(self):
+        """The timings are removed from the response and written to the
+        process samples file
+        """
+        response = ssh.SSHCommandResult(
+            u'', u'warning\n' + TIME_OUTPUT, 0)
+        timings = hammer_timings.record_response(
+            u'org info --id="1"', response, 2.0)
+        self.assertEqual(timings, {'real': 1.5, 'user': 0.8, 'sys': 0.1})
+        self.assertEqual(response.stderr, u'warning\n')
+        self.assertEqual(
+            os.listdir(self.timings_dir), ['{0}.jsonl'.format(os.getpid())])
+        self.assertEqual(
+            hammer_timings.load_samples(),
+            [{
+                u'command_base': u'org',
+                u'command_sub': u'info',
+                u'client': 2.0,
+                u'real': 1.5,
+                u'user': 0.8,
+                u'sys': 0.1,
+            }]
+        )
+
+    def test_load_samples_of_all_processes(self):
+        """The samples files of all the processes are read"""
+        hammer_timings.record(
+            u'org list', 1.0, {'real': 0.5, 'user': 0.2, 'sys': 0.1})
+        with open(os.path.join(self.timings_dir, '0.jsonl'), 'w') as handler:
+            handler.write(
+                '{"command_base": "org", "command_sub": "list", '
+                '"client": 3.0, "real": 2.0, "user": 1.0, "sys": 0.5}\n'
+                '{"command_base": "org", "comm'
+            )
+        self.assertEqual(
+            sorted(sample['client']
+                   for sample in hammer_timings.load_samples()),
+            [1.0, 3.0]
+        )
+
+    def test_summarize(self):
+        """The server and transport times are summarized by command"""
+        for client, real in ((1.0, 0.5), (2.0, 1.0), (4.0, 3.5)):
+            hammer_timings.record(
+                u'org list', client, {'real': real, 'user': 0, 'sys': 0})
+        hammer_timings.record(
+            u'org info', 0.5, {'real': 0.25, 'user': 0, 'sys': 0})
+        summary = hammer_timings.summarize(hammer_timings.load_samples())
+        self.assertEqual(
+            [(base, sub) for base, sub, _ in summary],
+            [(u'org', u'list'), (u'org', u'info')]
+        )
+        stats = summary[0][2]
+        self.assertEqual(stats['count'], 3)
+        self.assertEqual(
+            stats['server'],
+            {'p50': 1.0, 'p95': 3.5, 'max': 3.5, 'total': 5.0}
+        )
+        self.assertEqual(
+            stats['transport'],
+            {'p50': 0.5, 'p95': 1.0, 'max': 1.0, 'total': 2.0}
+        )
+        lines = hammer_timings.report()
+        self.assertEqual(len(lines), 4)
+        self.assertIn(u'org list', lines[1])
+        self.assertIn(u'1.00/3.50/3.50s', lines[1])
+        self.assertEqual(
+            lines[-1],
+            u'4 hammer commands, 5.25s server time, 2.25s transport time'
+        )
+
+    def test_report_without_samples(self):
+        """There is nothing to report without samples"""
+        self.assertEqual(hammer_timings.report(), [])
@@ -2,8 +2,10 @@
 # (Too many public methods) pylint: disable=R0904
 import six
 import unittest2
+from robottelo.cli.base import CLIReturnCodeError
 from robottelo.helpers import (
     HostInfoError,
+    create_repo,
     escape_search,
     get_host_info,
     get_server_version,
@@ -95,6 +97,39 @@ class FakeSSHResult(object):
         self.return_code = return_code
 
 
+class CreateRepoTestCase(unittest2.TestCase):
+    """Tests for method ``create_repo``."""
+    @mock.patch('robottelo.helpers.settings')
+    @mock.patch('robottelo.helpers.ssh')
+    def test_single_round_trip(self, ssh, settings):
+        """create_repo runs all its commands in one batch"""
+        settings.server.hostname = 'example.com'
+        settings.server.port = None
+        ssh.command_batch.return_value = [FakeSSHResult([], 0)] * 5
+        url = create_repo(
+            'repo', 'http://example.com/pkgs', ['a.rpm', 'b.rpm'],
+            wipe_repodata=True, hostname='sat.example.com'
+        )
+        self.assertEqual(url, 'http://example.com/pulp/repos/repo/')
+        cmds = ssh.command_batch.call_args[0][0]
+        self.assertEqual(len(cmds), 5)
+        self.assertTrue(cmds[1].endswith('http://example.com/pkgs/a.rpm'))
+        self.assertTrue(cmds[-1].startswith('createrepo '))
+        self.assertEqual(
+            ssh.command_batch.call_args[1],
+            {'hostname': 'sat.example.com', 'stop_on_failure': True}
+        )
+
+    @mock.patch('robottelo.helpers.ssh')
+    def test_failed_step(self, ssh):
+        """create_repo reports the failed command"""
+        ssh.command_batch.return_value = [
+            FakeSSHResult([], 0), FakeSSHResult([], 8, 'not found')]
+        with self.assertRaisesRegex(
+                CLIReturnCodeError, 'Unable to download package a.rpm'):
+            create_repo('repo', 'http://example.com/pkgs', ['a.rpm'])
+
+
 class EscapeSearchTestCase(unittest2.TestCase):
     def test_return_type(self):
         """Tests if escape search returns a unicode string"""
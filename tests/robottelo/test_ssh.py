@@ -1,10 +1,18 @@
 """Tests for module ``robottelo.ssh``."""
 # (too-many-public-methods) pylint: disable=R0904
 import os
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+
 import paramiko
 import six
 
 from robottelo import ssh
+from robottelo.cli import hammer
 from unittest2 import TestCase
 
 if six.PY2:
@@ -17,6 +25,9 @@ class MockChannel(object):
     def __init__(self, ret, status_ready=True):
         self.ret = ret
         self.status_ready = status_ready
+        self.status_event = threading.Event()
+        if status_ready:
+            self.status_event.set()
 
     def recv_exit_status(self):
         return self.ret
@@ -26,14 +37,56 @@ class MockChannel(object):
 
 
 class MockStdout(object):
-    def __init__(self, cmd, ret):
+    def __init__(self, cmd, ret, status_ready=True):
         self.cmd = cmd
-        self.channel = MockChannel(ret=ret)
+        self.channel = MockChannel(ret=ret, status_ready=status_ready)
 
     def read(self):
         return self.cmd
 
 
+class MockStreamChannel(MockChannel):
+    """A mock ``paramiko.Channel`` sending its output in chunks."""
+    def __init__(self, chunks, stderr_chunks=(), ret=0):
+        super(MockStreamChannel, self).__init__(ret=ret)
+        self.chunks = list(chunks)
+        self.stderr_chunks = list(stderr_chunks)
+        self.stdout_open = False
+        self.closed = False
+
+    @property
+    def eof_received(self):
+        return not self.chunks and not self.stdout_open
+
+    def recv_ready(self):
+        return bool(self.chunks)
+
+    def recv(self, nbytes):
+        if self.stderr_chunks:
+            raise AssertionError('stdout read while stderr is not drained')
+        return self.chunks.pop(0) if self.chunks else b''
+
+    def recv_stderr_ready(self):
+        return bool(self.stderr_chunks)
+
+    def recv_stderr(self, nbytes):
+        return self.stderr_chunks.pop(0) if self.stderr_chunks else b''
+
+    def close(self):
+        self.closed = True
+
+
+class MockTransport(object):
+    def __init__(self, active=True):
+        self.active = active
+
+    def is_active(self):
+        return self.active
+
+    def send_ignore(self):
+        """A no-op stub method."""
+
+
 class MockSSHClient(object):
     """A mock ``paramiko.SSHClient`` object."""
     def __init__(self):
@@ -53,6 +106,7 @@ class MockSSHClient(object):
         self.key_filename = None
         self.password = None
         self.ret_code = 0
+        self.transport = MockTransport()
 
     def set_missing_host_key_policy(self, policy):  # pylint:disable=W0613
         """A no-op stub method."""
@@ -82,6 +136,9 @@ class MockSSHClient(object):
         """A no-op stub method."""
         self.close_ += 1
 
+    def get_transport(self):
+        return self.transport
+
     def exec_command(self, cmd, *args, **kwargs):
         return (
             self.ret_code,
@@ -92,6 +149,9 @@ class MockSSHClient(object):
 
 class SSHTestCase(TestCase):
     """Tests for module ``robottelo.ssh``."""
+    def tearDown(self):
+        ssh.close_connections()
+
     @mock.patch('robottelo.ssh.settings')
     def test_get_connection_key(self, settings):
         """Test method ``get_connection`` using key file to connect to the
@@ -216,7 +276,13 @@ class SSHTestCase(TestCase):
         settings.server.ssh_password = 'test_password'
         settings.ssh_client.command_timeout = 300
         settings.ssh_client.connection_timeout = 10
-        ssh.add_authorized_key('ssh-rsa xxxx user@host')
+        settings.ssh_client.pool_max_size = 10
+        settings.ssh_client.pool_idle_timeout = 300
+        with mock.patch('robottelo.ssh.execute_command',
+                        wraps=ssh.execute_command) as execute_command:
+            ssh.add_authorized_key('ssh-rsa xxxx user@host')
+        # all the steps are run in one round trip
+        self.assertEqual(execute_command.call_count, 1)
 
     @mock.patch('robottelo.ssh.settings')
     def test_execute_command(self, settings):
@@ -258,6 +324,9 @@ class SSHTestCase(TestCase):
         settings.server.ssh_password = 'test_password'
         settings.ssh_client.command_timeout = 300
         settings.ssh_client.connection_timeout = 10
+        settings.ssh_client.broker_socket = None
+        settings.ssh_client.pool_max_size = 10
+        settings.ssh_client.pool_idle_timeout = 300
 
         ret = ssh.command('ls -la')
         self.assertEquals(ret.stdout, [u'ls -la'])
@@ -272,6 +341,9 @@ class SSHTestCase(TestCase):
         settings.server.ssh_password = 'test_password'
         settings.ssh_client.command_timeout = 300
         settings.ssh_client.connection_timeout = 10
+        settings.ssh_client.broker_socket = None
+        settings.ssh_client.pool_max_size = 10
+        settings.ssh_client.pool_idle_timeout = 300
 
         ret = ssh.command('ls -la', output_format='plain')
         self.assertEquals(ret.stdout, u'ls -la')
@@ -286,6 +358,9 @@ class SSHTestCase(TestCase):
         settings.server.ssh_password = 'test_password'
         settings.ssh_client.command_timeout = 300
         settings.ssh_client.connection_timeout = 10
+        settings.ssh_client.broker_socket = None
+        settings.ssh_client.pool_max_size = 10
+        settings.ssh_client.pool_idle_timeout = 300
 
         ret = ssh.command('a,b,c\n1,2,3', output_format='csv')
         self.assertEquals(ret.stdout, [{u'a': u'1', u'b': u'2', u'c': u'3'}])
@@ -300,13 +375,584 @@ class SSHTestCase(TestCase):
         settings.server.ssh_password = 'test_password'
         settings.ssh_client.command_timeout = 300
         settings.ssh_client.connection_timeout = 10
+        settings.ssh_client.broker_socket = None
+        settings.ssh_client.pool_max_size = 10
+        settings.ssh_client.pool_idle_timeout = 300
 
         ret = ssh.command('{"a": 1, "b": true}', output_format='json')
         self.assertEquals(ret.stdout, {u'a': u'1', u'b': True})
         self.assertIsInstance(ret, ssh.SSHCommandResult)
 
+    @mock.patch('robottelo.ssh.settings')
+    def test_execute_command_timeout(self, settings):
+        settings.ssh_client.command_timeout = 300
+        settings.ssh_client.connection_timeout = 10
+        connection = mock.Mock()
+        connection.exec_command.return_value = (
+            0,
+            MockStdout('sleep 10', 0, status_ready=False),
+            MockStdout('', 0, status_ready=False),
+        )
+        with self.assertRaises(ssh.SSHCommandTimeoutError):
+            ssh.execute_command('sleep 10', connection, timeout=0.01)
+
+    def test_wait_for_exit_status_wakes_up_on_exit(self):
+        channel = MockChannel(ret=0, status_ready=False)
+
+        def exit_command():
+            channel.status_ready = True
+            channel.status_event.set()
+
+        timer = threading.Timer(0.05, exit_command)
+        timer.start()
+        try:
+            self.assertTrue(ssh._wait_for_exit_status(channel, 10))
+        finally:
+            timer.cancel()
+
     def test_call_paramiko_client(self):
         self.assertIsInstance(
             ssh._call_paramiko_sshclient(),
             (paramiko.SSHClient, MockSSHClient)
         )
+
+    @mock.patch('robottelo.ssh.settings')
+    def test_command_reuses_pooled_connection(self, settings):
+        ssh._call_paramiko_sshclient = MockSSHClient  # pylint:disable=W0212
+        settings.server.hostname = 'example.com'
+        settings.server.ssh_username = 'nobody'
+        settings.server.ssh_key = None
+        settings.server.ssh_password = 'test_password'
+        settings.ssh_client.command_timeout = 300
+        settings.ssh_client.connection_timeout = 10
+        settings.ssh_client.broker_socket = None
+        settings.ssh_client.connection_pool = True
+        settings.ssh_client.pool_max_size = 10
+        settings.ssh_client.pool_idle_timeout = 300
+
+        ssh.command('ls -la')
+        ssh.command('ls -la')
+        pool = ssh.get_connection_pool()
+        self.assertEqual(len(pool), 1)
+        client = pool._idle[0][1]  # pylint:disable=W0212
+        self.assertEqual(client.connect_, 1)
+        self.assertEqual(client.close_, 0)
+        ssh.close_connections()
+        self.assertEqual(len(pool), 0)
+        self.assertEqual(client.close_, 1)
+
+    @mock.patch('robottelo.ssh.settings')
+    def test_command_without_connection_pool(self, settings):
+        ssh._call_paramiko_sshclient = MockSSHClient  # pylint:disable=W0212
+        settings.server.hostname = 'example.com'
+        settings.server.ssh_username = 'nobody'
+        settings.server.ssh_key = None
+        settings.server.ssh_password = 'test_password'
+        settings.ssh_client.command_timeout = 300
+        settings.ssh_client.connection_timeout = 10
+        settings.ssh_client.broker_socket = None
+        settings.ssh_client.connection_pool = False
+
+        ret = ssh.command('ls -la')
+        self.assertEquals(ret.stdout, [u'ls -la'])
+        self.assertEqual(len(ssh.get_connection_pool()), 0)
+
+
+class SSHConnectionPoolTestCase(TestCase):
+    """Tests for class ``robottelo.ssh.SSHConnectionPool``."""
+
+    key = ('example.com', 'nobody', 'test_password', None)
+
+    def test_acquire_empty_pool(self):
+        pool = ssh.SSHConnectionPool(max_size=2, idle_timeout=300)
+        self.assertIsNone(pool.acquire(self.key))
+
+    def test_release_and_acquire(self):
+        pool = ssh.SSHConnectionPool(max_size=2, idle_timeout=300)
+        client = MockSSHClient()
+        pool.release(self.key, client)
+        self.assertIsNone(pool.acquire(('other.com',) + self.key[1:]))
+        self.assertIs(pool.acquire(self.key), client)
+        self.assertEqual(len(pool), 0)
+        self.assertEqual(client.close_, 0)
+
+    def test_max_size_closes_least_recently_used(self):
+        pool = ssh.SSHConnectionPool(max_size=2, idle_timeout=300)
+        clients = [MockSSHClient() for _ in range(3)]
+        for client in clients:
+            pool.release(self.key, client)
+        self.assertEqual(len(pool), 2)
+        self.assertEqual(
+            [client.close_ for client in clients], [1, 0, 0])
+        self.assertIs(pool.acquire(self.key), clients[2])
+
+    @mock.patch('robottelo.ssh.time')
+    def test_idle_clients_are_evicted(self, time):
+        pool = ssh.SSHConnectionPool(max_size=2, idle_timeout=300)
+        client = MockSSHClient()
+        time.time.return_value = 1000
+        pool.release(self.key, client)
+        time.time.return_value = 1301
+        self.assertIsNone(pool.acquire(self.key))
+        self.assertEqual(client.close_, 1)
+
+    def test_dead_clients_are_discarded(self):
+        pool = ssh.SSHConnectionPool(max_size=2, idle_timeout=300)
+        alive, dead = MockSSHClient(), MockSSHClient()
+        dead.transport = MockTransport(active=False)
+        pool.release(self.key, alive)
+        pool.release(self.key, dead)
+        self.assertIs(pool.acquire(self.key), alive)
+        self.assertEqual(dead.close_, 1)
+
+    @mock.patch('robottelo.ssh.os.getpid')
+    def test_forked_process_drops_inherited_clients(self, getpid):
+        getpid.return_value = 1
+        pool = ssh.SSHConnectionPool(max_size=2, idle_timeout=300)
+        client = MockSSHClient()
+        pool.release(self.key, client)
+        getpid.return_value = 2
+        self.assertIsNone(pool.acquire(self.key))
+        self.assertEqual(client.close_, 0)
+
+
+class SSHCommandStreamTestCase(TestCase):
+    """Tests for class ``robottelo.ssh.SSHCommandStream``."""
+
+    def test_lines_match_execute_command(self):
+        output = (
+            u'Id,Name,Description\n[ Rails ] traffic\n'
+            u'1,\x1b[32mchårs\x1b[0m,""\n2,two,desc\n'
+        )
+        encoded = output.encode('utf-8')
+        # split in the middle of the multi bytes char
+        split_at = encoded.index(u'å'.encode('utf-8')) + 1
+        channel = MockStreamChannel(
+            [encoded[:split_at], encoded[split_at:]], [b'warn\x1b[0m'], 3)
+        stream = ssh.SSHCommandStream('cmd', channel, timeout=10)
+        self.assertEqual(
+            list(stream),
+            [u'Id,Name,Description', u'1,chårs,', u'2,two,desc', u''],
+        )
+        self.assertEqual(stream.return_code, 3)
+        self.assertEqual(stream.stderr, u'warn')
+
+    def test_parse_csv_from_stream(self):
+        channel = MockStreamChannel([b'a,b', b',c\n1,2,3\n'])
+        stream = ssh.SSHCommandStream('cmd', channel)
+        self.assertEqual(
+            hammer.parse_csv(stream), [{u'a': u'1', u'b': u'2', u'c': u'3'}])
+        self.assertEqual(stream.return_code, 0)
+
+    def test_stderr_before_stdout(self):
+        """stderr written before any stdout is read first"""
+        channel = MockStreamChannel(
+            [b'one\n'], [b'e' * 32768, b'rror'], 1)
+        stream = ssh.SSHCommandStream('cmd', channel, timeout=10)
+        self.assertEqual(list(stream), [u'one', u''])
+        self.assertEqual(stream.stderr, u'e' * 32768 + u'rror')
+
+    def test_timeout(self):
+        reader, writer = socket.socketpair()
+        self.addCleanup(reader.close)
+        self.addCleanup(writer.close)
+        channel = MockStreamChannel([])
+        channel.stdout_open = True
+        channel.fileno = reader.fileno
+        stream = ssh.SSHCommandStream('cmd', channel, timeout=0.1)
+        with self.assertRaises(ssh.SSHCommandTimeoutError):
+            list(stream)
+        self.assertTrue(channel.closed)
+
+    @mock.patch('robottelo.ssh.settings')
+    def test_command_stream(self, settings):
+        settings.ssh_client.connection_pool = False
+        settings.ssh_client.command_timeout = 300
+        settings.ssh_client.connection_timeout = 10
+        channel = MockStreamChannel([b'one\ntwo\n'])
+        client = MockSSHClient()
+        client._id = hex(id(client))  # pylint:disable=W0212
+        client.exec_command = mock.Mock(
+            return_value=(None, mock.Mock(channel=channel), None))
+        with mock.patch('robottelo.ssh.get_client', return_value=client):
+            with ssh.command_stream('ls') as stream:
+                self.assertEqual(list(stream), [u'one', u'two', u''])
+        self.assertTrue(channel.closed)
+        self.assertEqual(client.close_, 1)
+
+
+class CommandManyTestCase(TestCase):
+    """Tests for ``robottelo.ssh.map_hosts`` and ``command_many``."""
+
+    def test_map_hosts_keeps_order(self):
+        delays = {'host1': 0.05, 'host2': 0, 'host3': 0.02}
+
+        def func(hostname):
+            time.sleep(delays[hostname])
+            return hostname.upper()
+
+        self.assertEqual(
+            ssh.map_hosts(func, ['host1', 'host2', 'host3'], max_workers=3),
+            ['HOST1', 'HOST2', 'HOST3']
+        )
+
+    def test_map_hosts_runs_concurrently(self):
+        barrier = threading.Event()
+        hosts_waiting = []
+
+        def func(hostname):
+            hosts_waiting.append(hostname)
+            if len(hosts_waiting) == 2:
+                barrier.set()
+            return barrier.wait(5)
+
+        self.assertEqual(
+            ssh.map_hosts(func, ['host1', 'host2'], max_workers=2),
+            [True, True]
+        )
+
+    def test_map_hosts_raises_first_error(self):
+        def func(hostname):
+            raise ValueError(hostname)
+
+        with self.assertRaisesRegexp(ValueError, 'host1'):
+            ssh.map_hosts(func, ['host1', 'host2'], max_workers=2)
+
+    def test_map_hosts_without_hosts(self):
+        self.assertEqual(ssh.map_hosts(lambda hostname: 1, []), [])
+
+    @mock.patch('robottelo.ssh.command')
+    def test_command_many(self, command):
+        def run(cmd, hostname, **kwargs):
+            if hostname == 'down.example.com':
+                raise socket.error('connection refused')
+            return ssh.SSHCommandResult(stdout=[hostname])
+
+        command.side_effect = run
+        results = ssh.command_many(
+            'hostname', ['up.example.com', 'down.example.com'],
+            max_workers=2, timeout=30
+        )
+        command.assert_any_call(
+            'hostname', hostname='up.example.com', timeout=30)
+        up, down = results
+        self.assertEqual(up.hostname, 'up.example.com')
+        self.assertEqual(up.stdout, ['up.example.com'])
+        self.assertEqual(up.return_code, 0)
+        self.assertIsNone(up.error)
+        self.assertGreaterEqual(up.elapsed, 0)
+        self.assertEqual(down.hostname, 'down.example.com')
+        self.assertEqual(down.return_code, -1)
+        self.assertIsInstance(down.error, socket.error)
+        self.assertIn('connection refused', down.stderr)
+
+
+class SSHSessionTestCase(TestCase):
+    """Tests for class ``robottelo.ssh.SSHSession``."""
+
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+        self.connection = MockSSHClient()
+        self.connection.exec_command = self.exec_command
+
+    def exec_command(self, cmd, *args, **kwargs):
+        """Keep track of how many commands are running at the same time."""
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.02)
+        with self.lock:
+            self.running -= 1
+        return None, MockStdout(cmd, 0), MockStdout('', 0)
+
+    def test_map(self):
+        with ssh.SSHSession(self.connection, max_channels=3) as session:
+            results = session.map(
+                ['cmd{0}'.format(index) for index in range(9)],
+                timeout=10, connection_timeout=10
+            )
+        self.assertEqual(
+            [result.stdout for result in results],
+            [['cmd{0}'.format(index)] for index in range(9)]
+        )
+        self.assertGreater(self.max_running, 1)
+        self.assertLessEqual(self.max_running, 3)
+        self.assertEqual(self.connection.close_, 0)
+
+    def test_submit(self):
+        with ssh.SSHSession(self.connection, max_channels=2) as session:
+            future = session.submit(
+                'a,b\n1,2', output_format='csv', timeout=10,
+                connection_timeout=10
+            )
+            self.assertEqual(future.result().stdout, [{'a': '1', 'b': '2'}])
+
+
+class LocalSFTPFile(object):
+    """A ``paramiko.SFTPFile`` writing to a local file."""
+    def __init__(self, sftp, path, mode):
+        self.sftp = sftp
+        self.handler = open(path, mode + 'b')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.handler.close()
+
+    def set_pipelined(self, pipelined=True):
+        """A no-op stub method."""
+
+    def seek(self, offset):
+        self.handler.seek(offset)
+
+    def truncate(self, size):
+        self.handler.truncate(size)
+
+    def write(self, data):
+        self.sftp.written.append((self.handler.tell(), len(data)))
+        self.handler.write(data)
+
+    def readv(self, chunks):
+        for offset, length in chunks:
+            self.handler.seek(offset)
+            yield self.handler.read(length)
+
+
+class LocalSFTPClient(object):
+    """A ``paramiko.SFTPClient`` on the local file system."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.written = []
+        self.sessions = 0
+
+    def __call__(self, connection):
+        with self.lock:
+            self.sessions += 1
+        return self
+
+    def open(self, path, mode):
+        return LocalSFTPFile(self, path, mode)
+
+    def stat(self, path):
+        return os.stat(path)
+
+    def close(self):
+        """A no-op stub method."""
+
+
+class LocalSSHClient(MockSSHClient):
+    """A mock ``paramiko.SSHClient`` running the commands locally."""
+    def exec_command(self, cmd, *args, **kwargs):
+        process = subprocess.Popen(
+            cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        stdout, stderr = process.communicate()
+        return (
+            None,
+            MockStdout(stdout, process.returncode),
+            MockStdout(stderr, process.returncode),
+        )
+
+
+class SFTPTransferTestCase(TestCase):
+    """Tests for the chunked ``upload_file`` and ``download_file``."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.local_file = os.path.join(self.tmpdir, 'local')
+        self.remote_file = os.path.join(self.tmpdir, 'remote')
+        self.content = os.urandom(5 * 1024 + 100)
+        self.sftp = LocalSFTPClient()
+        patchers = [
+            mock.patch('robottelo.ssh.settings'),
+            mock.patch('robottelo.ssh._open_sftp', self.sftp),
+            mock.patch('robottelo.ssh._call_paramiko_sshclient',
+                       LocalSSHClient),
+        ]
+        self.settings = patchers[0].start()
+        for patcher in patchers[1:]:
+            patcher.start()
+        for patcher in patchers:
+            self.addCleanup(patcher.stop)
+        self.settings.ssh_client.command_timeout = 300
+        self.settings.ssh_client.connection_timeout = 10
+        self.settings.ssh_client.connection_pool = False
+        self.settings.ssh_client.parallel_transfers = True
+        self.settings.ssh_client.transfer_workers = 3
+        self.settings.ssh_client.transfer_chunk_size = 1024
+        self.settings.ssh_client.upload_cache = False
+        self.settings.ssh_client.upload_cache_dir = os.path.join(
+            self.tmpdir, 'cache')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write(self, path, content):
+        with open(path, 'wb') as handler:
+            handler.write(content)
+
+    def read(self, path):
+        with open(path, 'rb') as handler:
+            return handler.read()
+
+    def test_parallel_upload(self):
+        self.write(self.local_file, self.content)
+        self.write(self.remote_file, b'previous content' * 1000)
+        ssh.upload_file(self.local_file, self.remote_file, verify=True)
+        self.assertEqual(self.read(self.remote_file), self.content)
+        self.assertEqual(len(self.sftp.written), 6)
+        # one session to create the file and one per worker
+        self.assertEqual(self.sftp.sessions, 4)
+
+    def test_resume_upload(self):
+        self.write(self.local_file, self.content)
+        partial = bytearray(self.content[:3 * 1024])
+        partial[1024:2048] = b'\0' * 1024
+        self.write(self.remote_file, bytes(partial))
+        ssh.upload_file(
+            self.local_file, self.remote_file, resume=True, verify=True)
+        self.assertEqual(self.read(self.remote_file), self.content)
+        self.assertEqual(
+            sorted(self.sftp.written),
+            [(1024, 1024), (3072, 1024), (4096, 1024), (5120, 100)]
+        )
+
+    def test_resume_complete_upload(self):
+        self.write(self.local_file, self.content)
+        self.write(self.remote_file, self.content + b'trailing')
+        ssh.upload_file(self.local_file, self.remote_file, resume=True)
+        self.assertEqual(self.read(self.remote_file), self.content)
+        self.assertEqual(self.sftp.written, [])
+
+    def test_verify_mismatch(self):
+        self.write(self.local_file, self.content)
+        with mock.patch('robottelo.ssh._local_digest', return_value='bad'):
+            with self.assertRaises(ssh.SSHTransferError):
+                ssh.upload_file(
+                    self.local_file, self.remote_file, verify=True)
+
+    def test_parallel_download(self):
+        self.write(self.remote_file, self.content)
+        ssh.download_file(self.remote_file, self.local_file, verify=True)
+        self.assertEqual(self.read(self.local_file), self.content)
+
+    def test_resume_download(self):
+        self.write(self.remote_file, self.content)
+        self.write(self.local_file, self.content[:2048])
+        with mock.patch('robottelo.ssh.open', create=True,
+                        side_effect=open) as local_open:
+            ssh.download_file(
+                self.remote_file, self.local_file, parallel=False,
+                resume=True)
+        self.assertEqual(self.read(self.local_file), self.content)
+        # the file is opened once to be resized and once per missing chunk,
+        # the two first chunks are kept
+        self.assertEqual(
+            len([call for call in local_open.call_args_list
+                 if call[0] == (self.local_file, 'r+b')]),
+            5
+        )
+
+    def test_upload_cache(self):
+        self.settings.ssh_client.upload_cache = True
+        self.write(self.local_file, self.content)
+        stats = ssh.upload_cache_stats()
+        ssh.upload_file(self.local_file, self.remote_file)
+        ssh.upload_file(self.local_file, self.remote_file)
+        other_remote_file = os.path.join(self.tmpdir, 'other remote')
+        ssh.upload_file(self.local_file, other_remote_file)
+        self.assertEqual(self.read(other_remote_file), self.content)
+        # only the first upload did write
+        self.assertEqual(len(self.sftp.written), 6)
+        new_stats = ssh.upload_cache_stats()
+        self.assertEqual(
+            {key: new_stats[key] - stats[key] for key in stats},
+            {'hits': 1, 'copies': 1, 'misses': 1}
+        )
+
+    def test_upload_cache_modified_remote_file(self):
+        self.settings.ssh_client.upload_cache = True
+        self.write(self.local_file, self.content)
+        ssh.upload_file(self.local_file, self.remote_file)
+        self.write(self.remote_file, b'changed')
+        stats = ssh.upload_cache_stats()
+        ssh.upload_file(self.local_file, self.remote_file)
+        self.assertEqual(self.read(self.remote_file), self.content)
+        self.assertEqual(
+            ssh.upload_cache_stats()['misses'], stats['misses'] + 1)
+
+
+class CommandBatchTestCase(TestCase):
+    """Tests for ``robottelo.ssh.command_batch``."""
+
+    def setUp(self):
+        patcher = mock.patch('robottelo.ssh.settings')
+        settings = patcher.start()
+        self.addCleanup(patcher.stop)
+        settings.ssh_client.command_timeout = 300
+        settings.ssh_client.connection_timeout = 10
+        settings.ssh_client.connection_pool = False
+        settings.ssh_client.broker_socket = None
+        ssh._call_paramiko_sshclient = LocalSSHClient  # pylint:disable=W0212
+
+    def test_results_are_split(self):
+        results = ssh.command_batch([
+            'echo one; echo error >&2',
+            'printf two',
+            'cd /; exit 3',
+            'pwd',
+        ])
+        self.assertEqual(
+            [result.stdout for result in results],
+            [[u'one', u''], [u'two'], u'', [os.getcwd(), u'']]
+        )
+        self.assertEqual(
+            [result.stderr for result in results],
+            [u'error\n', u'', u'', u'']
+        )
+        self.assertEqual(
+            [result.return_code for result in results], [0, 0, 3, 0])
+
+    def test_stop_on_failure(self):
+        results = ssh.command_batch(
+            ['true', 'false', 'echo not run'], stop_on_failure=True)
+        self.assertEqual(
+            [result.return_code for result in results], [0, 1])
+
+    def test_timeout_per_command(self):
+        with mock.patch('robottelo.ssh.command',
+                        wraps=ssh.command) as command:
+            ssh.command_batch(['true', 'true', 'true'])
+            ssh.command_batch(['true', 'true'], timeout=10)
+        self.assertEqual(
+            [call[1]['timeout'] for call in command.call_args_list],
+            [930, 40]
+        )
+        self.assertIn(
+            u"timeout -k 10 10 bash -c true",
+            command.call_args_list[1][0][0]
+        )
+
+    def test_command_timed_out(self):
+        results = ssh.command_batch(
+            ['echo one; sleep 10', 'echo two'], timeout=1)
+        self.assertEqual(
+            [result.return_code for result in results], [124, 0])
+        self.assertEqual(results[0].stdout, [u'one', u''])
+        self.assertEqual(
+            results[0].stderr,
+            u'\ncommand timed out after 1s: echo one; sleep 10'
+        )
+        self.assertEqual(results[1].stdout, [u'two', u''])
+
+    def test_output_format(self):
+        results = ssh.command_batch(
+            ['printf "a,b\\n1,2\\n"', 'printf "a\\n3\\n"'],
+            output_format='csv'
+        )
+        self.assertEqual(
+            [result.stdout for result in results],
+            [[{u'a': u'1', u'b': u'2'}], [{u'a': u'3'}]]
+        )
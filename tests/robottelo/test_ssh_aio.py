@@ -0,0 +1,68 @@
+"""Tests for module ``robottelo.ssh.aio``."""
+import threading
+import time
+
+import six
+import unittest2
+
+from robottelo import ssh
+
+if six.PY2:
+    import mock
+else:
+    import asyncio
+    from robottelo.ssh import aio
+    from unittest import mock
+
+
+@unittest2.skipIf(six.PY2, 'asyncio is only available on Python 3')
+class AIOTestCase(unittest2.TestCase):
+    """Tests for the ``robottelo.ssh.aio`` coroutines."""
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        self.loop.close()
+        asyncio.set_event_loop(None)
+
+    @mock.patch('robottelo.ssh.command')
+    def test_command(self, command):
+        command.return_value = ssh.SSHCommandResult(stdout=['ok'])
+        result = self.loop.run_until_complete(
+            aio.command('ls', hostname='example.com', timeout=30))
+        self.assertEqual(result.stdout, ['ok'])
+        command.assert_called_once_with(
+            'ls', hostname='example.com', output_format=None, username=None,
+            password=None, key_filename=None, timeout=30,
+            connection_timeout=None
+        )
+
+    @mock.patch('robottelo.ssh.command')
+    def test_gather_overlaps_commands(self, command):
+        lock = threading.Lock()
+        running = []
+        overlapped = []
+
+        def run(cmd, **kwargs):
+            with lock:
+                running.append(cmd)
+                overlapped.append(len(running) > 1)
+            time.sleep(0.05)
+            with lock:
+                running.remove(cmd)
+            return ssh.SSHCommandResult(stdout=[cmd])
+
+        command.side_effect = run
+        results = self.loop.run_until_complete(asyncio.gather(
+            aio.command('first'), aio.command('second')))
+        self.assertEqual(
+            [result.stdout for result in results], [['first'], ['second']])
+        self.assertTrue(any(overlapped))
+
+    @mock.patch('robottelo.ssh.command')
+    def test_command_raises(self, command):
+        command.side_effect = ssh.SSHCommandTimeoutError('sleep 10')
+        with self.assertRaises(ssh.SSHCommandTimeoutError):
+            self.loop.run_until_complete(aio.command('sleep 10'))
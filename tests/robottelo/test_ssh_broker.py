@@ -0,0 +1,121 @@
+"""Tests for module ``robottelo.ssh_broker``."""
+import os
+import shutil
+import tempfile
+import threading
+
+import six
+
+from robottelo import ssh, ssh_broker
+from robottelo.cli.base import Base
+from unittest2 import TestCase
+
+from tests.robottelo.test_ssh import MockSSHClient
+
+if six.PY2:
+    import mock
+else:
+    from unittest import mock
+
+
+class SSHBrokerTestCase(TestCase):
+    """Tests for class ``robottelo.ssh_broker.SSHBroker``."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.tmpdir, 'broker.sock')
+        self.broker = ssh_broker.SSHBroker(self.socket_path)
+        self.thread = threading.Thread(
+            target=self.broker.serve_forever, kwargs={'poll_interval': 0.05})
+        self.thread.start()
+        patcher = mock.patch('robottelo.ssh.settings')
+        self.settings = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.settings.server.hostname = 'example.com'
+        self.settings.server.ssh_username = 'nobody'
+        self.settings.server.ssh_key = None
+        self.settings.server.ssh_password = 'test_password'
+        self.settings.ssh_client.command_timeout = 300
+        self.settings.ssh_client.connection_timeout = 10
+        self.settings.ssh_client.connection_pool = True
+        self.settings.ssh_client.pool_max_size = 10
+        self.settings.ssh_client.pool_idle_timeout = 300
+        self.settings.ssh_client.broker_socket = self.socket_path
+        ssh._call_paramiko_sshclient = MockSSHClient  # pylint:disable=W0212
+
+    def tearDown(self):
+        self.broker.shutdown()
+        self.broker.server_close()
+        self.thread.join()
+        shutil.rmtree(self.tmpdir)
+
+    def test_socket_is_private(self):
+        self.assertEqual(os.stat(self.socket_path).st_mode & 0o777, 0o600)
+
+    def test_command(self):
+        with mock.patch('robottelo.ssh.get_pooled_connection',
+                        wraps=ssh.get_pooled_connection) as pooled:
+            ret = ssh.command('a,b\n1,2', output_format='csv')
+            ssh.command('ls -la')
+        self.assertEqual(ret.stdout, [{u'a': u'1', u'b': u'2'}])
+        self.assertIsInstance(ret, ssh.SSHCommandResult)
+        pooled.assert_called_with(
+            hostname='example.com', username='nobody',
+            password='test_password', key_filename=None, timeout=10)
+        # both commands shared the broker connection
+        pool = ssh.get_connection_pool()
+        self.assertEqual(len(pool), 1)
+        self.assertEqual(pool._idle[0][1].connect_, 1)  # pylint:disable=W0212
+
+    @mock.patch('robottelo.cli.base.settings')
+    def test_hammer_command(self, settings):
+        """The utf-8 encoded hammer commands are run by the broker"""
+        settings.locale = 'en_US'
+        settings.performance = False
+        settings.hammer.shell = False
+        settings.hammer.sessions = False
+        settings.hammer.read_cache = False
+        with mock.patch('robottelo.ssh.get_pooled_connection',
+                        wraps=ssh.get_pooled_connection) as pooled:
+            ret = Base.execute(
+                u'organization info --name "\xe9t\xe9"', user='admin',
+                password='changeme', return_raw_response=True)
+        self.assertEqual(pooled.call_count, 1)
+        self.assertEqual(ret.return_code, 0)
+        self.assertEqual(ret.stdout, [
+            u'LANG=en_US  hammer -v -u admin -p changeme  '
+            u'organization info --name "\xe9t\xe9"'
+        ])
+
+    def test_command_timeout(self):
+        with mock.patch('robottelo.ssh.execute_command',
+                        side_effect=ssh.SSHCommandTimeoutError('sleep 10')):
+            with self.assertRaises(ssh.SSHCommandTimeoutError):
+                ssh.command('sleep 10')
+
+    def test_command_error(self):
+        with mock.patch('robottelo.ssh.get_client',
+                        side_effect=ValueError('no route to host')):
+            with self.assertRaisesRegex(ssh.SSHBrokerError, 'no route'):
+                ssh.command('ls -la')
+
+    def test_broker_not_running(self):
+        self.settings.ssh_client.broker_socket = os.path.join(
+            self.tmpdir, 'missing.sock')
+        with mock.patch('robottelo.ssh.broker_command',
+                        wraps=ssh.broker_command) as broker_command:
+            ret = ssh.command('ls -la')
+        self.assertEqual(ret.stdout, [u'ls -la'])
+        self.assertEqual(broker_command.call_count, 1)
+
+    def test_second_broker_on_same_socket(self):
+        with self.assertRaises(RuntimeError):
+            ssh_broker.SSHBroker(self.socket_path)
+
+    def test_stale_socket_is_replaced(self):
+        stale_path = os.path.join(self.tmpdir, 'stale.sock')
+        stale = ssh_broker.SSHBroker(stale_path)
+        stale.socket.close()
+        broker = ssh_broker.SSHBroker(stale_path)
+        broker.server_close()
+        self.assertFalse(os.path.exists(stale_path))
@@ -5,9 +5,9 @@ from robottelo import ssh
 from robottelo.vm import VirtualMachine, VirtualMachineError
 
 if six.PY2:
-    from mock import call, patch
+    from mock import patch
 else:
-    from unittest.mock import call, patch
+    from unittest.mock import patch
 
 
 class VirtualMachineTestCase(unittest2.TestCase):
@@ -99,8 +99,8 @@ class VirtualMachineTestCase(unittest2.TestCase):
         with self.assertRaises(VirtualMachineError):
             vm.run('ls')
 
-    @patch('robottelo.ssh.command')
-    def test_destroy(self, ssh_command):
+    @patch('robottelo.ssh.command_batch')
+    def test_destroy(self, ssh_command_batch):
         """Check if destroy runs the required ssh commands"""
         self.configure_provisoning_server()
         image_dir = '/opt/robottelo/images'
@@ -113,18 +113,40 @@ class VirtualMachineTestCase(unittest2.TestCase):
         ):
             vm.destroy()
 
-        self.assertEqual(ssh_command.call_count, 3)
+        ssh_command_batch.assert_called_once_with(
+            [
+                'virsh destroy {0}'.format(vm.hostname),
+                'virsh undefine {0}'.format(vm.hostname),
+                'rm {0}/{1}.img'.format(image_dir, vm.hostname),
+            ],
+            hostname=self.provisioning_server,
+            connection_timeout=30
+        )
+
+    @patch('robottelo.ssh.command_batch')
+    def test_run_batch(self, ssh_command_batch):
+        """Check if run_batch calls ssh.command_batch"""
+        self.configure_provisoning_server()
+        vm = VirtualMachine()
+        with patch.object(vm, '_created', True):
+            vm.run_batch(['ls', 'pwd'], timeout=60)
+        ssh_command_batch.assert_called_once_with(
+            ['ls', 'pwd'], hostname=vm.ip_addr, timeout=60,
+            stop_on_failure=False)
+
+    def test_run_batch_raises_exception(self):
+        """Check if run_batch raises an exception if the vm is not created"""
+        self.configure_provisoning_server()
+        vm = VirtualMachine()
+        with self.assertRaises(VirtualMachineError):
+            vm.run_batch(['ls'])
 
-        ssh_command_args_list = [
-            call('virsh destroy {0}'.format(vm.hostname),
-                 hostname=self.provisioning_server,
-                 connection_timeout=30),
-            call('virsh undefine {0}'.format(vm.hostname),
-                 hostname=self.provisioning_server,
-                 connection_timeout=30),
-            call('rm {0}/{1}.img'.format(image_dir, vm.hostname),
-                 hostname=self.provisioning_server,
-                 connection_timeout=30),
-        ]
-
-        self.assertListEqual(ssh_command.call_args_list, ssh_command_args_list)
+    @patch('robottelo.ssh.command_batch', return_value=[])
+    def test_install_katello_host_tools_interrupted(self, ssh_command_batch):
+        """Check an interrupted install raises VirtualMachineError"""
+        self.configure_provisoning_server()
+        vm = VirtualMachine()
+        with patch.object(vm, '_created', True):
+            with self.assertRaisesRegexp(
+                    VirtualMachineError, 'only 0 of 2 commands were run'):
+                vm.install_katello_host_tools()